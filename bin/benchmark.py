@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Purpose of this script:
+# - Measures throughput, latency and memory use of generate_data.py API checks
+#   against local stand-in exchange server (see standin.py), so no real API
+#   is ever contacted and results are repeatable
+#
+# Usage (use -h or --help for more info):
+#   benchmark.py --engines pool,async --sizes 20,44,100
+#
+######################################################################
+
+import argparse
+import contextlib
+import json
+import resource
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import generator as gd
+import standin
+
+
+######################################################################
+
+def build_currencies(size: int) -> Dict[str, Dict]:
+    """
+    Returns currency set of given size. Fiat currencies and stablecoins go first so even small sets
+    produce valid pairs. If size exceeds number of real currencies, synthetic cryptocurrencies are added.
+    """
+    codes = sorted(gd.currencies.keys(),
+                   key = lambda code: (gd.currencies[code].get('type', gd.CURRENCY_CRYPTO) == gd.CURRENCY_CRYPTO, code))
+    result = {code: gd.currencies[code] for code in codes[:size]}
+    idx = 0
+    while len(result) < size:
+        idx += 1
+        result['Q{:03d}'.format(idx)] = {'name': 'Synthetic #{}'.format(idx), }
+    return result
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+######################################################################
+
+def run_child(args: argparse.Namespace) -> None:
+    """
+    Runs single generator pass against stand-in server and prints its metrics as JSON.
+    """
+    gen_args = ['--nocache', '--dry-run', '--nogauge', '--engine', args.engine, '--concurrency', str(args.concurrency),
+                '--read-timeout', str(args.read_timeout), ] + shlex.split(args.gen_args)
+    if not args.discovery:
+        gen_args.append('--no-discovery')
+    config = gd.create_config(gen_args)
+    currencies = build_currencies(args.size)
+
+    elapsed = []
+    counters = {'probes': 0, 'confirmed': 0, 'failed': 0, }
+
+    def on_result(tr: gd.TestResult) -> None:
+        if tr.cached or tr.discovered:
+            return
+        counters['probes'] += 1
+        if tr.failed:
+            counters['failed'] += 1
+        else:
+            elapsed.append(tr.elapsed)
+            if tr.rc:
+                counters['confirmed'] += 1
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        exchanges = gd.create_exchanges(config, cache_dir)
+        for ex in exchanges:
+            standin.point_exchange(ex, json.loads(args.urls))
+            ex.rate_limit = args.rate_limit
+            ex.rate_burst = args.rate_burst
+
+        # generator's own progress output would garble our JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            start = time.monotonic()
+            exchanges.process_exchanges(currencies, on_result = on_result)
+            wall = time.monotonic() - start
+
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    workers = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(json.dumps({
+        'engine':       args.engine,
+        'currencies':   args.size,
+        'probes':       counters['probes'],
+        'confirmed':    counters['confirmed'],
+        'failed':       counters['failed'],
+        'wall':         round(wall, 3),
+        'probes_per_s': round(counters['probes'] / wall, 1) if wall > 0 else 0,
+        'p50_ms':       round(percentile(elapsed, 50) * 1000, 1),
+        'p99_ms':       round(percentile(elapsed, 99) * 1000, 1),
+        # ru_maxrss is in KiB on Linux
+        'rss_mb':       round(own / 1024, 1),
+        'worker_rss_mb': round(workers / 1024, 1),
+    }))
+
+
+def run_parent(args: argparse.Namespace) -> None:
+    engines = args.engines.split(',')
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    # markets are built for the biggest set, smaller sets are its subsets
+    config = gd.create_config()
+    markets = standin.build_markets(gd.create_exchanges(config), build_currencies(max(sizes)),
+                                    listed_ratio = args.listed_ratio, seed = args.seed)
+    faults = standin.Faults(latency = args.latency, latency_jitter = args.latency_jitter, error_rate = args.error_rate,
+                            throttle_rate = args.throttle_rate, hang_rate = args.hang_rate, hang_time = args.hang_time)
+    server = standin.StandInServer(markets, faults, seed = args.seed).start()
+    print('Stand-in server listening at {}'.format(', '.join(server.urls.values())))
+
+    rows = []
+    try:
+        for size in sizes:
+            for engine in engines:
+                cmd = [sys.executable, __file__, '--child', '--urls', json.dumps(server.urls), '--engine', engine,
+                       '--size', str(size), '--concurrency', str(args.concurrency),
+                       '--rate-limit', str(args.rate_limit), '--rate-burst', str(args.rate_burst),
+                       '--read-timeout', str(args.read_timeout), '--gen-args', args.gen_args, ]
+                if args.discovery:
+                    cmd.append('--discovery')
+                proc = subprocess.run(cmd, stdout = subprocess.PIPE,
+                                      stderr = None if args.verbose else subprocess.DEVNULL, text = True)
+                if proc.returncode != 0:
+                    gd.abort('Benchmark run failed: {} engine, {} currencies'.format(engine, size))
+                rows.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+                print_row(rows[-1], header = len(rows) == 1)
+    finally:
+        server.stop()
+
+    if args.json_file is not None:
+        with open(args.json_file, 'w') as fh:
+            json.dump(rows, fh, indent = 2)
+
+
+def print_row(row: Dict, header: bool = False) -> None:
+    fmt = '{:<7} {:>6} {:>7} {:>7} {:>9} {:>8} {:>8} {:>8} {:>8}'
+    if header:
+        print(fmt.format('engine', 'curr', 'probes', 'failed', 'probes/s', 'wall[s]', 'p50[ms]', 'p99[ms]', 'rss[MB]'))
+    print(fmt.format(row['engine'], row['currencies'], row['probes'], row['failed'], row['probes_per_s'], row['wall'],
+                     row['p50_ms'], row['p99_ms'], max(row['rss_mb'], row['worker_rss_mb'])))
+
+
+######################################################################
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    ag = parser.add_argument_group('Options')
+    ag.add_argument('--engines', action = 'store', dest = 'engines', type = str,
+                    default = '{},{}'.format(gd.ENGINE_POOL, gd.ENGINE_ASYNC),
+                    help = 'Comma separated list of engines to benchmark. Default: %(default)s')
+    ag.add_argument('--sizes', action = 'store', dest = 'sizes', type = str, default = '20,{}'.format(len(gd.currencies)),
+                    help = 'Comma separated list of currency list sizes to benchmark. Sizes exceeding number of '
+                           'supported currencies are padded with synthetic ones. Default: %(default)s')
+    ag.add_argument('-c', '--concurrency', action = 'store', dest = 'concurrency', type = int,
+                    default = gd.DEFAULT_CONCURRENCY, help = 'Default: %(default)s')
+    ag.add_argument('--rate-limit', action = 'store', dest = 'rate_limit', type = float, default = 1000.0,
+                    help = 'Requests per second allowed per exchange. Default: %(default)s')
+    ag.add_argument('--rate-burst', action = 'store', dest = 'rate_burst', type = int, default = 100,
+                    help = 'Default: %(default)s')
+    ag.add_argument('--read-timeout', action = 'store', dest = 'read_timeout', type = float, default = 2.0,
+                    help = 'Default: %(default)s')
+    ag.add_argument('--discovery', action = 'store_true', dest = 'discovery', default = False,
+                    help = 'Use market listing endpoints. By default each pair is probed with ticker API call.')
+    ag.add_argument('--gen-args', action = 'store', dest = 'gen_args', type = str, default = '',
+                    help = 'Additional generate_data.py options, i.e. "--no-prune --retries 0".')
+    ag.add_argument('--listed-ratio', action = 'store', dest = 'listed_ratio', type = float, default = 0.2,
+                    help = 'Fraction of possible pairs listed by stand-in exchanges. Default: %(default)s')
+    ag.add_argument('--latency', action = 'store', dest = 'latency', type = float, default = 5.0,
+                    help = 'Stand-in response latency in millis. Default: %(default)s')
+    ag.add_argument('--latency-jitter', action = 'store', dest = 'latency_jitter', type = float, default = 5.0,
+                    help = 'Max random latency (in millis) added on top of --latency. Default: %(default)s')
+    ag.add_argument('--error-rate', action = 'store', dest = 'error_rate', type = float, default = 0.0,
+                    help = 'Fraction of requests answered with HTTP 503. Default: %(default)s')
+    ag.add_argument('--throttle-rate', action = 'store', dest = 'throttle_rate', type = float, default = 0.0,
+                    help = 'Fraction of requests answered as throttled. Default: %(default)s')
+    ag.add_argument('--hang-rate', action = 'store', dest = 'hang_rate', type = float, default = 0.0,
+                    help = 'Fraction of requests never answered. Default: %(default)s')
+    ag.add_argument('--hang-time', action = 'store', dest = 'hang_time', type = float, default = 30.0,
+                    help = 'How long (in seconds) hanging requests hang. Default: %(default)s')
+    ag.add_argument('--seed', action = 'store', dest = 'seed', type = int, default = 0)
+    ag.add_argument('--json', action = 'store', dest = 'json_file', type = str, default = None,
+                    help = 'Optional. Name of file to write results to as JSON.')
+    ag.add_argument('-v', '--verbose', action = 'store_true', dest = 'verbose', default = False,
+                    help = 'Show generator output.')
+
+    # internal: single measured run, spawned by parent process so memory use is measured per run
+    ag.add_argument('--child', action = 'store_true', dest = 'child', help = argparse.SUPPRESS)
+    ag.add_argument('--urls', action = 'store', dest = 'urls', type = str, help = argparse.SUPPRESS)
+    ag.add_argument('--engine', action = 'store', dest = 'engine', type = str, help = argparse.SUPPRESS)
+    ag.add_argument('--size', action = 'store', dest = 'size', type = int, help = argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: List[str] = None) -> None:
+    args = build_arg_parser().parse_args(argv)
+    if args.child:
+        run_child(args)
+    else:
+        run_parent(args)
+
+
+if __name__ == '__main__':
+    main()
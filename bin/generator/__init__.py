@@ -0,0 +1,87 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Exchange data generator. Use generate_data.py for command line interface,
+# or iter_results() to consume validation results as they come, i.e.:
+#
+#   import generator
+#
+#   config = generator.create_config(['--dry-run', '--engine', 'async'])
+#   for tr in generator.iter_results(config):
+#       print(tr.ex_code, tr.crypto, tr.pair, tr.rc)
+#
+######################################################################
+
+import importlib
+
+from .const import *  # noqa: F401,F403
+
+# Public names and modules they live in. Modules are imported on first access only,
+# so i.e. printing --help does not load HTTP and multiprocessing machinery.
+_exports = {
+    'abort':             'utils',
+    'now':               'utils',
+    'Config':            'config',
+    'build_arg_parser':  'config',
+    'create_config':     'config',
+    'currencies':        'currency_data',
+    'TestResult':        'result',
+    'ResultCache':       'cache',
+    'Exchange':          'exchange',
+    'Binance':           'exchange',
+    'Bitstamp':          'exchange',
+    'Bitbay':            'exchange',
+    'Coinmate':          'exchange',
+    'Kraken':            'exchange',
+    'PairPruner':        'pruner',
+    'TokenBucket':       'scheduler',
+    'Scheduler':         'scheduler',
+    'CircuitBreaker':    'scheduler',
+    'ExchangeStats':     'stats',
+    'RunStats':          'stats',
+    'Exchanges':         'runner',
+    'PairMatrix':        'matrix',
+    'find_outliers':     'rates',
+    'Journal':           'journal',
+    'get_shard':         'shard',
+    'ShardResult':       'shard',
+    'merge_shards':      'shard',
+    'Archive':           'fixtures',
+    'get_archive':       'fixtures',
+    'Profiler':          'profiler',
+    'get_profiler':      'profiler',
+    'phase':             'profiler',
+    'profiling':         'profiler',
+    'Watcher':           'watch',
+    'create_exchanges':  'registry',
+    'iter_results':      'registry',
+    'build_header':      'output',
+    'build_currencies':  'output',
+    'build_exchanges':   'output',
+    'build_compact':     'output',
+    'build_split':       'output',
+    'check_icons':       'output',
+    'build_icon_atlas':  'icons',
+    'write_output':      'output',
+    'main':              'cli',
+}
+
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(importlib.import_module('.' + _exports[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_exports.keys()))
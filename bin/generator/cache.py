@@ -0,0 +1,240 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import contextlib
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .const import CACHE_BUSY_TIMEOUT, CACHE_DB_NAME
+
+# Writes result unless database holds newer one of the same pair (i.e. written by concurrent run)
+UPSERT_RESULT = ('INSERT INTO results VALUES (?, ?, ?, ?, ?) '
+                 'ON CONFLICT (exchange, crypto, pair) DO UPDATE SET rc = excluded.rc, stamp = excluded.stamp '
+                 'WHERE excluded.stamp >= results.stamp')
+
+
+@contextlib.contextmanager
+def transaction(db: sqlite3.Connection):
+    # write lock is taken up front, so concurrent writers wait for each other (up to busy timeout)
+    # instead of failing on lock upgrade
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        yield db
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+    db.execute('COMMIT')
+
+
+######################################################################
+
+class ResultCache:
+    """
+    Validation results of all the exchanges, stored in single SQLite database in cache root folder.
+    Whole database is read into memory once (see load()), and new results are written back in single
+    transaction (see flush()).
+
+    Database may be shared by concurrent runs (i.e. parallel --exchange jobs): it's used in WAL mode,
+    so readers never block writers, writers wait for each other and newer results are never replaced
+    with older ones.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.db_file = os.path.join(cache_dir, CACHE_DB_NAME)
+
+        # (ex_code, crypto, pair) => (rc, stamp)
+        self._entries: Dict[Tuple[str, str, str], Tuple[bool, int]] = {}
+        # entries modified since last flush()
+        self._dirty: Set[Tuple[str, str, str]] = set()
+        # ex_code => fingerprint of exchange definition cached results were obtained with (see Exchange.get_fingerprint())
+        self._fingerprints: Dict[str, str] = {}
+        self._dirty_fingerprints: Set[str] = set()
+        # codes of exchanges whose all entries are to be removed from database
+        self._dropped: Set[str] = set()
+        # ex_code => pairs confirmed by last completed run, as serialized PairMatrix of that exchange only
+        self._matrices: Dict[str, bytes] = {}
+        self._dirty_matrices: Set[str] = set()
+        self.loaded = False
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.cache_dir, exist_ok = True)
+        # transactions are controlled explicitly (see transaction())
+        db = sqlite3.connect(self.db_file, timeout = CACHE_BUSY_TIMEOUT, isolation_level = None)
+        # mode is persistent, so set once per database. Where WAL is not supported old mode stays on.
+        db.execute('PRAGMA journal_mode = WAL')
+        db.execute('PRAGMA synchronous = NORMAL')
+        db.execute('CREATE TABLE IF NOT EXISTS results ('
+                   'exchange TEXT NOT NULL, crypto TEXT NOT NULL, pair TEXT NOT NULL, '
+                   'rc INTEGER NOT NULL, stamp INTEGER NOT NULL, '
+                   'PRIMARY KEY (exchange, crypto, pair)) WITHOUT ROWID')
+        db.execute('CREATE TABLE IF NOT EXISTS fingerprints ('
+                   'exchange TEXT NOT NULL PRIMARY KEY, fingerprint TEXT NOT NULL) WITHOUT ROWID')
+        db.execute('CREATE TABLE IF NOT EXISTS matrices ('
+                   'exchange TEXT NOT NULL PRIMARY KEY, data BLOB NOT NULL) WITHOUT ROWID')
+        return db
+
+    def load(self, ex_codes: Iterable[str] = ()) -> int:
+        """
+        Reads all cached results into memory, migrating legacy cache files first if there are any.
+
+        :param ex_codes: codes of exchanges whose legacy cache files to migrate
+        :return: number of cached entries
+        """
+        db = self._connect()
+        try:
+            self._migrate_legacy_cache(db, ex_codes)
+            self._read_results(db)
+            self._fingerprints = dict(db.execute('SELECT exchange, fingerprint FROM fingerprints'))
+            self._matrices = dict(db.execute('SELECT exchange, data FROM matrices'))
+        finally:
+            db.close()
+        self.loaded = True
+        return len(self._entries)
+
+    def refresh(self) -> int:
+        """
+        Picks up results written to database by concurrent runs since it was loaded (see --watch).
+
+        :return: number of entries updated
+        """
+        db = self._connect()
+        try:
+            return self._read_results(db)
+        finally:
+            db.close()
+
+    def _read_results(self, db: sqlite3.Connection) -> int:
+        # entries present in memory are only replaced with newer ones
+        cnt = 0
+        for ex_code, crypto, pair, rc, stamp in db.execute('SELECT exchange, crypto, pair, rc, stamp FROM results'):
+            key = (ex_code, crypto, pair)
+            known = self._entries.get(key)
+            if known is None or known[1] < stamp:
+                self._entries[key] = (bool(rc), stamp)
+                cnt += 1
+        return cnt
+
+    def _migrate_legacy_cache(self, db: sqlite3.Connection, ex_codes: Iterable[str]) -> None:
+        """
+        Imports cache files of old "one JSON file per pair" layout (<cache_dir>/<ex_code>/<crypto>-<pair>)
+        and removes them once imported, so this only happens once. Only directories named after given
+        exchanges are looked into and only successfully imported files are removed, so anything else
+        found there is left intact.
+
+        :param ex_codes: codes of exchanges whose legacy cache files to import
+        """
+        legacy_dirs = [os.path.join(self.cache_dir, ex_code) for ex_code in ex_codes]
+        legacy_dirs = [legacy_dir for legacy_dir in legacy_dirs if os.path.isdir(legacy_dir)]
+        if not legacy_dirs:
+            return
+
+        # concurrent run may be migrating (and removing) the same files
+        rows = []
+        imported = []
+        for legacy_dir in legacy_dirs:
+            ex_code = os.path.basename(legacy_dir)
+            try:
+                entries = list(os.scandir(legacy_dir))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_file(follow_symlinks = False) or '-' not in entry.name:
+                    continue
+                crypto, pair = entry.name.split('-', 1)
+                try:
+                    with open(entry.path, 'r', encoding = 'utf-8') as fh:
+                        cached_data = json.load(fh)
+                    rows.append((ex_code, crypto, pair, int(cached_data['rc']), int(cached_data['stamp']),))
+                except (OSError, ValueError, KeyError, TypeError):
+                    # Not a cache file or corrupted one (ValueError covers bad JSON and non UTF-8 content).
+                    continue
+                imported.append(entry.path)
+        if not rows:
+            return
+
+        with transaction(db):
+            db.executemany(UPSERT_RESULT, rows)
+
+        for path in imported:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+        for legacy_dir in legacy_dirs:
+            # kept if anything but imported cache files is in there
+            with contextlib.suppress(OSError):
+                os.rmdir(legacy_dir)
+        print('Migrated {} legacy cache files to {}'.format(len(rows), self.db_file))
+
+    def get(self, ex_code: str, crypto: str, pair: str) -> Optional[Tuple[bool, int]]:
+        return self._entries.get((ex_code, crypto, pair))
+
+    def put(self, ex_code: str, crypto: str, pair: str, rc: bool, stamp: int) -> None:
+        key = (ex_code, crypto, pair)
+        self._entries[key] = (rc, stamp)
+        self._dirty.add(key)
+
+    def get_fingerprint(self, ex_code: str) -> Optional[str]:
+        return self._fingerprints.get(ex_code)
+
+    def set_fingerprint(self, ex_code: str, fingerprint: str) -> None:
+        if self._fingerprints.get(ex_code) != fingerprint:
+            self._fingerprints[ex_code] = fingerprint
+            self._dirty_fingerprints.add(ex_code)
+
+    def get_matrix(self, ex_code: str) -> Optional[bytes]:
+        return self._matrices.get(ex_code)
+
+    def set_matrix(self, ex_code: str, data: bytes) -> None:
+        self._matrices[ex_code] = data
+        self._dirty_matrices.add(ex_code)
+
+    def drop_exchange(self, ex_code: str) -> int:
+        """
+        Removes all cached results of given exchange.
+
+        :return: number of removed entries
+        """
+        keys = [key for key in self._entries.keys() if key[0] == ex_code]
+        for key in keys:
+            del self._entries[key]
+            self._dirty.discard(key)
+        self._dropped.add(ex_code)
+        return len(keys)
+
+    def flush(self) -> int:
+        """
+        Writes all entries modified since last flush to database in single transaction. Entries the database
+        holds newer results of (written by concurrent run meanwhile) are left as they are.
+
+        :return: number of entries written
+        """
+        if not self._dirty and not self._dirty_fingerprints and not self._dropped and not self._dirty_matrices:
+            return 0
+
+        rows = [key + (int(self._entries[key][0]), self._entries[key][1],) for key in self._dirty]
+        db = self._connect()
+        try:
+            with transaction(db):
+                db.executemany('DELETE FROM results WHERE exchange = ?', [(code,) for code in self._dropped])
+                db.executemany(UPSERT_RESULT, rows)
+                db.executemany('INSERT OR REPLACE INTO fingerprints VALUES (?, ?)',
+                               [(code, self._fingerprints[code],) for code in self._dirty_fingerprints])
+                db.executemany('INSERT OR REPLACE INTO matrices VALUES (?, ?)',
+                               [(code, self._matrices[code],) for code in self._dirty_matrices])
+        finally:
+            db.close()
+        self._dirty.clear()
+        self._dirty_fingerprints.clear()
+        self._dropped.clear()
+        self._dirty_matrices.clear()
+        return len(rows)
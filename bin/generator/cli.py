@@ -0,0 +1,208 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import os
+import signal
+import sys
+from typing import TYPE_CHECKING, Dict, List
+
+from .config import Config, build_arg_parser, build_merge_arg_parser
+from .const import CMD_MERGE, FORMAT_COMPACT, FORMAT_SPLIT
+from .utils import abort
+
+if TYPE_CHECKING:
+    from .runner import Exchanges
+
+
+######################################################################
+
+def signal_handler(signal, frame):
+    sys.exit(1)
+
+
+######################################################################
+
+def main(argv: List[str] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == CMD_MERGE:
+        config = Config(build_merge_arg_parser().parse_args(argv[1:]))
+    else:
+        config = Config(build_arg_parser().parse_args(argv))
+
+    if config.file is not None and not config.force and os.path.exists(config.file):
+        abort('File already exists: {}'.format(config.file))
+    if config.listen is not None and config.watch is None:
+        abort('--listen can only be used with --watch')
+    if config.watch is not None and (config.shard is not None or config.shard_files is not None):
+        abort('--watch cannot be used with sharded runs')
+
+    signal.signal(signal.SIGINT, signal_handler)
+
+    from .profiler import profiling
+
+    with profiling(config):
+        run(config)
+
+
+def run(config: Config) -> None:
+    from .profiler import phase
+
+    # imported only now, so --help and invalid arguments do not wait for all the machinery to load
+    with phase('imports'):
+        from .currency_data import currencies
+        from .registry import create_exchanges
+
+    with phase('create exchanges'):
+        exchanges = create_exchanges(config)
+
+    def interrupt_handler(signum, frame):
+        # first Ctrl+C lets probes in progress complete, so the run can be resumed. Second one quits at once.
+        if not exchanges.interrupt():
+            sys.exit(1)
+
+    signal.signal(signal.SIGINT, interrupt_handler)
+
+    if config.watch is not None:
+        from .watch import Watcher
+
+        # failed writes are reported (and retried) by Watcher, not ending watch mode
+        Watcher(config, currencies, exchanges, lambda: write_data(config, currencies, exchanges)).run()
+        return
+    if config.shard_files is not None:
+        from .shard import merge_shards
+
+        with phase('merge'):
+            merge_shards(exchanges, currencies, config.shard_files, config.force)
+    elif config.shard is not None:
+        from .shard import ShardResult
+
+        shard = ShardResult(config.shard, currencies)
+        with phase('process'):
+            exchanges.process_exchanges(currencies, on_result = shard.add)
+        if config.stats_file is not None:
+            exchanges.stats.save(config.stats_file, config)
+        save_recording(config)
+        check_interrupted(exchanges)
+        # partial result is not enough to build data file
+        if config.file is not None and not config.dry_run:
+            shard.save(config.file, exchanges)
+        return
+    else:
+        with phase('process'):
+            exchanges.process_exchanges(currencies)
+        check_interrupted(exchanges)
+
+    if config.coverage is not None:
+        from .matrix import build_coverage_report
+
+        with phase('coverage'):
+            print('\n'.join(build_coverage_report(exchanges.matrix, config.coverage)))
+    if config.batch:
+        with phase('batch check'):
+            exchanges.verify_batches()
+    if config.check_rates is not None:
+        with phase('rates check'):
+            print('\n'.join(exchanges.check_rates(config.check_rates)))
+    if config.stats_file is not None:
+        exchanges.stats.save(config.stats_file, config)
+    save_recording(config)
+
+    with phase('output'):
+        try:
+            write_data(config, currencies, exchanges)
+        except IOError as e:
+            abort(str(e))
+
+
+def check_interrupted(exchanges: "Exchanges") -> None:
+    # results of interrupted run are incomplete, so no data file is written
+    if exchanges.interrupted.is_set():
+        abort('Run interrupted. Use --resume to continue it.')
+
+
+def save_recording(config: Config) -> None:
+    if config.record is not None:
+        from .fixtures import get_archive
+
+        archive = get_archive(config.record)
+        archive.save(config.record)
+        print('Recorded {} API responses to {}'.format(len(archive), config.record))
+
+
+def write_data(config: Config, currencies: Dict[str, Dict], exchanges: "Exchanges") -> None:
+    """
+    Builds data file (and its modules) and shows or writes it, as configured.
+
+    :raises IOError: if any of the files cannot be written
+    """
+    from .output import (build_compact, build_currencies, build_exchanges, build_header, build_icon_index, build_split,
+                         check_icons, write_output)
+    from .profiler import phase
+
+    # check for icons of used coins
+    curr = list(currencies.keys())
+    curr.sort()
+    with phase('check icons'):
+        missing_icons_cnt = check_icons(curr)
+    if missing_icons_cnt != 0 and not config.force:
+        abort('Missing {} currency icons.'.format(missing_icons_cnt))
+
+    if config.show or config.file is not None:
+        # exchange modules of split format, keyed by file name relative to main file
+        modules = {}
+        atlas = None
+        with phase('build'):
+            buffer = build_header()
+            if config.format == FORMAT_SPLIT:
+                main, modules = build_split(currencies, list(exchanges))
+                buffer += main
+            elif config.format == FORMAT_COMPACT:
+                buffer += build_compact(currencies, list(exchanges))
+            else:
+                buffer += build_currencies(currencies)
+                buffer += build_exchanges(exchanges, currencies)
+
+            if config.icon_atlas:
+                from .icons import build_icon_atlas, get_icon_atlas_file, get_used_cryptos
+
+                # atlas is only of use to widget loading the data file from its contents/ folder
+                if config.file is not None and get_icon_atlas_file(config.file) is None:
+                    print('  {} is not in widget\'s contents/ folder, no icon atlas written'.format(config.file))
+                else:
+                    with phase('icon atlas'):
+                        atlas, index, unusable = build_icon_atlas(get_used_cryptos(exchanges))
+                    for code in unusable:
+                        print('  Icon of {} is not valid SVG image, not included in icon atlas'.format(code))
+                    buffer += build_icon_index(index)
+
+        if config.show:
+            print('\n'.join(buffer))
+            for name, module in modules.items():
+                if name.endswith('.qml'):
+                    print('\n'.join(module))
+
+        if config.file is not None and not config.dry_run:
+            # exchange modules and icon atlas go first, so main file never refers to files not written yet
+            outputs = [(os.path.join(os.path.dirname(config.file), name), module,) for name, module in modules.items()]
+            if atlas is not None:
+                outputs.append((get_icon_atlas_file(config.file), [atlas],))
+            outputs.append((config.file, buffer,))
+            for file_name, content in outputs:
+                # relative paths (i.e. "js/../images") only resolve once all their folders exist
+                file_name = os.path.normpath(file_name)
+                try:
+                    with phase('write'):
+                        os.makedirs(os.path.dirname(os.path.abspath(file_name)), exist_ok = True)
+                        written = write_output(file_name, '\n'.join(content))
+                    if not written:
+                        print('{} is up to date'.format(file_name))
+                except IOError as e:
+                    raise IOError('Failed writing to: {}'.format(file_name)) from e
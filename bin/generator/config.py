@@ -0,0 +1,280 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import argparse
+import re
+from typing import List, Tuple
+
+from .const import (CACHE_DIR_NAME, CACHE_THRESHOLD, CMD_MERGE, DEFAULT_BREAKER_THRESHOLD, DEFAULT_CONCURRENCY,
+                    DEFAULT_CONNECT_TIMEOUT, DEFAULT_COVERAGE_EXCHANGES, DEFAULT_EXPIRY_JITTER, DEFAULT_LISTEN_HOST,
+                    DEFAULT_RATE_TOLERANCE, DEFAULT_READ_TIMEOUT, DEFAULT_RETRIES, DEFAULT_WATCH_INTERVAL,
+                    DEFAULT_WATCH_PROBES, ENGINE_ASYNC, ENGINE_POOL, FORMAT_COMPACT, FORMAT_PRETTY, FORMAT_SPLIT,
+                    ICON_ATLAS_DIR, SPLIT_MODULE_DIR)
+
+
+######################################################################
+
+class Config:
+    def __init__(self, args):
+        self.verbose = args.verbose
+        self.use_cache = not args.no_cache
+        self.cache_dir = args.cache_dir
+        self.cache_threshold = args.cache_threshold
+        self.file = args.file
+        self.force = args.force
+        self.dry_run = args.dry_run
+        self.show = args.show
+        self.no_gauge = args.no_gauge
+        self.exchange_filter = args.exchange
+        self.debug = args.debug
+        self.engine = args.engine
+        self.concurrency = args.concurrency
+        self.discovery = not args.no_discovery
+        self.connect_timeout = args.connect_timeout
+        self.read_timeout = args.read_timeout
+        self.retries = args.retries
+        self.breaker_threshold = args.breaker_threshold
+        self.deadline = args.deadline
+        self.max_probes = args.max_probes
+        self.time_budget = args.time_budget
+        self.expiry_jitter = args.expiry_jitter / 100
+        self.prune = not args.no_prune
+        self.stats_file = args.stats_file
+        self.incremental = args.incremental
+        self.format = args.format
+        self.batch = not args.no_batch
+        self.icon_atlas = not args.no_icon_atlas
+        self.shard = args.shard
+        self.record = args.record
+        self.replay = args.replay
+        self.profile = args.profile
+        self.profile_pstats = args.profile_pstats
+        self.profile_folded = args.profile_folded
+        self.coverage = args.coverage
+        self.check_rates = args.check_rates / 100 if args.check_rates is not None else None
+        self.watch = args.watch
+        self.listen = args.listen
+        self.resume = args.resume
+
+        if self.record is not None or self.replay is not None:
+            # all checks must go to (recorded or replayed) API, not be served from cache
+            self.use_cache = False
+        if self.record is not None:
+            # responses are collected by main process only, which is not the case for worker processes of pool engine
+            self.engine = ENGINE_ASYNC
+        if self.watch is not None:
+            # sessions (and whole cache) live as long as the process, with no worker processes started each cycle
+            self.engine = ENGINE_ASYNC
+            self.no_gauge = True
+            if self.max_probes is None:
+                self.max_probes = DEFAULT_WATCH_PROBES
+        # partial result files to combine (merge subcommand only)
+        self.shard_files = getattr(args, 'shard_files', None)
+
+        if self.debug:
+            self.no_gauge = True
+
+
+######################################################################
+
+def threshold(arg_value: str) -> int:
+    pat = re.compile(r"^([0-9]{1,3})([hdwmy]?)$")
+    match = pat.match(arg_value)
+    if not match:
+        raise argparse.ArgumentTypeError
+
+    val = int(match.group(1))
+    unit = match.group(2)
+
+    if val == 0:
+        raise argparse.ArgumentTypeError
+
+    # in millis
+    MIN = 60 * 1000
+    HOUR = MIN * 60
+    DAY = 24 * HOUR
+
+    multiplier = MIN
+    if unit != '':
+        mm = {
+            'h': HOUR,
+            'd': DAY,
+            'w': 7 * DAY,
+            'm': 30 * DAY,
+            'y': 365 * DAY,
+        }
+        multiplier = mm[unit]
+
+    # returning value in millis
+    return val * multiplier
+
+
+def shard(arg_value: str) -> Tuple[int, int]:
+    match = re.match(r'^([0-9]+)/([0-9]+)$', arg_value)
+    if not match:
+        raise argparse.ArgumentTypeError('expected "i/n" format, i.e. "1/4"')
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError('shard index must be in range 1-{}'.format(count))
+    return index, count
+
+
+def listen_address(arg_value: str) -> Tuple[str, int]:
+    host, _, port = arg_value.rpartition(':')
+    if not port.isdigit() or int(port) > 65535:
+        raise argparse.ArgumentTypeError('expected "[host:]port" format, i.e. "8765" or "0.0.0.0:8765"')
+    return host if host else DEFAULT_LISTEN_HOST, int(port)
+
+
+######################################################################
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    ag = parser.add_argument_group('Options')
+    ag.add_argument('-t', '--threshold', action = 'store', dest = 'cache_threshold', type = threshold, default = CACHE_THRESHOLD,
+                    help = 'Cache validity threshold in format XXXZ where XXX is number in range 1-999, '
+                           'Z is (optional) units specifier: "h", "d", "w", "m", "y". If unit is not specified, '
+                           'minutes are used. Default value: {}'.format(CACHE_THRESHOLD))
+    ag.add_argument('-n', '--nocache', action = 'store_true', dest = 'no_cache', default = False,
+                    help = 'Ignore validation result cache and always do the full API check.')
+    ag.add_argument('--cache-dir', action = 'store', dest = 'cache_dir', type = str, default = None, metavar = 'DIR',
+                    help = 'Validation result cache folder. Can be shared by concurrent runs (i.e. parallel jobs '
+                           'checking different exchanges), which then reuse each other\'s results. Must be on local '
+                           'file system. Legacy cache files are only migrated from default folder. '
+                           'Default: {}'.format(CACHE_DIR_NAME))
+    ag.add_argument('-o', '--out', action = 'store', dest = 'file', type = str,
+                    help = 'Optional. Name of JS file to be generated.')
+    ag.add_argument('-s', '--show', action = 'store_true', dest = 'show', default = False,
+                    help = 'Output generated JS code to stdout.')
+    ag.add_argument('-f', '--force', action = 'store_true', dest = 'force',
+                    help = 'Enforces ignoring certain issues (missing icons, existing target file).')
+    ag.add_argument('-e', '--exchange', action = 'store', dest = 'exchange', type = str,
+                    help = 'ID of exchange to process. Only this exchange will be used. In such case, "disabled" is ignored.')
+    ag.add_argument('-v', '--verbose', action = 'store_true', dest = 'verbose', default = False)
+    ag.add_argument('-g', '--nogauge', action = 'store_true', dest = 'no_gauge', default = False)
+    ag.add_argument('-r', '--dry-run', action = 'store_true', dest = 'dry_run', default = False)
+    ag.add_argument('-d', '--debug', action = 'store_true', dest = 'debug', default = False)
+    ag.add_argument('--engine', action = 'store', dest = 'engine', choices = [ENGINE_POOL, ENGINE_ASYNC], default = ENGINE_POOL,
+                    help = 'API probing engine. "{pool}" uses worker processes, "{aio}" uses asyncio with one pooled '
+                           'keep-alive HTTP session per exchange. Default: {pool}'.format(pool = ENGINE_POOL, aio = ENGINE_ASYNC))
+    ag.add_argument('-c', '--concurrency', action = 'store', dest = 'concurrency', type = int, default = DEFAULT_CONCURRENCY,
+                    help = 'Max number of API probes running at the same time. Default: {}'.format(DEFAULT_CONCURRENCY))
+    ag.add_argument('--no-discovery', action = 'store_true', dest = 'no_discovery', default = False,
+                    help = 'Do not use exchange market listings. Probe each pair with separate ticker API call instead.')
+    ag.add_argument('--connect-timeout', action = 'store', dest = 'connect_timeout', type = float,
+                    default = DEFAULT_CONNECT_TIMEOUT,
+                    help = 'API connection timeout in seconds. Default: {}'.format(DEFAULT_CONNECT_TIMEOUT))
+    ag.add_argument('--read-timeout', action = 'store', dest = 'read_timeout', type = float, default = DEFAULT_READ_TIMEOUT,
+                    help = 'API response read timeout in seconds. Default: {}'.format(DEFAULT_READ_TIMEOUT))
+    ag.add_argument('--retries', action = 'store', dest = 'retries', type = int, default = DEFAULT_RETRIES,
+                    help = 'Number of retries of API calls failed due to network or server error. '
+                           'Default: {}'.format(DEFAULT_RETRIES))
+    ag.add_argument('--breaker', action = 'store', dest = 'breaker_threshold', type = int,
+                    default = DEFAULT_BREAKER_THRESHOLD,
+                    help = 'Number of consecutive failed checks after which all remaining checks of given exchange '
+                           'are given up. Use 0 to disable. Default: {}'.format(DEFAULT_BREAKER_THRESHOLD))
+    ag.add_argument('--deadline', action = 'store', dest = 'deadline', type = int, default = None,
+                    help = 'Max duration of API checks in seconds. Checks not completed by then are given up.')
+    ag.add_argument('--max-probes', action = 'store', dest = 'max_probes', type = int, default = None,
+                    help = 'Max number of ticker API checks to do. Expired cache entries that do not fit the budget '
+                           'are used as they are (stalest and previously confirmed pairs are refreshed first).')
+    ag.add_argument('--time-budget', action = 'store', dest = 'time_budget', type = int, default = None,
+                    help = 'Max time (in seconds) spent on starting new ticker API checks. Same as with --max-probes, '
+                           'expired cache entries are used for checks that did not fit the budget.')
+    ag.add_argument('--expiry-jitter', action = 'store', dest = 'expiry_jitter', type = int,
+                    default = DEFAULT_EXPIRY_JITTER,
+                    help = 'Max percentage by which validity of each cache entry is randomly shortened, so entries '
+                           'cached in the same run do not expire all at once. Default: {}'.format(DEFAULT_EXPIRY_JITTER))
+    ag.add_argument('--no-prune', action = 'store_true', dest = 'no_prune', default = False,
+                    help = 'Check all currency combinations, even those pruning rules say cannot exist.')
+    ag.add_argument('--stats-json', action = 'store', dest = 'stats_file', type = str, default = None,
+                    help = 'Optional. Name of JSON file to write run statistics to: per exchange request counts, '
+                           'status code and latency histograms, retries, timeouts, cache hit ratio and bytes received.')
+    ag.add_argument('--format', action = 'store', dest = 'format', choices = [FORMAT_PRETTY, FORMAT_COMPACT, FORMAT_SPLIT],
+                    default = FORMAT_PRETTY,
+                    help = 'Format of generated file. "{compact}" interns currency codes and encodes pairs as bitsets, '
+                           'which makes file smaller and faster to load. "{split}" writes currencies and list of exchanges '
+                           'only, with data of each exchange in separate module (in "{dir}" folder next to the file), '
+                           'loaded by widget only when used. Default: {pretty}'.format(
+                        pretty = FORMAT_PRETTY, compact = FORMAT_COMPACT, split = FORMAT_SPLIT, dir = SPLIT_MODULE_DIR))
+    ag.add_argument('--incremental', action = 'store_true', dest = 'incremental', default = False,
+                    help = 'Use cached results regardless of their age, so only combinations never checked before '
+                           '(i.e. of newly added currency) and these of exchanges whose definition changed are checked.')
+    ag.add_argument('--no-icon-atlas', action = 'store_true', dest = 'no_icon_atlas', default = False,
+                    help = 'Do not pack icons of listed cryptos into single atlas image (written to {} folder next '
+                           'to generated file, if it is in widget\'s contents/ folder), so widget loads each icon '
+                           'from its own file.'.format(ICON_ATLAS_DIR))
+    ag.add_argument('--no-batch', action = 'store_true', dest = 'no_batch', default = False,
+                    help = 'Do not check batch ticker endpoints and do not include batch functions in generated file, '
+                           'so widget does one API request per ticker.')
+    ag.add_argument('--shard', action = 'store', dest = 'shard', type = shard, default = None,
+                    help = 'Check only i-th of n deterministic parts of all (exchange, crypto, pair) combinations, '
+                           'i.e. "2/4", and write partial result file (JSON) to --out instead of JS data file. '
+                           'Use "{} SHARD..." subcommand to combine all partial results.'.format(CMD_MERGE))
+    fixtures = ag.add_mutually_exclusive_group()
+    fixtures.add_argument('--record', action = 'store', dest = 'record', type = str, default = None, metavar = 'ARCHIVE',
+                          help = 'Record all API responses to given compressed archive, for later use with --replay. '
+                                 'Implies --nocache and "{}" engine.'.format(ENGINE_ASYNC))
+    fixtures.add_argument('--replay', action = 'store', dest = 'replay', type = str, default = None, metavar = 'ARCHIVE',
+                          help = 'Serve API responses from archive made with --record, without any network access. '
+                                 'Implies --nocache. Requests not found in the archive are reported as failed checks.')
+    ag.add_argument('--profile', action = 'store_true', dest = 'profile', default = False,
+                    help = 'Print number of calls, wall and CPU time of each phase of the run once it completes.')
+    ag.add_argument('--profile-pstats', action = 'store', dest = 'profile_pstats', type = str, default = None,
+                    metavar = 'FILE', help = 'Optional. Name of file to write cProfile data of the run to '
+                                             '(to be examined with pstats, snakeviz or similar tools).')
+    ag.add_argument('--profile-folded', action = 'store', dest = 'profile_folded', type = str, default = None,
+                    metavar = 'FILE', help = 'Optional. Name of file to write phase timings to, as folded stacks '
+                                             'accepted by flamegraph.pl, speedscope and similar tools.')
+    ag.add_argument('--coverage', action = 'store', dest = 'coverage', type = int, nargs = '?', default = None,
+                    const = DEFAULT_COVERAGE_EXCHANGES, metavar = 'N',
+                    help = 'Print number of cryptos tradable against each quote currency and pairs listed by at least '
+                           'N exchanges. Default N: {}'.format(DEFAULT_COVERAGE_EXCHANGES))
+    ag.add_argument('--check-rates', action = 'store', dest = 'check_rates', type = float, nargs = '?', default = None,
+                    const = DEFAULT_RATE_TOLERANCE, metavar = 'PERCENT',
+                    help = 'Fetch rates of all confirmed pairs from batch ticker endpoints and report these deviating '
+                           'by more than PERCENT from median rate of all exchanges quoting the pair, or looking '
+                           'inverted. Default PERCENT: {}'.format(DEFAULT_RATE_TOLERANCE))
+    ag.add_argument('--resume', action = 'store_true', dest = 'resume', default = False,
+                    help = 'Continue interrupted run: results of checks it completed are taken from its journal, '
+                           'so only the remaining ones are checked. Run setup (currencies, exchanges) must not change.')
+    ag.add_argument('--watch', action = 'store', dest = 'watch', type = int, nargs = '?', default = None,
+                    const = DEFAULT_WATCH_INTERVAL, metavar = 'SECONDS',
+                    help = 'Keep running, starting new checking cycle every SECONDS (default: {interval}). First cycle '
+                           'checks all the pairs, following ones up to --max-probes (default: {probes}) expired pairs, '
+                           'and data file is rewritten only if confirmed pairs change. Implies "{engine}" engine.'.format(
+                        interval = DEFAULT_WATCH_INTERVAL, probes = DEFAULT_WATCH_PROBES, engine = ENGINE_ASYNC))
+    ag.add_argument('--listen', action = 'store', dest = 'listen', type = listen_address, default = None,
+                    metavar = '[HOST:]PORT',
+                    help = 'With --watch, answer pair availability queries over HTTP on given port '
+                           '(of {} unless host is given).'.format(DEFAULT_LISTEN_HOST))
+    return parser
+
+
+def build_merge_arg_parser() -> argparse.ArgumentParser:
+    """
+    Arguments of merge subcommand: options of regular run (the checking ones are ignored) and partial result
+    files of sharded runs.
+    """
+    parser = build_arg_parser()
+    parser.prog = '{} {}'.format(parser.prog, CMD_MERGE)
+    parser.add_argument('shard_files', metavar = 'SHARD', nargs = '+',
+                        help = 'Partial result files written by --shard runs.')
+    return parser
+
+
+def create_config(argv: List[str] = None) -> Config:
+    """
+    Builds run configuration the same way command line arguments do.
+
+    :param argv: command line style options, i.e. ['--dry-run', '--engine', 'async']. Defaults are used if not given.
+    """
+    return Config(build_arg_parser().parse_args(argv if argv is not None else []))
@@ -0,0 +1,117 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+CACHE_THRESHOLD = '30d'
+
+# Version of partial result file format written by sharded runs (see --shard)
+SHARD_FILE_VERSION = 1
+# Subcommand combining partial results of sharded runs
+CMD_MERGE = 'merge'
+# Version of recorded API responses archive format (see --record)
+FIXTURE_ARCHIVE_VERSION = 1
+# Pacing (requests per second) used for replayed API calls, as there's no real API to protect
+REPLAY_RATE_LIMIT = 1000000.0
+# Version of serialized pair matrix format (see PairMatrix.to_bytes())
+MATRIX_FORMAT_VERSION = 1
+# Default min number of exchanges listing a pair for --coverage report
+DEFAULT_COVERAGE_EXCHANGES = 2
+# Rates check (see --check-rates): default max deviation (in percent) of rate from median of all exchanges quoting
+# the pair, and min number of exchanges quoting the pair for its rates to be compared
+DEFAULT_RATE_TOLERANCE = 10
+RATE_CHECK_MIN_QUOTES = 3
+# Kinds of suspicious rates
+RATE_DEVIATION = 'deviation'
+RATE_INVERTED = 'inverted'
+
+# Journal of probing of interrupted run (see --resume): file name (in cache folder), format version and
+# max interval (in seconds) between syncs to disk
+JOURNAL_FILE_NAME = 'journal.jsonl'
+JOURNAL_FILE_VERSION = 1
+JOURNAL_SYNC_INTERVAL = 1.0
+
+# Watch mode (see --watch): default interval (in seconds) between starts of checking cycles, default max
+# number of ticker API checks per cycle and default interface to answer queries on (see --listen)
+DEFAULT_WATCH_INTERVAL = 60
+DEFAULT_WATCH_PROBES = 200
+DEFAULT_LISTEN_HOST = '127.0.0.1'
+
+# Generated data file formats
+FORMAT_PRETTY = 'pretty'
+FORMAT_COMPACT = 'compact'
+FORMAT_SPLIT = 'split'
+# Folder (next to main data file) holding exchange modules of "split" format
+SPLIT_MODULE_DIR = 'exchanges'
+# Icon atlas image, its folder (relative to data file folder, as widget's images folder is) and size of its cell
+# holding single icon (in atlas units)
+ICON_ATLAS_FILE = 'icon-atlas.svg'
+ICON_ATLAS_DIR = '../images'
+ICON_ATLAS_CELL = 64
+CACHE_DIR_NAME = '~/.cryto-tracker-plasmoid-gen-cache'
+CACHE_DB_NAME = 'cache.sqlite'
+# Max time (in seconds) to wait for cache database locked by concurrent run, and interval between writes
+# of collected results to the database during the run (so concurrent and later runs can reuse them)
+CACHE_BUSY_TIMEOUT = 60.0
+CACHE_FLUSH_INTERVAL = 15.0
+# Max percentage by which cache entry validity gets randomly shortened
+DEFAULT_EXPIRY_JITTER = 20
+
+ENGINE_POOL = 'pool'
+ENGINE_ASYNC = 'async'
+DEFAULT_CONCURRENCY = 6
+# Max number of probes sent to worker process of "pool" engine as single task
+POOL_BATCH_MAX = 16
+
+# Default API request pacing per exchange host (requests per second, burst size)
+DEFAULT_RATE_LIMIT = 5.0
+DEFAULT_RATE_BURST = 5
+# Max number of pairs requested with single batch ticker API call (see Exchange.batch_url)
+DEFAULT_BATCH_SIZE = 50
+# Max relative difference between rate of the pair taken from batch ticker response and from its single ticker one
+# (both are fetched one after another, so the market may move in between)
+BATCH_RATE_TOLERANCE = 0.01
+# HTTP status codes exchanges use to tell we are sending too many requests
+THROTTLE_STATUS_CODES = [429, 418, ]
+# How many times throttled request is retried before we give up on it
+THROTTLE_MAX_RETRIES = 5
+# Backoff (in seconds) used when throttled response carries no hint how long to wait
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# API request timeouts (in seconds)
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 10.0
+# How many times request failed due to network issue or server error is retried
+DEFAULT_RETRIES = 2
+# HTTP status codes that tell about server side issue, not about pair validity
+RETRY_STATUS_CODES = [500, 502, 503, 504, ]
+# Number of consecutive failed probes after which all remaining probes of exchange are given up
+DEFAULT_BREAKER_THRESHOLD = 10
+
+# Reasons of failed probes
+ERR_TIMEOUT = 'timeout'
+ERR_CONNECTION = 'connection error'
+ERR_THROTTLED = 'throttled'
+ERR_CIRCUIT_OPEN = 'circuit open'
+ERR_DEADLINE = 'deadline exceeded'
+ERR_STALLED = 'stalled'
+ERR_BUDGET = 'out of time budget'
+ERR_EXCEPTION = 'exception'
+ERR_INTERRUPTED = 'interrupted'
+# API call replayed with --replay is not in the archive
+ERR_NOT_RECORDED = 'not in archive'
+
+# Upper bounds (in seconds) of API call latency histogram buckets (see --stats-json)
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, ]
+
+# Currency classes (see "type" in currencies). Currencies with no type specified are crypto currencies.
+CURRENCY_CRYPTO = 'crypto'
+CURRENCY_FIAT = 'fiat'
+CURRENCY_STABLECOIN = 'stablecoin'
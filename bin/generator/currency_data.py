@@ -0,0 +1,62 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+from .const import CURRENCY_FIAT, CURRENCY_STABLECOIN
+
+
+######################################################################
+
+currencies = {
+    '1INCH': {'name': '1inch', },
+    'ADA':   {'name': 'Cardano', },
+    'ATOM':  {'name': 'Cosmos', },
+    'BCH':   {'name': 'Bitcoin Cash', 'symbol': '฿', },
+    'BNB':   {'name': 'Binance Coin', },
+    'BNT':   {'name': 'Bancor', },
+    'BSV':   {'name': 'Bitcoin SV', },
+    'BTC':   {'name': 'Bitcoin', 'symbol': '₿', },
+    'BTG':   {'name': 'Bitcoin Gold', },
+    'BTT':   {'name': 'BitTorrent', },
+    'BUSD':  {'name': 'Binance USD', 'symbol': 'B$', 'type': CURRENCY_STABLECOIN, },
+    'COMP':  {'name': 'Compound', },
+    'CZK':   {'name': 'Czech Krown', 'symbol': 'Kč', 'type': CURRENCY_FIAT, },
+    'DASH':  {'name': 'Dash', },
+    'DOGE':  {'name': 'Dogecoin', },
+    'DOT':   {'name': 'Polkadot', },
+    'EOS':   {'name': 'EOS', },
+    'ETC':   {'name': 'Ethereum Classic', },
+    'ETH':   {'name': 'Ethereum', 'symbol': 'Ξ', },
+    'EUR':   {'name': 'Euro', 'symbol': '€', 'type': CURRENCY_FIAT, },
+    'FIL':   {'name': 'Filecoin', },
+    'GAME':  {'name': 'GameCredits', },
+    'GBP':   {'name': 'British Pound', 'symbol': '£', 'type': CURRENCY_FIAT, },
+    'GLM':   {'name': 'Golem', },
+    'JPY':   {'name': 'Japanese Yen', 'symbol': '¥', 'type': CURRENCY_FIAT, },
+    'LINK':  {'name': 'Chainlink', },
+    'LSK':   {'name': 'Lisk', },
+    'LTC':   {'name': 'Litecoin', 'symbol': 'Ł', },
+    'LUNA':  {'name': 'Terra', },
+    'MKR':   {'name': 'Maker', },
+    'PLN':   {'name': 'Polish Zloty', 'symbol': 'zł', 'type': CURRENCY_FIAT, },
+    'SOL':   {'name': 'Solana', },
+    'THETA': {'name': 'Theta', },
+    'UNI':   {'name': 'Uniswap', },
+    'USD':   {'name': 'US Dollar', 'symbol': '$', 'type': CURRENCY_FIAT, },
+    'USDC':  {'name': 'USD Coin', 'symbol': '$C', 'type': CURRENCY_STABLECOIN, },
+    'USDT':  {'name': 'USD Tether', 'symbol': '$T', 'type': CURRENCY_STABLECOIN, },
+    'WBTC':  {'name': 'Wrapped Bitcoin', },
+    'XLM':   {'name': 'Stellar', },
+    'XMR':   {'name': 'Monero', },
+    'XRP':   {'name': 'Ripple', 'symbol': 'Ʀ', },
+    'XTZ':   {'name': 'Tezos', },
+    'ZEC':   {'name': 'ZCash', },
+    'ZRX':   {'name': '0x', },
+}
@@ -0,0 +1,656 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import hashlib
+import json
+import time
+import urllib.parse
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from .cache import ResultCache
+from .config import Config
+from .const import (BACKOFF_BASE, BACKOFF_MAX, BATCH_RATE_TOLERANCE, DEFAULT_BATCH_SIZE, DEFAULT_CONCURRENCY, DEFAULT_CONNECT_TIMEOUT, DEFAULT_RATE_BURST,
+                    DEFAULT_RATE_LIMIT, DEFAULT_READ_TIMEOUT, DEFAULT_RETRIES, ERR_CIRCUIT_OPEN, ERR_CONNECTION,
+                    ERR_DEADLINE, ERR_EXCEPTION, ERR_NOT_RECORDED, ERR_THROTTLED, ERR_TIMEOUT, RETRY_STATUS_CODES,
+                    THROTTLE_MAX_RETRIES, THROTTLE_STATUS_CODES)
+from .matrix import PairMatrix
+from .result import TestResult
+from .utils import jittered_backoff, parse_rate, parse_retry_after
+
+# requests is imported where it is needed, so runs that do no API calls do not pay for its import
+if TYPE_CHECKING:
+    import requests
+
+
+######################################################################
+
+class Exchange:
+    def __init__(self, code: str, name: str, url: str, api_url: str = None, markets_url: str = None,
+                 functions: Dict[str, str] = None, disabled: bool = False,
+                 valid_ticker_pairs: List[str] = None, config: Config = None,
+                 rate_limit: float = DEFAULT_RATE_LIMIT, rate_burst: int = DEFAULT_RATE_BURST,
+                 quotes: List[str] = None, class_crosses: List[str] = None,
+                 batch_url: str = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.code = code
+        self.name = name
+        self.url = url
+        self.api_url = api_url
+        # endpoint listing all markets at once (see discover_pairs())
+        self.markets_url = markets_url
+        self.functions = functions if functions else {}
+        self.disabled = disabled
+
+        # confirmed pairs, kept in matrix shared by all exchanges (see Exchanges.init_matrix())
+        self.matrix: Optional[PairMatrix] = None
+        self.valid_ticker_pairs = valid_ticker_pairs
+
+        # currencies exchange lists pairs against (None means any)
+        self.quotes = quotes
+        # currency classes (CURRENCY_*) exchange pairs within the same class, i.e. fiat against fiat
+        self.class_crosses = class_crosses if class_crosses else []
+
+        # max number of API requests per second (and max burst) we allow ourselves to send to exchange's host
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+
+        # endpoint returning tickers of many pairs at once (see verify_batch()) and max number of pairs
+        # per request (0 means endpoint returns all tickers anyway)
+        self.batch_url = batch_url
+        self.batch_size = batch_size
+        # set once batch endpoint is confirmed to work with confirmed pairs
+        self.batch_verified = False
+
+        self.config = config
+
+        # pooled keep-alive HTTP session, created lazily (see get_session())
+        self._session = None
+
+    def __getstate__(self) -> Dict:
+        # live HTTP session is not going to be shipped to worker processes
+        state = self.__dict__.copy()
+        state['_session'] = None
+        # workers do not collect pairs
+        state['matrix'] = None
+        return state
+
+    def get_session(self) -> "requests.Session":
+        """
+        Returns HTTP session bound to this exchange. Its connection pool is sized to configured concurrency,
+        so all probes against exchange's host reuse already established keep-alive connections.
+
+        :return: requests.Session
+        """
+        if self._session is None and self.config is not None and self.config.replay is not None:
+            from .fixtures import ReplaySession, get_archive
+
+            self._session = ReplaySession(get_archive(self.config.replay, replay = True))
+        if self._session is None:
+            import requests
+
+            pool_size = self.config.concurrency if self.config is not None else DEFAULT_CONCURRENCY
+            adapter = requests.adapters.HTTPAdapter(pool_connections = 1, pool_maxsize = pool_size)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
+
+    @property
+    def host(self) -> str:
+        return urllib.parse.urlparse(self.api_url).netloc
+
+    def get_timeout(self) -> Tuple[float, float]:
+        if self.config is None:
+            return DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+        return self.config.connect_timeout, self.config.read_timeout
+
+    def is_ticker_valid(self, response) -> bool:
+        return response.status_code == HTTPStatus.OK
+
+    def is_throttled(self, response) -> bool:
+        """
+        Tells if response means we got rate limited. Such response says nothing about pair validity
+        so request must be retried later.
+        """
+        return response.status_code in THROTTLE_STATUS_CODES
+
+    def get_backoff_delay(self, response) -> Optional[float]:
+        """
+        Returns number of seconds we should hold off sending further requests to exchange's host, as
+        hinted by response headers, or None if there's no such hint.
+        """
+        return parse_retry_after(response.headers.get('Retry-After'))
+
+    def discover_pairs(self, currencies: Dict[str, Dict],
+                       calls: List[Tuple[object, float, int]] = None) -> Optional[Set[Tuple[str, str]]]:
+        """
+        Fetches exchange's market listing with single API call and intersects it with known currencies.
+
+        :param currencies: currencies we are interested in
+        :param calls: optional list to record made API call to (see call_api())
+        :return: set of available (crypto, pair) tuples or None if markets cannot be discovered, in which case
+                 each pair needs to be probed separately.
+        """
+        if self.markets_url is None:
+            return None
+
+        import requests
+        try:
+            response = self.call_api(self.markets_url, calls)
+            if response.status_code != HTTPStatus.OK or self.is_throttled(response):
+                self.d('#{sc} market discovery failed: {url}'.format(sc = response.status_code, url = self.markets_url))
+                return None
+            markets = self.parse_markets(json.loads(response.text))
+        except (requests.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+            self.d('Market discovery failed: {url}: {msg}'.format(url = self.markets_url, msg = e))
+            return None
+
+        return {(crypto, pair) for crypto, pair in markets if crypto in currencies and pair in currencies}
+
+    def parse_markets(self, data) -> List[Tuple[str, str]]:
+        """
+        Converts decoded markets_url response into list of (crypto, pair) tuples. Subclasses that set
+        markets_url must implement this.
+        """
+        raise NotImplementedError
+
+    def is_ticker_pair_valid(self, crypto: str, pair: str) -> bool:
+        # all pairs allowed unless list is explicitly given
+        if self.valid_ticker_pairs is None:
+            return True
+        return crypto + pair in self.valid_ticker_pairs
+
+    @property
+    def pairs(self) -> Dict[str, List[str]]:
+        """
+        Confirmed pairs, keyed by crypto (both in currency code order).
+        """
+        return self.matrix.get_exchange_pairs(self.code) if self.matrix is not None else {}
+
+    def pair_exists(self, item: str, pair: str) -> bool:
+        return item == pair or (self.matrix is not None and self.matrix.get(self.code, item, pair))
+
+    def add_pair(self, crypto: str, pair: str):
+        if self.matrix is None:
+            raise RuntimeError('{}: no pair matrix to add pairs to.'.format(self.code))
+        self.matrix.set(self.code, crypto, pair)
+
+    def build_tr_object(self, crypto: str, pair: str, config: Config, cache: ResultCache) -> "TestResult":
+        tr = TestResult(ex_code = self.code, crypto = crypto, pair = pair, use_cache = config.use_cache)
+        tr.cache_load(cache, None if config.incremental else config.cache_threshold, config.expiry_jitter)
+        return tr
+
+    # Methods used by batch ticker check only. They do not affect pair validation, so are not fingerprinted.
+    fingerprint_skipped = ['get_batch_symbol', 'get_batch_keys', 'build_batch_url', 'parse_batch_rates',
+                           'parse_ticker_rate', ]
+
+    def get_fingerprint(self) -> str:
+        """
+        Returns fingerprint of everything check results depend on: API endpoints and code of exchange class
+        (i.e. its validator). Parts used for output only (name, url, functions) are not included, so changing
+        them does not invalidate cached results.
+        """
+        def update_with_code(code) -> None:
+            digest.update(code.co_code)
+            digest.update(repr(code.co_names).encode())
+            for const in code.co_consts:
+                if hasattr(const, 'co_code'):
+                    update_with_code(const)
+                else:
+                    digest.update(repr(const).encode())
+
+        digest = hashlib.sha1()
+        digest.update(json.dumps([type(self).__name__, self.api_url, self.markets_url,
+                                  self.valid_ticker_pairs]).encode())
+        for name, attr in sorted(vars(type(self)).items()):
+            if name in self.fingerprint_skipped:
+                continue
+            # unwrapping static methods, class methods and properties
+            func = getattr(attr, '__func__', getattr(attr, 'fget', attr))
+            if hasattr(func, '__code__'):
+                digest.update(name.encode())
+                update_with_code(func.__code__)
+            elif isinstance(attr, (str, int, float, list, tuple, dict, )):
+                digest.update('{}:{!r}'.format(name, attr).encode())
+        return digest.hexdigest()
+
+    def build_api_url(self, tr: TestResult) -> str:
+        return self.api_url.format(crypto = tr.crypto, pair = tr.pair)
+
+    def fetch(self, tr: TestResult) -> "requests.Response":
+        if tr.calls is None:
+            tr.calls = []
+        return self.call_api(self.build_api_url(tr), tr.calls)
+
+    def call_api(self, url: str, calls: List[Tuple[object, float, int]] = None) -> "requests.Response":
+        """
+        Does API call using exchange's session.
+
+        :param url: URL to call
+        :param calls: optional list to append (HTTP status or error reason, duration, body bytes) of the call to
+        """
+        import requests
+
+        started = time.monotonic()
+        try:
+            response = self.get_session().get(url, timeout = self.get_timeout())
+        except requests.RequestException as e:
+            if calls is not None:
+                calls.append((self.get_error_reason(e), time.monotonic() - started, 0,))
+            raise
+        if calls is not None:
+            size = response.headers.get('Content-Length')
+            calls.append((response.status_code, response.elapsed.total_seconds(),
+                          int(size) if size is not None and size.isdigit() else len(response.content),))
+        if self.config is not None and self.config.record is not None and self.get_retry_reason(response) is None:
+            from .fixtures import get_archive
+
+            get_archive(self.config.record).add(url, response)
+        return response
+
+    def evaluate(self, tr: TestResult, response: "requests.Response") -> TestResult:
+        tr.elapsed = response.elapsed.total_seconds()
+        tr.rc = self.is_ticker_valid(response)
+        self.d('#{sc} isValid:{rc} {url}'.format(url = response.url, sc = response.status_code, rc = tr.rc))
+        return tr
+
+    def get_retry_reason(self, response: "requests.Response") -> Optional[str]:
+        """
+        Tells if response is inconclusive and request must be retried.
+
+        :return: reason (ERR_THROTTLED or HTTP status) or None if response can be evaluated
+        """
+        if self.is_throttled(response):
+            return ERR_THROTTLED
+        if response.status_code in RETRY_STATUS_CODES:
+            return 'HTTP {}'.format(response.status_code)
+        return None
+
+    @staticmethod
+    def get_error_reason(e: Exception) -> str:
+        import requests
+        from .fixtures import ArchiveMiss
+
+        if isinstance(e, requests.Timeout):
+            return ERR_TIMEOUT
+        if isinstance(e, requests.RequestException):
+            return ERR_CONNECTION
+        if isinstance(e, ArchiveMiss):
+            return ERR_NOT_RECORDED
+        return ERR_EXCEPTION
+
+    def probe(self, tr: TestResult, deadline: Optional[float] = None, deadline_reason: str = ERR_DEADLINE) -> TestResult:
+        """
+        Checks pair with blocking API call. Throttled and failed requests are retried after backoff (as
+        there's no shared scheduler in worker process) and if that does not help, result is marked as failed.
+
+        :param tr: pair to check
+        :param deadline: time.time() based moment after which no more API calls should be made
+        :param deadline_reason: failure reason reported once deadline passes
+        """
+        import requests
+
+        retries = self.config.retries if self.config is not None else DEFAULT_RETRIES
+        throttled_cnt = failed_cnt = 0
+        while True:
+            if deadline is not None and time.time() >= deadline:
+                return tr.fail(deadline_reason)
+
+            try:
+                response = self.fetch(tr)
+                reason = self.get_retry_reason(response)
+                if reason is None:
+                    return self.evaluate(tr, response)
+            except requests.RequestException as e:
+                response = None
+                reason = self.get_error_reason(e)
+
+            if reason == ERR_THROTTLED:
+                delay = self.get_backoff_delay(response)
+                if delay is None:
+                    delay = min(BACKOFF_BASE * (2 ** throttled_cnt), BACKOFF_MAX)
+                throttled_cnt += 1
+                tr.throttled_cnt += 1
+                if throttled_cnt > THROTTLE_MAX_RETRIES:
+                    return tr.fail(reason)
+            else:
+                delay = jittered_backoff(failed_cnt)
+                failed_cnt += 1
+                if failed_cnt > retries:
+                    return tr.fail(reason)
+
+            self.d('{reason}, retrying in {delay:.1f}s: {url}'.format(
+                reason = reason, delay = delay, url = self.build_api_url(tr)))
+            tr.retries += 1
+            time.sleep(delay)
+
+    def do_api_call(self, tr: TestResult, tripped = None, deadline: Optional[float] = None,
+                    deadline_reason: str = ERR_DEADLINE) -> TestResult:
+        if tripped is not None and self.code in tripped:
+            return tr.fail(ERR_CIRCUIT_OPEN)
+        try:
+            return self.probe(tr, deadline, deadline_reason)
+        except Exception as e:
+            # Reported as failed probe, so it is retried on next run instead of being cached as invalid pair
+            reason = self.get_error_reason(e)
+            if reason == ERR_EXCEPTION:
+                self.do_api_call_error_callback(str(e))
+            return tr.fail(reason)
+
+    def parse_ticker_rate(self, data) -> Optional[str]:
+        """
+        Extracts rate from decoded api_url response. Must behave the same way as exchange's
+        "getRateFromExchangeData" JS function does.
+        """
+        raise NotImplementedError
+
+    def get_ticker_rate(self, crypto: str, pair: str,
+                        calls: List[Tuple[object, float, int]] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Fetches rate of given pair with single ticker API call, extracted the way widget does it.
+
+        :param calls: optional list to record made API call to (see call_api())
+        :return: rate (None on failure) and failure reason (None on success)
+        """
+        import requests
+        tr = TestResult(ex_code = self.code, crypto = crypto, pair = pair, use_cache = False)
+        try:
+            response = self.call_api(self.build_api_url(tr), calls)
+            if response.status_code != HTTPStatus.OK or self.is_throttled(response):
+                return None, 'HTTP {}'.format(response.status_code)
+            return self.parse_ticker_rate(json.loads(response.text)), None
+        except requests.RequestException as e:
+            return None, self.get_error_reason(e)
+        except (ValueError, KeyError, TypeError, AttributeError, IndexError) as e:
+            return None, 'unexpected response: {}'.format(e)
+
+    def get_batch_symbol(self, crypto: str, pair: str) -> str:
+        return crypto + pair
+
+    def build_batch_url(self, pairs: List[Tuple[str, str]]) -> str:
+        return self.batch_url.format(symbols = ','.join([self.get_batch_symbol(crypto, pair) for crypto, pair in pairs]))
+
+    def parse_batch_rates(self, data, pairs: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Extracts rates of given pairs from decoded batch_url response. Must behave the same way as exchange's
+        "getRatesFromBatchData" JS function does. Subclasses that set batch_url must implement this.
+
+        :return: rates in order of pairs (None for pairs not found in response)
+        """
+        raise NotImplementedError
+
+    def get_batch_rates(self, pairs: List[Tuple[str, str]],
+                        calls: List[Tuple[object, float, int]] = None) -> Tuple[List[Optional[str]], Optional[str]]:
+        """
+        Fetches rates of given pairs with single batch ticker API call, extracted the way widget does it.
+
+        :param calls: optional list to record made API call to (see call_api())
+        :return: rates in order of pairs (empty list on failure) and failure reason (None on success)
+        """
+        import requests
+        try:
+            response = self.call_api(self.build_batch_url(pairs), calls)
+            if response.status_code != HTTPStatus.OK or self.is_throttled(response):
+                return [], 'HTTP {}'.format(response.status_code)
+            return self.parse_batch_rates(json.loads(response.text), pairs), None
+        except requests.RequestException as e:
+            return [], self.get_error_reason(e)
+        except (ValueError, KeyError, TypeError, AttributeError, IndexError) as e:
+            return [], 'unexpected response: {}'.format(e)
+
+    def get_confirmed_pairs(self) -> List[Tuple[str, str]]:
+        # sorted, so the same pairs are requested regardless of order checks completed in
+        return sorted([(crypto, pair) for crypto, pairs in self.pairs.items() for pair in pairs])
+
+    def verify_batch(self, calls: List[Tuple[object, float, int]] = None) -> Optional[str]:
+        """
+        Checks batch ticker endpoint with single API call, requesting (up to batch_size) confirmed pairs.
+        Each of them must get its rate from the response. As widget falls back to single ticker API call
+        for pairs missing in batch response, rate of first pair is also fetched that way and both must match.
+
+        :param calls: optional list to record made API call to (see call_api())
+        :return: None if batch endpoint works, failure reason otherwise
+        """
+        if self.batch_url is None:
+            return 'no batch endpoint'
+        pairs = self.get_confirmed_pairs()
+        if not pairs:
+            return 'no confirmed pairs'
+        if self.batch_size > 0:
+            pairs = pairs[:self.batch_size]
+
+        rates, reason = self.get_batch_rates(pairs, calls)
+        if reason is not None:
+            return reason
+        missing = ['{}/{}'.format(crypto, pair) for (crypto, pair), rate in zip(pairs, rates)
+                   if parse_rate(rate) is None]
+        if missing:
+            return 'no rate of {}'.format(', '.join(missing))
+
+        (crypto, pair), batch_rate = pairs[0], parse_rate(rates[0])
+        single_rate, reason = self.get_ticker_rate(crypto, pair, calls)
+        if reason is not None:
+            return 'single ticker of {}/{}: {}'.format(crypto, pair, reason)
+        if parse_rate(single_rate) is None:
+            return 'no rate of {}/{} in single ticker response'.format(crypto, pair)
+        if abs(parse_rate(single_rate) - batch_rate) > batch_rate * BATCH_RATE_TOLERANCE:
+            return 'single ticker rate of {}/{} ({}) differs from batch one ({})'.format(
+                crypto, pair, single_rate, rates[0])
+        return None
+
+    def get_all_rates(self, calls: List[Tuple[object, float, int]] = None) -> Tuple[Dict[Tuple[str, str], float],
+                                                                                    Optional[str]]:
+        """
+        Fetches rates of all confirmed pairs from batch ticker endpoint, with as few API calls as batch_size allows.
+
+        :param calls: optional list to record made API calls to (see call_api())
+        :return: (crypto, pair) => rate (pairs with no valid rate are not included) and failure reason
+                 (None on success)
+        """
+        if self.batch_url is None:
+            return {}, 'no batch endpoint'
+        pairs = self.get_confirmed_pairs()
+        size = self.batch_size if self.batch_size > 0 else max(1, len(pairs))
+        result = {}
+        for offset in range(0, len(pairs), size):
+            chunk = pairs[offset:offset + size]
+            rates, reason = self.get_batch_rates(chunk, calls)
+            if reason is not None:
+                return result, reason
+            for cell, rate in zip(chunk, rates):
+                rate = parse_rate(rate)
+                if rate is not None:
+                    result[cell] = rate
+        return result, None
+
+    def do_api_call_error_callback(self, msg: str) -> None:
+        print('Error Callback: {}'.format(msg))
+
+    def d(self, msg):
+        if self.config.debug:
+            print(msg)
+
+
+######################################################################
+
+class Binance(Exchange):
+    def is_ticker_valid(self, response: "requests.Response") -> bool:
+        if response.status_code != HTTPStatus.OK:
+            return False
+        # single symbol ticker: {"symbol": "BTCUSDT", "price": "..."}
+        resp = json.loads(response.text)
+        if not isinstance(resp, Dict):
+            return False
+        for field in ['symbol', 'price', ]:
+            if field not in resp:
+                return False
+
+        return True
+
+    # https://binance-docs.github.io/apidocs/spot/en/#limits
+    weight_limit = 6000
+    weight_header = 'X-MBX-USED-WEIGHT-1M'
+
+    def get_backoff_delay(self, response) -> Optional[float]:
+        delay = super().get_backoff_delay(response)
+        if delay is None:
+            # Binance reports weight used in current minute. Close to the limit we hold off until next minute.
+            used_weight = response.headers.get(self.weight_header)
+            if used_weight is not None and used_weight.isdigit() and int(used_weight) >= self.weight_limit * 0.9:
+                delay = 60 - (time.time() % 60)
+        return delay
+
+    def parse_markets(self, data) -> List[Tuple[str, str]]:
+        return [(symbol['baseAsset'], symbol['quoteAsset']) for symbol in data['symbols']
+                if symbol.get('status') == 'TRADING']
+
+    def build_batch_url(self, pairs: List[Tuple[str, str]]) -> str:
+        # symbols are expected as JSON array
+        symbols = json.dumps([self.get_batch_symbol(crypto, pair) for crypto, pair in pairs], separators = (',', ':'))
+        return self.batch_url.format(symbols = urllib.parse.quote(symbols))
+
+    def parse_ticker_rate(self, data) -> Optional[str]:
+        return data['price']
+
+    def parse_batch_rates(self, data, pairs: List[Tuple[str, str]]) -> List[Optional[str]]:
+        rates = {ticker['symbol']: ticker['price'] for ticker in data}
+        return [rates.get(crypto + pair) for crypto, pair in pairs]
+
+class Bitstamp(Exchange):
+    def build_api_url(self, tr: TestResult) -> str:
+        return self.api_url.format(crypto = tr.crypto.lower(), pair = tr.pair.lower())
+
+    def parse_markets(self, data) -> List[Tuple[str, str]]:
+        return [tuple(market['name'].split('/')) for market in data if market.get('trading') == 'Enabled']
+
+    def parse_ticker_rate(self, data) -> Optional[str]:
+        return data['ask']
+
+    def parse_batch_rates(self, data, pairs: List[Tuple[str, str]]) -> List[Optional[str]]:
+        rates = {ticker['pair']: ticker['ask'] for ticker in data}
+        return [rates.get('{}/{}'.format(crypto, pair)) for crypto, pair in pairs]
+
+class Bitbay(Exchange):
+    def parse_markets(self, data) -> List[Tuple[str, str]]:
+        if data.get('status') != 'Ok':
+            raise ValueError('Unexpected status: {}'.format(data.get('status')))
+        return [tuple(market.split('-')) for market in data['items'].keys()]
+
+    def parse_ticker_rate(self, data) -> Optional[str]:
+        return data['ticker']['lowestAsk']
+
+    def parse_batch_rates(self, data, pairs: List[Tuple[str, str]]) -> List[Optional[str]]:
+        items = data['items']
+        return [items['{}-{}'.format(crypto, pair)]['lowestAsk'] if '{}-{}'.format(crypto, pair) in items else None
+                for crypto, pair in pairs]
+
+    def is_ticker_valid(self, response: "requests.Response") -> bool:
+        if response.status_code != HTTPStatus.OK:
+            return False
+
+        # unknown pairs are reported with 200 too, as {"status": "Fail", "errors": ["TICKER_NOT_FOUND"]}
+        resp = json.loads(response.text)
+        if resp.get('status') != 'Ok' or not isinstance(resp.get('ticker'), Dict):
+            return False
+        for field in ['highestBid', 'lowestAsk', 'rate', ]:
+            if field not in resp['ticker']:
+                return False
+        return True
+
+class Coinmate(Exchange):
+    def parse_markets(self, data) -> List[Tuple[str, str]]:
+        if data.get('error', False):
+            raise ValueError(data.get('errorMessage'))
+        return [(market['firstCurrency'], market['secondCurrency']) for market in data['data']]
+
+    def parse_ticker_rate(self, data) -> Optional[str]:
+        return data['data']['ask']
+
+    def is_ticker_valid(self, response: "requests.Response") -> bool:
+        if response.status_code != HTTPStatus.OK:
+            return False
+
+        resp = json.loads(response.text)
+        if resp.get('error', False) or 'data' not in resp:
+            return False
+        for field in ['ask', 'bid', 'change', 'last', ]:
+            if field not in resp['data']:
+                return False
+        return True
+
+
+class Kraken(Exchange):
+    # Kraken lists some assets under its own legacy codes
+    asset_aliases = {
+        'XBT': 'BTC',
+        'XDG': 'DOGE',
+    }
+
+    # Kraken reports rate limiting as regular error in response body
+    # https://support.kraken.com/hc/en-us/articles/206548367
+    throttle_errors = ['EAPI:Rate limit exceeded', 'EGeneral:Too many requests', ]
+
+    def is_throttled(self, response) -> bool:
+        if super().is_throttled(response):
+            return True
+        try:
+            errors = json.loads(response.text).get('error', [])
+        except (ValueError, AttributeError):
+            return False
+        return any(error in self.throttle_errors for error in errors)
+
+    def parse_markets(self, data) -> List[Tuple[str, str]]:
+        if len(data.get('error', [])) > 0:
+            raise ValueError(', '.join(data['error']))
+        result = []
+        for market in data['result'].values():
+            if 'wsname' not in market:
+                continue
+            crypto, pair = market['wsname'].split('/')
+            result.append((self.asset_aliases.get(crypto, crypto), self.asset_aliases.get(pair, pair)))
+        return result
+
+    def get_batch_keys(self, crypto: str, pair: str) -> List[str]:
+        # Response is keyed by Kraken's own pair names, i.e. "XXBTZUSD" for "BTCUSD"
+        aliases = {code: alias for alias, code in self.asset_aliases.items()}
+        base, quote = aliases.get(crypto, crypto), aliases.get(pair, pair)
+        return [crypto + pair, base + quote, 'X{}Z{}'.format(base, quote), 'X{}X{}'.format(base, quote), ]
+
+    def parse_ticker_rate(self, data) -> Optional[str]:
+        return data['result'][list(data['result'].keys())[0]]['a'][0]
+
+    def parse_batch_rates(self, data, pairs: List[Tuple[str, str]]) -> List[Optional[str]]:
+        if len(data.get('error', [])) > 0:
+            raise ValueError(', '.join(data['error']))
+        rates = []
+        for crypto, pair in pairs:
+            keys = [key for key in self.get_batch_keys(crypto, pair) if key in data['result']]
+            rates.append(data['result'][keys[0]]['a'][0] if keys else None)
+        return rates
+
+    def is_ticker_valid(self, response: "requests.Response") -> bool:
+        if response.status_code != HTTPStatus.OK:
+            return False
+
+        resp = json.loads(response.text)
+        if len(resp.get('error', [])) > 0:
+            return False
+        if 'result' not in resp:
+            return False
+
+        key = list(resp['result'].keys())[0]
+        if key not in resp['result']:
+            return False
+        for field in ['a', 'b', 'c', 'l', ]:
+            if field not in resp['result'][key]:
+                return False
+        return True
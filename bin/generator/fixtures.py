@@ -0,0 +1,122 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# HTTP fixtures: API responses recorded with --record and served back with
+# --replay, so data file can be regenerated (and validators exercised)
+# without network access.
+#
+######################################################################
+
+import datetime
+import gzip
+import json
+import threading
+from typing import TYPE_CHECKING, Dict, List
+
+from .const import FIXTURE_ARCHIVE_VERSION
+from .utils import abort
+
+if TYPE_CHECKING:
+    import requests
+
+
+######################################################################
+
+class ArchiveMiss(KeyError):
+    """
+    Raised when replayed run asks for URL not present in the archive.
+    """
+
+    def __str__(self) -> str:
+        return 'Not in archive: {}'.format(self.args[0])
+
+
+class Archive:
+    """
+    Recorded API responses keyed by URL. Only conclusive responses (not throttled, no server errors) are
+    recorded, so replayed runs never wait for retries.
+    """
+
+    def __init__(self, entries: Dict[str, List] = None):
+        # url => [status code, headers, body]
+        self.entries = entries if entries is not None else {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, url: str, response: "requests.Response") -> None:
+        with self._lock:
+            self.entries[url] = [response.status_code, dict(response.headers), response.text]
+
+    def get(self, url: str) -> "requests.Response":
+        if url not in self.entries:
+            raise ArchiveMiss(url)
+
+        import requests
+
+        status, headers, body = self.entries[url]
+        response = requests.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = body.encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = url
+        response.elapsed = datetime.timedelta(0)
+        return response
+
+    def save(self, file_name: str) -> None:
+        with self._lock:
+            data = json.dumps({'version': FIXTURE_ARCHIVE_VERSION, 'entries': self.entries}, separators = (',', ':'))
+        try:
+            with gzip.open(file_name, 'wt', encoding = 'utf-8') as fh:
+                fh.write(data)
+        except IOError:
+            abort('Failed writing to: {}'.format(file_name))
+
+    @classmethod
+    def load(cls, file_name: str) -> "Archive":
+        try:
+            with gzip.open(file_name, 'rt', encoding = 'utf-8') as fh:
+                data = json.load(fh)
+        except (IOError, ValueError) as e:
+            abort('Failed reading archive {}: {}'.format(file_name, e))
+        if data.get('version') != FIXTURE_ARCHIVE_VERSION:
+            abort('Unsupported archive version: {}'.format(file_name))
+        return cls(data['entries'])
+
+
+class ReplaySession:
+    """
+    Stands in for requests.Session, answering GET requests from the archive.
+    """
+
+    def __init__(self, archive: Archive):
+        self.archive = archive
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        return self.archive.get(url)
+
+
+######################################################################
+
+# Archives used by this process, keyed by file name
+_archives: Dict[str, Archive] = {}
+
+
+def get_archive(file_name: str, replay: bool = False) -> Archive:
+    """
+    Returns archive bound to given file. It's loaded from the file when replaying, otherwise it's empty
+    one, to record responses to (written with Archive.save() once run completes).
+    """
+    if file_name not in _archives:
+        _archives[file_name] = Archive.load(file_name) if replay else Archive()
+    return _archives[file_name]
@@ -0,0 +1,215 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Icon atlas: icons of all cryptos listed by any exchange, stripped of editor
+# leftovers and packed into single SVG image, with square cell per distinct
+# icon. Widget renders the atlas once and clips icon of each ticker out of it
+# (see crypto.js::getCryptoIconClip()), instead of loading one file per icon.
+#
+# Icons are placed with plain <g transform="..."> as SVG Tiny (which is what
+# Qt renders) has no nested <svg>. Ids and CSS classes of each icon get its
+# code prefixed, so icons cannot override each other's gradients or styles.
+#
+######################################################################
+
+import hashlib
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .const import ICON_ATLAS_CELL, ICON_ATLAS_DIR, ICON_ATLAS_FILE
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+
+# Elements not affecting rendering
+DROPPED_TAGS = ['title', 'desc', 'metadata', ]
+# Root attributes replaced by icon placement
+DROPPED_ROOT_ATTRS = ['id', 'version', 'baseProfile', 'x', 'y', 'width', 'height', 'viewBox', 'preserveAspectRatio', ]
+
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', XLINK_NS)
+
+
+######################################################################
+
+def get_icon_dir() -> str:
+    my_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(my_dir, '../../src/contents/images/')
+
+
+def get_icon_file(code: str) -> str:
+    return os.path.join(get_icon_dir(), '{}.svg'.format(code.lower()))
+
+
+def get_icon_atlas_file(data_file: str) -> Optional[str]:
+    """
+    Returns where icon atlas of given data file goes (widget's images folder, see ICON_ATLAS_DIR).
+
+    :return: atlas file name or None if data file is not in widget's contents/ folder tree, so there's no
+             images folder for widget to load the atlas from
+    """
+    atlas_dir = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(data_file)), ICON_ATLAS_DIR))
+    if os.path.basename(os.path.dirname(atlas_dir)) != 'contents':
+        return None
+    return os.path.join(atlas_dir, ICON_ATLAS_FILE)
+
+
+def get_used_cryptos(exchanges: Iterable) -> List[str]:
+    """
+    Returns codes of cryptos having confirmed pairs on any of exchanges.
+    """
+    return sorted({crypto for ex in exchanges for crypto, pairs in ex.pairs.items() if pairs})
+
+
+######################################################################
+
+def get_view_box(root: ET.Element) -> Tuple[float, float, float, float]:
+    view_box = root.get('viewBox')
+    if view_box is not None:
+        values = [float(value) for value in re.split(r'[\s,]+', view_box.strip())]
+        if len(values) == 4 and values[2] > 0 and values[3] > 0:
+            return values[0], values[1], values[2], values[3]
+    # units (px, pt) do not matter, only proportions do
+    width, height = [float(re.match(r'[\d.]+', root.get(attr, '')).group(0)) for attr in ('width', 'height')]
+    if width <= 0 or height <= 0:
+        raise ValueError('No viewBox nor size')
+    return 0.0, 0.0, width, height
+
+
+def prefix_refs(value: str, prefix: str) -> str:
+    # url(#id) references (in attributes and CSS) and #id selectors
+    return re.sub(r'url\(\s*([\'"]?)#', r'url(\1#' + prefix, value)
+
+
+def prefix_css(css: str, prefix: str) -> str:
+    css = prefix_refs(css, prefix)
+
+    # only selectors (text outside of {...} blocks) may refer to classes and ids
+    def prefix_selectors(match: re.Match) -> str:
+        return re.sub(r'([.#])(-?[A-Za-z_][\w-]*)', r'\1' + prefix + r'\2', match.group(0))
+
+    return re.sub(r'[^{}]+(?=\{)', prefix_selectors, css)
+
+
+def clean_element(element: ET.Element, prefix: str) -> None:
+    """
+    Removes editor specific elements and attributes, and prefixes ids, classes and references of element's
+    subtree so they do not clash with these of other icons in the atlas.
+    """
+    for child in list(element):
+        tag = child.tag if isinstance(child.tag, str) else ''
+        ns, _, name = tag[1:].partition('}') if tag.startswith('{') else (SVG_NS, '', tag)
+        if ns != SVG_NS or name in DROPPED_TAGS:
+            element.remove(child)
+            continue
+        clean_element(child, prefix)
+
+    for attr in list(element.attrib.keys()):
+        if attr.startswith('{'):
+            keep = attr == '{{{}}}href'.format(XLINK_NS)
+        else:
+            keep = not attr.startswith('data-')
+        if not keep:
+            del element.attrib[attr]
+
+    for attr, value in list(element.attrib.items()):
+        if attr == 'id':
+            value = prefix + value
+        elif attr == 'class':
+            value = ' '.join([prefix + name for name in value.split()])
+        elif attr in ('href', '{{{}}}href'.format(XLINK_NS)) and value.startswith('#'):
+            value = '#' + prefix + value[1:]
+        else:
+            value = prefix_refs(value, prefix)
+        element.set(attr, value)
+
+    if element.tag == '{{{}}}style'.format(SVG_NS) and element.text:
+        element.text = prefix_css(element.text, prefix)
+    elif element.text is not None and not element.text.strip():
+        element.text = None
+    if element.tail is not None and not element.tail.strip():
+        element.tail = None
+
+
+def load_icon(code: str, prefix: str) -> Optional[Tuple[ET.Element, Tuple[float, float, float, float]]]:
+    """
+    Reads and cleans up icon of given crypto.
+
+    :return: icon content wrapped in group element and its view box, None if there's no usable icon
+    """
+    try:
+        root = ET.parse(get_icon_file(code)).getroot()
+        view_box = get_view_box(root)
+    except (IOError, ET.ParseError, ValueError, AttributeError):
+        return None
+
+    group = ET.Element('{{{}}}g'.format(SVG_NS))
+    # presentation attributes of root (i.e. fill) are inherited by its content
+    for attr, value in root.attrib.items():
+        if attr not in DROPPED_ROOT_ATTRS and not attr.startswith('{'):
+            group.set(attr, value)
+    group.extend(list(root))
+    clean_element(group, prefix)
+    return group, view_box
+
+
+def build_icon_atlas(codes: List[str]) -> Tuple[str, Dict, List[str]]:
+    """
+    Packs icons of given cryptos into single SVG image. Cryptos with identical icons share atlas cell.
+
+    :return: atlas SVG, its index (to be included in data file as iconAtlas) and codes of cryptos whose icon
+             files are not valid SVG images (missing icons are reported by check_icons())
+    """
+    cells = []
+    # digest of icon content => cell index
+    known: Dict[str, int] = {}
+    icons: Dict[str, int] = {}
+    unusable = []
+    for code in codes:
+        # content is compared with neutral prefix, so only really identical icons match
+        icon = load_icon(code, 'i-')
+        if icon is None:
+            if os.path.exists(get_icon_file(code)):
+                unusable.append(code)
+            continue
+        digest = hashlib.sha1(ET.tostring(icon[0]) + repr(icon[1]).encode('utf-8')).hexdigest()
+        if digest not in known:
+            known[digest] = len(cells)
+            cells.append(load_icon(code, 'i-{}-'.format(code.lower())))
+        icons[code] = known[digest]
+
+    columns = max(1, math.ceil(math.sqrt(len(cells))))
+    rows = max(1, math.ceil(len(cells) / columns))
+    width, height = columns * ICON_ATLAS_CELL, rows * ICON_ATLAS_CELL
+    root = ET.Element('{{{}}}svg'.format(SVG_NS), {
+        'version': '1.2', 'baseProfile': 'tiny',
+        'width': str(width), 'height': str(height), 'viewBox': '0 0 {} {}'.format(width, height),
+    })
+    for idx, (group, (min_x, min_y, box_width, box_height)) in enumerate(cells):
+        # fitted into the cell keeping proportions and centered, like preserveAspectRatio="xMidYMid meet" does
+        scale = ICON_ATLAS_CELL / max(box_width, box_height)
+        x = (idx % columns) * ICON_ATLAS_CELL + (ICON_ATLAS_CELL - box_width * scale) / 2 - min_x * scale
+        y = (idx // columns) * ICON_ATLAS_CELL + (ICON_ATLAS_CELL - box_height * scale) / 2 - min_y * scale
+        group.set('transform', 'translate({:.4g} {:.4g}) scale({:.6g})'.format(x, y, scale))
+        root.append(group)
+
+    index = {
+        'file':   ICON_ATLAS_FILE,
+        'cell':   ICON_ATLAS_CELL,
+        'width':  width,
+        'height': height,
+        'icons':  {code: [(idx % columns) * ICON_ATLAS_CELL, (idx // columns) * ICON_ATLAS_CELL]
+                   for code, idx in icons.items()},
+    }
+    return ET.tostring(root, encoding = 'unicode'), index, unusable
@@ -0,0 +1,135 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Write-ahead journal of probing (see --resume). First line describes the run
+# and lists all the checks it was going to probe, each following line is result
+# of one completed probe. Lines are flushed as they are written, so run killed
+# at any point leaves the journal complete up to its last finished probe.
+#
+######################################################################
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .const import JOURNAL_FILE_VERSION, JOURNAL_SYNC_INTERVAL
+from .result import TestResult
+from .utils import abort
+
+# (exchange code, crypto, pair)
+Cell = Tuple[str, str, str]
+
+
+######################################################################
+
+class Journal:
+    """
+    Journal of single (possibly interrupted) run, kept in cache folder till the run completes.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        # description of the run (currencies, exchange fingerprints), must match for the journal to be resumed
+        self.meta: Optional[Dict] = None
+        # checks run was going to probe
+        self.pending: List[Cell] = []
+        # cell => (rc, stamp) of completed probes
+        self.completed: Dict[Cell, Tuple[bool, int]] = {}
+        self._fh = None
+        self._synced = 0.0
+        # set when loaded journal ends with partially written line
+        self._truncated = False
+
+    def load(self) -> bool:
+        """
+        Reads journal left by previous run. Truncated last line (run killed while writing it) is ignored.
+
+        :return: False if there's no (usable) journal
+        """
+        try:
+            with open(self.file_name, 'r') as fh:
+                lines = fh.read().split('\n')
+        except FileNotFoundError:
+            return False
+        except IOError as e:
+            abort('Failed reading journal {}: {}'.format(self.file_name, e))
+
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return False
+        if header.get('version') != JOURNAL_FILE_VERSION:
+            return False
+        self.meta = header['meta']
+        self.pending = [tuple(cell) for cell in header['pending']]
+        for line in lines[1:]:
+            try:
+                ex_code, crypto, pair, rc, stamp = json.loads(line)
+            except (ValueError, TypeError):
+                continue
+            self.completed[(ex_code, crypto, pair)] = (bool(rc), stamp)
+        self._truncated = lines[-1] != ''
+        return True
+
+    def start(self, meta: Dict, pending: List[Cell]) -> None:
+        """
+        Starts new journal, replacing existing one (if any).
+        """
+        self.meta = meta
+        self.pending = pending
+        self.completed = {}
+        self._open('w')
+        self._fh.write(json.dumps({'version': JOURNAL_FILE_VERSION, 'meta': meta, 'pending': pending},
+                                  separators = (',', ':')) + '\n')
+        self._sync(force = True)
+
+    def resume(self) -> None:
+        """
+        Continues loaded journal, appending results of further probes to it.
+        """
+        self._open('a')
+        if self._truncated:
+            # so partial line does not swallow the next record
+            self._fh.write('\n')
+
+    def _open(self, mode: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.file_name)), exist_ok = True)
+            self._fh = open(self.file_name, mode)
+        except IOError as e:
+            abort('Failed writing journal {}: {}'.format(self.file_name, e))
+
+    def _sync(self, force: bool = False) -> None:
+        # flushed to OS on each write, so it survives killed process. Synced to disk at most once per interval.
+        self._fh.flush()
+        if force or time.monotonic() - self._synced >= JOURNAL_SYNC_INTERVAL:
+            os.fsync(self._fh.fileno())
+            self._synced = time.monotonic()
+
+    def record(self, tr: TestResult) -> None:
+        cell = (tr.ex_code, tr.crypto, tr.pair,)
+        self.completed[cell] = (tr.rc, tr.stamp,)
+        self._fh.write(json.dumps(list(cell) + [int(tr.rc), tr.stamp], separators = (',', ':')) + '\n')
+        self._sync()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._sync(force = True)
+            self._fh.close()
+            self._fh = None
+
+    def remove(self) -> None:
+        self.close()
+        try:
+            os.remove(self.file_name)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,259 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import json
+import zlib
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .const import MATRIX_FORMAT_VERSION
+
+
+######################################################################
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """
+    Yields indices of set bits, lowest first.
+    """
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def count_columns(rows: Iterable[int], width: int) -> List[int]:
+    """
+    Counts how many of given bitsets have each bit set. Rows are added as whole integers into bit sliced
+    counter (N-th plane holds N-th bit of all the counters), so cost depends on number of rows, not on width.
+    """
+    planes = []
+    for row in rows:
+        carry = row
+        for idx, plane in enumerate(planes):
+            if not carry:
+                break
+            planes[idx], carry = plane ^ carry, plane & carry
+        if carry:
+            planes.append(carry)
+
+    counts = [0] * width
+    for weight, plane in enumerate(planes):
+        for idx in iter_bits(plane):
+            counts[idx] += 1 << weight
+    return counts
+
+
+######################################################################
+
+class PairMatrix:
+    """
+    Pairs confirmed on all exchanges, as dense exchange × crypto × pair bit matrix. Each (exchange, crypto) row
+    is bitset of pair indices in currencies list, packed into single bytearray. Queries work on whole rows
+    (as integers), not on individual cells.
+    """
+
+    def __init__(self, exchanges: List[str], currencies: List[str], data: bytearray = None):
+        """
+        :param exchanges: codes of exchanges
+        :param currencies: currency codes, indexing both crypto and pair axis
+        :param data: packed matrix (i.e. of from_bytes()), empty matrix is created if not given
+        """
+        self.exchanges = list(exchanges)
+        self.currencies = list(currencies)
+        self._ex_index = {code: idx for idx, code in enumerate(self.exchanges)}
+        self._index = {code: idx for idx, code in enumerate(self.currencies)}
+        # bytes per row
+        self._stride = (len(self.currencies) + 7) // 8
+
+        size = len(self.exchanges) * len(self.currencies) * self._stride
+        if data is None:
+            data = bytearray(size)
+        elif len(data) != size:
+            raise ValueError('Matrix data size does not match its dimensions.')
+        self._data = data
+
+    def _offset(self, ex_code: str, crypto: str) -> int:
+        return (self._ex_index[ex_code] * len(self.currencies) + self._index[crypto]) * self._stride
+
+    def has(self, ex_code: str, crypto: str) -> bool:
+        return ex_code in self._ex_index and crypto in self._index
+
+    def set(self, ex_code: str, crypto: str, pair: str, value: bool = True) -> None:
+        idx = self._index[pair]
+        offset = self._offset(ex_code, crypto) + idx // 8
+        if value:
+            self._data[offset] |= 1 << (idx % 8)
+        else:
+            self._data[offset] &= ~(1 << (idx % 8)) & 0xff
+
+    def get(self, ex_code: str, crypto: str, pair: str) -> bool:
+        if not self.has(ex_code, crypto) or pair not in self._index:
+            return False
+        idx = self._index[pair]
+        return bool(self._data[self._offset(ex_code, crypto) + idx // 8] & (1 << (idx % 8)))
+
+    def get_row(self, ex_code: str, crypto: str) -> int:
+        """
+        Returns pairs of given crypto on given exchange as bitset of pair indices (0 for unknown codes).
+        """
+        if not self.has(ex_code, crypto):
+            return 0
+        offset = self._offset(ex_code, crypto)
+        return int.from_bytes(self._data[offset:offset + self._stride], 'little')
+
+    def get_pairs(self, ex_code: str, crypto: str) -> List[str]:
+        return [self.currencies[idx] for idx in iter_bits(self.get_row(ex_code, crypto))]
+
+    def get_exchange_pairs(self, ex_code: str) -> Dict[str, List[str]]:
+        """
+        Returns all confirmed pairs of given exchange, keyed by crypto (both in currencies order).
+        """
+        result = {}
+        if ex_code not in self._ex_index:
+            return result
+        for crypto in self.currencies:
+            row = self.get_row(ex_code, crypto)
+            if row:
+                result[crypto] = [self.currencies[idx] for idx in iter_bits(row)]
+        return result
+
+    def count(self, ex_code: str = None) -> int:
+        """
+        Returns number of confirmed pairs (of given exchange or of all of them).
+        """
+        if ex_code is None:
+            return int.from_bytes(self._data, 'little').bit_count()
+        block = len(self.currencies) * self._stride
+        offset = self._ex_index[ex_code] * block
+        return int.from_bytes(self._data[offset:offset + block], 'little').bit_count()
+
+    def select(self, exchanges: List[str]) -> "PairMatrix":
+        """
+        Returns copy of matrix reduced to given exchanges (in given order).
+        """
+        block = len(self.currencies) * self._stride
+        data = bytearray()
+        for code in exchanges:
+            offset = self._ex_index[code] * block
+            data += self._data[offset:offset + block]
+        return PairMatrix(exchanges, self.currencies, data)
+
+    ######################################################################
+
+    def get_exchange_counts(self, crypto: str) -> List[int]:
+        """
+        Returns number of exchanges listing each pair (in currencies order) of given crypto.
+        """
+        return count_columns([self.get_row(ex_code, crypto) for ex_code in self.exchanges], len(self.currencies))
+
+    def get_common_pairs(self, min_exchanges: int) -> List[Tuple[str, str, int]]:
+        """
+        Returns (crypto, pair, number of exchanges) of all pairs listed by at least min_exchanges exchanges.
+        """
+        min_exchanges = max(1, min_exchanges)
+        result = []
+        for crypto in self.currencies:
+            rows = [self.get_row(ex_code, crypto) for ex_code in self.exchanges]
+            # at_least[k] is bitset of pairs listed by at least k of exchanges processed so far
+            at_least = [-1] + [0] * min_exchanges
+            for row in rows:
+                for k in range(min_exchanges, 0, -1):
+                    at_least[k] |= at_least[k - 1] & row
+            for idx in iter_bits(at_least[min_exchanges]):
+                result.append((crypto, self.currencies[idx], sum([(row >> idx) & 1 for row in rows]),))
+        return result
+
+    def get_quote_coverage(self, ex_code: str = None) -> Dict[str, int]:
+        """
+        Returns number of cryptos tradable against each quote currency, on given exchange or on any of them.
+        Quote currencies with no pairs are not included.
+        """
+        codes = self.exchanges if ex_code is None else [ex_code]
+        rows = []
+        for crypto in self.currencies:
+            row = 0
+            for code in codes:
+                row |= self.get_row(code, crypto)
+            rows.append(row)
+        counts = count_columns(rows, len(self.currencies))
+        return {self.currencies[idx]: cnt for idx, cnt in enumerate(counts) if cnt > 0}
+
+    def diff(self, previous: "PairMatrix") -> Tuple[List[Tuple[str, str, str]], List[Tuple[str, str, str]]]:
+        """
+        Compares with matrix of previous run. Only exchanges present in both matrices are compared, while
+        currency axes may differ (pairs of currencies missing in either matrix count as not confirmed there).
+
+        :return: (exchange, crypto, pair) cells confirmed now but not before, and these confirmed before only
+        """
+        added, removed = [], []
+        same_axis = previous.currencies == self.currencies
+        cryptos = self.currencies + [code for code in previous.currencies if code not in self._index]
+        for ex_code in self.exchanges:
+            if ex_code not in previous._ex_index:
+                continue
+            for crypto in cryptos:
+                if same_axis:
+                    now = self.get_row(ex_code, crypto)
+                    changed = now ^ previous.get_row(ex_code, crypto)
+                    for idx in iter_bits(changed):
+                        cell = (ex_code, crypto, self.currencies[idx],)
+                        (added if now & (1 << idx) else removed).append(cell)
+                else:
+                    now = set(self.get_pairs(ex_code, crypto))
+                    before = set(previous.get_pairs(ex_code, crypto))
+                    added += [(ex_code, crypto, pair,) for pair in sorted(now - before)]
+                    removed += [(ex_code, crypto, pair,) for pair in sorted(before - now)]
+        return added, removed
+
+    ######################################################################
+
+    def to_bytes(self) -> bytes:
+        header = json.dumps({'version': MATRIX_FORMAT_VERSION, 'exchanges': self.exchanges,
+                             'currencies': self.currencies}, separators = (',', ':'))
+        # JSON never contains raw NUL, so it separates header from packed bits
+        return zlib.compress(header.encode('utf-8') + b'\0' + bytes(self._data))
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "PairMatrix":
+        """
+        Restores matrix serialized with to_bytes().
+
+        :raises ValueError: if blob is damaged or of unsupported version
+        """
+        try:
+            header, data = zlib.decompress(blob).split(b'\0', 1)
+            header = json.loads(header.decode('utf-8'))
+        except (zlib.error, ValueError) as e:
+            raise ValueError('Damaged matrix data: {}'.format(e))
+        if header.get('version') != MATRIX_FORMAT_VERSION:
+            raise ValueError('Unsupported matrix data version: {}'.format(header.get('version')))
+        return cls(header['exchanges'], header['currencies'], bytearray(data))
+
+
+######################################################################
+
+def build_coverage_report(matrix: PairMatrix, min_exchanges: int) -> List[str]:
+    """
+    Builds --coverage report: number of cryptos tradable against each quote currency and pairs listed
+    by at least min_exchanges exchanges.
+    """
+    result = ['Quote coverage (cryptos tradable against currency, on any / each exchange):']
+    per_exchange = {ex_code: matrix.get_quote_coverage(ex_code) for ex_code in matrix.exchanges}
+    coverage = matrix.get_quote_coverage()
+    for quote in sorted(coverage.keys(), key = lambda code: (-coverage[code], code)):
+        result.append('  {:<8} {:>5}  {}'.format(quote, coverage[quote], ', '.join(
+            ['{}: {}'.format(ex_code, per_exchange[ex_code][quote]) for ex_code in matrix.exchanges
+             if quote in per_exchange[ex_code]])))
+
+    common = matrix.get_common_pairs(min_exchanges)
+    result.append('Pairs listed by at least {} exchanges: {}'.format(min_exchanges, len(common)))
+    for crypto, pair, cnt in sorted(common, key = lambda cell: (-cell[2], cell[0], cell[1])):
+        result.append('  {}/{}: {}'.format(crypto, pair, cnt))
+    return result
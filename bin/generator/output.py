@@ -0,0 +1,336 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import json
+import os
+import tempfile
+from typing import Dict, List, Tuple
+
+from .const import SPLIT_MODULE_DIR
+from .exchange import Exchange
+from .icons import get_icon_file
+
+
+######################################################################
+
+def build_header() -> List[str]:
+    return [
+        '// This file is auto-generated. DO NOT EDIT BY HAND',
+        '// Use generate_data.py to rebuild this file if needed',
+        '',
+        '// https://doc.qt.io/qt-5/qtqml-javascript-resources.html',
+        '.pragma library',
+        '',
+    ]
+
+
+def get_currency_text(code: str, data: Dict) -> str:
+    # Display name of currency used as pair, i.e. "EUR (€ Euro)". Same as crypto.js::getCurrencyName()
+    extra = ' '.join([part for part in [data.get('symbol', ''), data['name'] if data['name'] != code else ''] if part])
+    return '{} ({})'.format(code, extra) if extra else code
+
+
+def get_crypto_text(code: str, data: Dict) -> str:
+    # Display name of crypto currency, i.e. "Bitcoin (BTC)". Same as crypto.js::getCryptoName()
+    return '{} ({})'.format(data['name'], code)
+
+
+def build_models(currencies: Dict[str, Dict], ex: Exchange) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
+    """
+    Builds sorted config dialog combo box models of exchange.
+
+    :return: crypto model and pair models (keyed by crypto)
+    """
+    crypto_model = [{'value': crypto, 'text': get_crypto_text(crypto, currencies[crypto])}
+                    for crypto in sorted(ex.pairs.keys())]
+    pair_models = {crypto: [{'value': pair, 'text': get_currency_text(pair, currencies[pair])}
+                            for pair in sorted(pairs)] for crypto, pairs in ex.pairs.items()}
+    return crypto_model, pair_models
+
+
+def build_names(currencies: Dict[str, Dict], compact: bool = False) -> List[str]:
+    # display names of all currencies, so widget does not need to build them
+    names = [
+        ('cryptoNames', {code: get_crypto_text(code, currencies[code]) for code in sorted(currencies.keys())}),
+        ('currencyNames', {code: get_currency_text(code, currencies[code]) for code in sorted(currencies.keys())}),
+    ]
+    if compact:
+        return ['var {} = {};'.format(name, json.dumps(table, separators = (',', ':'), ensure_ascii = False))
+                for name, table in names]
+
+    result = []
+    for name, table in names:
+        result.append('var {} = {{'.format(name))
+        result += ['\t{}: {},'.format(json.dumps(code), json.dumps(text, ensure_ascii = False))
+                   for code, text in table.items()]
+        result.append('}')
+    return result
+
+
+def build_currencies(currencies: Dict[str, Dict]) -> List[str]:
+    # currency and token info
+    result = [
+        'var currencies = {',
+    ]
+
+    keys = list(currencies.keys())
+    keys.sort()
+    for key in keys:
+        data: Dict = currencies[key]
+        symbol = None if 'symbol' not in data else '"{}"'.format(data['symbol'])
+
+        row = '\t"{}": {{'.format(key)
+        code = key.upper()
+
+        row += '"code": "{}", '.format(code)
+        if data['name'] != code:
+            row += '"name": "{}", '.format(data['name'])
+        if symbol:
+            row += '"symbol": {}, '.format(symbol)
+        row += '},'
+        result.append(row)
+    result.append('}')
+    result += build_names(currencies)
+
+    return result
+
+
+def build_icon_index(index: Dict) -> List[str]:
+    # where in icon atlas image icon of each crypto is (see icons.build_icon_atlas())
+    return ['var iconAtlas = {};'.format(json.dumps(index, separators = (',', ':')))]
+
+
+def build_exchange_fields(ex: Exchange) -> List[str]:
+    # name, url and API functions of exchange, common to all the formats but compact one
+    result = [
+        '\t\t"name": "{}",'.format(ex.name),
+        '\t\t"url": "{}",'.format(ex.url),
+        '\t\t"getUrl": function(crypto, pair) {',
+        '\t\t\t{}'.format(ex.functions['getUrl']),
+        '\t\t},',
+        '\t\t"getRateFromExchangeData": function(data, crypto, pair) {',
+        '\t\t\t{}'.format(ex.functions['getRateFromExchangeData']),
+        '\t\t},',
+    ]
+    if ex.batch_verified:
+        result += [
+            '\t\t"getBatchUrl": function(pairs) {',
+            '\t\t\t{}'.format(ex.functions['getBatchUrl']),
+            '\t\t},',
+            '\t\t"getRatesFromBatchData": function(data, pairs) {',
+            '\t\t\t{}'.format(ex.functions['getRatesFromBatchData']),
+            '\t\t},',
+            '\t\t"batchSize": {},'.format(ex.batch_size),
+        ]
+    return result
+
+
+def build_exchanges(exchanges: List[Exchange], currencies: Dict[str, Dict]) -> List[str]:
+    result = [
+        'var exchanges = {',
+    ]
+
+    for ex in exchanges:
+        result.append('\t"{}": {{'.format(ex.code))
+        result += build_exchange_fields(ex)
+        result.append('\t\t"pairs": {')
+        for crypto, pairs in ex.pairs.items():
+            pairs.sort()
+            row = '\t\t\t"{crypto}": ['.format(crypto = crypto)
+            row += ''.join(['"{}",'.format(pair) for pair in pairs])
+            row += '],'
+            result.append(row)
+        result.append('\t\t},')
+
+        crypto_model, pair_models = build_models(currencies, ex)
+        result.append('\t\t"cryptoModel": [')
+        result += ['\t\t\t{},'.format(json.dumps(item, ensure_ascii = False)) for item in crypto_model]
+        result += [
+            '\t\t],',
+            '\t\t"pairModels": {',
+        ]
+        result += ['\t\t\t"{}": {},'.format(crypto, json.dumps(model, ensure_ascii = False))
+                   for crypto, model in sorted(pair_models.items())]
+        result += [
+            '\t\t},',
+            '\t},',
+        ]
+
+    result += ['}', '']
+
+    return result
+
+
+######################################################################
+
+def encode_bitset(indices: List[int]) -> str:
+    """
+    Encodes set of indices as hex string, where character N holds bits of indices 4N to 4N+3
+    (lowest bit first). Trailing zeros are not included.
+    """
+    nibbles = [0] * (max(indices) // 4 + 1) if indices else []
+    for idx in indices:
+        nibbles[idx // 4] |= 1 << (idx % 4)
+    return ''.join(['{:x}'.format(nibble) for nibble in nibbles])
+
+
+def build_compact(currencies: Dict[str, Dict], exchanges: List[Exchange]) -> List[str]:
+    """
+    Builds compact variant of data: no pretty printing, currency codes interned in shared "codes" table
+    and pairs of each crypto encoded as bitset of pair code indices (see encode_bitset()).
+    """
+    codes = sorted(currencies.keys())
+    index = {code: idx for idx, code in enumerate(codes)}
+
+    compact_currencies = {}
+    for code in codes:
+        data = currencies[code]
+        entry = {'code': code}
+        if data['name'] != code:
+            entry['name'] = data['name']
+        if 'symbol' in data:
+            entry['symbol'] = data['symbol']
+        compact_currencies[code] = entry
+
+    result = [
+        'var codes = {};'.format(json.dumps(codes, separators = (',', ':'))),
+        'var currencies = {};'.format(json.dumps(compact_currencies, separators = (',', ':'), ensure_ascii = False)),
+    ]
+    # config dialog models are not included to keep file small. crypto.js builds them (once) from name tables.
+    result += build_names(currencies, compact = True)
+    result.append('var exchanges = {')
+    for ex in exchanges:
+        matrix = {crypto: encode_bitset(sorted([index[pair] for pair in pairs])) for crypto, pairs in ex.pairs.items()}
+        batch = ''
+        if ex.batch_verified:
+            batch = ('"getBatchUrl":function(pairs){{{get_url}}},'
+                     '"getRatesFromBatchData":function(data,pairs){{{get_rates}}},'
+                     '"batchSize":{size},').format(
+                get_url = ex.functions['getBatchUrl'], get_rates = ex.functions['getRatesFromBatchData'],
+                size = ex.batch_size)
+        result.append('{code}:{{"name":{name},"url":{url},'
+                      '"getUrl":function(crypto,pair){{{get_url}}},'
+                      '"getRateFromExchangeData":function(data,crypto,pair){{{get_rate}}},'
+                      '{batch}"matrix":{matrix}}},'.format(
+            code = json.dumps(ex.code), name = json.dumps(ex.name), url = json.dumps(ex.url),
+            get_url = ex.functions['getUrl'], get_rate = ex.functions['getRateFromExchangeData'], batch = batch,
+            matrix = json.dumps(matrix, separators = (',', ':'))))
+    result += ['}', '']
+
+    return result
+
+
+######################################################################
+
+def get_module_name(ex: Exchange) -> str:
+    # exchange module file name of split format, relative to main data file
+    return '{}/{}.qml'.format(SPLIT_MODULE_DIR, ex.code)
+
+
+def build_split(currencies: Dict[str, Dict], exchanges: List[Exchange]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Builds split variant of data: main module with currencies and manifest of exchanges, and separate
+    module of each exchange, which widget loads only if any ticker uses that exchange. Pairs in exchange
+    modules are encoded as bitsets of indices to "codes" table of main module (see encode_bitset()).
+
+    :return: main module and exchange modules keyed by their file names (relative to main module)
+    """
+    codes = sorted(currencies.keys())
+    index = {code: idx for idx, code in enumerate(codes)}
+
+    main = ['var codes = {};'.format(json.dumps(codes, separators = (',', ':')))]
+    main += build_currencies(currencies)
+    main.append('var manifest = {')
+    main += ['\t{}: {},'.format(json.dumps(ex.code), json.dumps(
+        {'name': ex.name, 'url': ex.url, 'module': get_module_name(ex)}, ensure_ascii = False)) for ex in exchanges]
+    main += ['}', '']
+
+    modules = {}
+    for ex in exchanges:
+        module = [
+            '// This file is auto-generated. DO NOT EDIT BY HAND',
+            '// Use generate_data.py to rebuild this file if needed',
+            '',
+            'import QtQml',
+            '',
+            '// {} data, loaded by crypto.js on first use'.format(ex.name),
+            'QtObject {',
+            '\treadonly property var exchange: ({',
+        ]
+        module += build_exchange_fields(ex)
+        module.append('\t\t"matrix": {')
+        module += ['\t\t\t"{}": "{}",'.format(crypto, encode_bitset([index[pair] for pair in pairs]))
+                   for crypto, pairs in ex.pairs.items()]
+        module += [
+            '\t\t},',
+            '\t})',
+            '}',
+            '',
+        ]
+        modules[get_module_name(ex)] = module
+
+    return main, modules
+
+
+######################################################################
+
+def write_output(file_name: str, content: str) -> bool:
+    """
+    Writes content to file, unless file already has exactly the same content. File is replaced atomically,
+    so readers never see partially written file.
+
+    :return: True if file was written, False if it was up to date already
+    """
+    data = content.encode('utf-8')
+    mode = 0o644
+    try:
+        with open(file_name, 'rb') as fh:
+            if fh.read() == data:
+                return False
+            mode = os.fstat(fh.fileno()).st_mode & 0o777
+    except FileNotFoundError:
+        pass
+
+    tmp_fd, tmp_name = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(file_name)),
+                                        prefix = '.{}.'.format(os.path.basename(file_name)))
+    try:
+        with os.fdopen(tmp_fd, 'wb') as fh:
+            fh.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, file_name)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return True
+
+
+######################################################################
+
+def check_icons(currencies: List[str]) -> int:
+    ignored = ['CZK', 'EUR', 'GBP', 'JPY', 'PLN', ]
+
+    cnt = skipped = 0
+    header_shown = False
+    for pair in currencies:
+        if pair in ignored:
+            skipped += 1
+            continue
+
+        icon_file = get_icon_file(pair)
+        res = os.path.exists(icon_file)
+        if not res:
+            if not header_shown:
+                print('  Missing icons:')
+                header_shown = True
+            print('    {}'.format(icon_file))
+            cnt += 1
+    print('Total {} coins in use, {} icons skipped, {} missing'.format(len(currencies), skipped, cnt))
+    return cnt
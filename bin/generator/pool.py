@@ -0,0 +1,91 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Worker process side of "pool" probing engine. Exchanges are shipped to each
+# worker once (see init_worker()), so tasks and results carry plain tuples only.
+#
+######################################################################
+
+import multiprocessing as mp
+import signal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .const import ERR_DEADLINE
+from .exchange import Exchange
+from .result import TestResult
+
+# (index of job, exchange code, crypto, pair)
+Task = Tuple[int, str, str, str]
+
+# Worker process state, set by init_worker()
+_exchanges: Dict[str, Exchange] = {}
+_tripped: Optional["ExchangeFlags"] = None
+_deadline: Optional[float] = None
+_deadline_reason: str = ERR_DEADLINE
+
+
+######################################################################
+
+class ExchangeFlags:
+    """
+    Per exchange flags kept in shared memory, so worker processes see flags raised by main process
+    without any manager process or message passing involved.
+    """
+
+    def __init__(self, codes: Iterable[str]):
+        self._index = {code: idx for idx, code in enumerate(codes)}
+        self._flags = mp.RawArray('b', len(self._index))
+
+    def __contains__(self, code: str) -> bool:
+        return self._flags[self._index[code]] != 0
+
+    def __setitem__(self, code: str, value: bool) -> None:
+        self._flags[self._index[code]] = 1 if value else 0
+
+    def __len__(self) -> int:
+        return sum(1 for flag in self._flags if flag)
+
+
+######################################################################
+
+def init_worker(exchanges: Dict[str, Exchange], tripped: ExchangeFlags, deadline: Optional[float],
+                deadline_reason: str) -> None:
+    global _exchanges, _tripped, _deadline, _deadline_reason
+    # Ctrl+C is handled by main process, which makes workers give up remaining tasks (see Exchanges.interrupt())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _exchanges = exchanges
+    _tripped = tripped
+    _deadline = deadline
+    _deadline_reason = deadline_reason
+
+
+def probe_batch(tasks: List[Task]) -> List[Tuple]:
+    """
+    Probes batch of pairs.
+
+    :param tasks: list of (job index, exchange code, crypto, pair) tuples
+    :return: list of (job index, outcome) tuples (see TestResult.get_outcome())
+    """
+    outcomes = []
+    for idx, ex_code, crypto, pair in tasks:
+        tr = TestResult(ex_code = ex_code, crypto = crypto, pair = pair, use_cache = False)
+        _exchanges[ex_code].do_api_call(tr, _tripped, _deadline, _deadline_reason)
+        outcomes.append((idx, tr.get_outcome(),))
+    return outcomes
+
+
+def build_batches(tasks: List[Task], concurrency: int, max_size: int) -> List[List[Task]]:
+    """
+    Splits tasks into batches, small enough to keep all workers busy till the end (and so results,
+    circuit breakers and deadline are not delayed by long batches), but large enough to keep IPC cost low.
+    """
+    size = max(1, min(max_size, len(tasks) // (concurrency * 4)))
+    return [tasks[offset:offset + size] for offset in range(0, len(tasks), size)]
@@ -0,0 +1,169 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Phase level profiling (see --profile). Code paths worth measuring are
+# wrapped in named phases, i.e.:
+#
+#   from .profiler import phase
+#
+#   with phase('cache load'):
+#       ...
+#
+# Phases nest, so each one is reported under the phase it was entered from.
+# Unless profiling is enabled, phase() costs next to nothing.
+#
+######################################################################
+
+import collections
+import contextlib
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from .config import Config
+from .utils import abort
+
+
+######################################################################
+
+class PhaseStats:
+    __slots__ = ['calls', 'wall', 'cpu', ]
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+
+class Profiler:
+    """
+    Collects number of calls, wall time and CPU time of the calling thread spent in each phase.
+    Phases are keyed by their path, i.e. ('process', 'planning', 'cache lookup').
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.phases: Dict[Tuple[str, ...], PhaseStats] = collections.OrderedDict()
+        self._local = threading.local()
+
+    def _stack(self) -> List[str]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def phase(self, name: str) -> "_Phase":
+        return _Phase(self, name)
+
+    def enter(self, name: str) -> Tuple[Tuple[str, ...], float, float]:
+        stack = self._stack()
+        stack.append(name)
+        path = tuple(stack)
+        # registered on entry, so phases are reported in order they were entered
+        if path not in self.phases:
+            self.phases[path] = PhaseStats()
+        return path, time.perf_counter(), time.thread_time()
+
+    def leave(self, token: Tuple[Tuple[str, ...], float, float]) -> None:
+        path, wall_started, cpu_started = token
+        stats = self.phases[path]
+        stats.calls += 1
+        stats.wall += time.perf_counter() - wall_started
+        stats.cpu += time.thread_time() - cpu_started
+        self._stack().pop()
+
+    def get_report(self) -> List[str]:
+        result = ['{:<40} {:>8} {:>10} {:>10}'.format('Phase', 'calls', 'wall[s]', 'cpu[s]')]
+        for path, stats in self.phases.items():
+            name = '  ' * (len(path) - 1) + path[-1]
+            result.append('{:<40} {:>8} {:>10.4f} {:>10.4f}'.format(name, stats.calls, stats.wall, stats.cpu))
+        return result
+
+    def get_folded(self) -> List[str]:
+        """
+        Returns phases in "folded stacks" format (one "phase;subphase;... microseconds" line per phase, with
+        time spent in subphases excluded), as consumed by flamegraph.pl, speedscope and similar tools.
+        """
+        self_wall = {path: stats.wall for path, stats in self.phases.items()}
+        for path, stats in self.phases.items():
+            if len(path) > 1 and path[:-1] in self_wall:
+                self_wall[path[:-1]] -= stats.wall
+        return ['{} {}'.format(';'.join(path), max(0, int(round(wall * 1000000))))
+                for path, wall in self_wall.items()]
+
+
+class _Phase:
+    __slots__ = ['_profiler', '_name', '_token', ]
+
+    def __init__(self, profiler: Profiler, name: str):
+        self._profiler = profiler
+        self._name = name
+        self._token = None
+
+    def __enter__(self) -> None:
+        self._token = self._profiler.enter(self._name)
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._profiler.leave(self._token)
+
+
+######################################################################
+
+_profiler = Profiler()
+_disabled_phase = contextlib.nullcontext()
+
+
+def get_profiler() -> Profiler:
+    return _profiler
+
+
+def phase(name: str):
+    """
+    Returns context manager measuring code it wraps as named phase (if profiling is enabled).
+    """
+    return _profiler.phase(name) if _profiler.enabled else _disabled_phase
+
+
+@contextlib.contextmanager
+def profiling(config: Config):
+    """
+    Profiles code run within the context as configured: with --profile phase report is printed once
+    the context is left, --profile-pstats and --profile-folded write profile data files.
+    """
+    profiler = get_profiler()
+    profiler.enabled = config.profile or config.profile_folded is not None
+    cprofile = None
+    if config.profile_pstats is not None:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    try:
+        if profiler.enabled:
+            with profiler.phase('generate_data'):
+                yield
+        else:
+            yield
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            try:
+                cprofile.dump_stats(config.profile_pstats)
+            except IOError:
+                abort('Failed writing to: {}'.format(config.profile_pstats))
+        if config.profile_folded is not None:
+            try:
+                with open(config.profile_folded, 'w') as fh:
+                    fh.write('\n'.join(profiler.get_folded()) + '\n')
+            except IOError:
+                abort('Failed writing to: {}'.format(config.profile_folded))
+        if config.profile:
+            print('\n'.join(profiler.get_report()))
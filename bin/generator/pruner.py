@@ -0,0 +1,81 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import collections
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .const import CURRENCY_CRYPTO, CURRENCY_FIAT
+from .exchange import Exchange
+
+
+######################################################################
+
+class PairPruner:
+    """
+    Removes (crypto, pair) combinations that cannot exist on given exchange, before any check is made.
+    Rules are based on currency classes (see "type" in currencies) and exchange's quote currencies
+    and class crosses. Quote currencies are applied first, so only crypto x quotes is ever iterated.
+    """
+
+    RULE_QUOTE = 'quote not listed'
+
+    def __init__(self, currencies: Dict[str, Dict]):
+        self.classes = {code: data.get('type', CURRENCY_CRYPTO) for code, data in currencies.items()}
+        # (name, predicate) tuples. Combination matching any predicate is removed.
+        self.rules: List[Tuple[str, Callable[[Exchange, str, str], bool]]] = [
+            ('same currency', lambda ex, crypto, pair: crypto == pair),
+            # nobody quotes crypto in fiat's terms (PLN/BTC), while EUR/USDT is fine
+            ('fiat base', lambda ex, crypto, pair: self.classes[crypto] == CURRENCY_FIAT
+                                                   and self.classes[pair] == CURRENCY_CRYPTO),
+            ('class cross', lambda ex, crypto, pair: self.classes[crypto] == self.classes[pair]
+                                                     and self.classes[crypto] != CURRENCY_CRYPTO
+                                                     and self.classes[crypto] not in ex.class_crosses),
+        ]
+        self.removed = collections.Counter()
+        self.total = 0
+
+    def get_prune_reason(self, ex: Exchange, crypto: str, pair: str) -> Optional[str]:
+        for name, predicate in self.rules:
+            if predicate(ex, crypto, pair):
+                return name
+        return None
+
+    def get_candidates(self, exchanges: List[Exchange]) -> List[Tuple[Exchange, str, str]]:
+        """
+        Returns (exchange, crypto, pair) combinations worth checking, ordered so consecutive checks
+        hit different exchanges.
+        """
+        codes = list(self.classes.keys())
+        quotes = {ex.code: set(codes if ex.quotes is None else [code for code in codes if code in ex.quotes])
+                  for ex in exchanges}
+        all_quotes = [code for code in codes if any(code in ex_quotes for ex_quotes in quotes.values())]
+
+        candidates = []
+        for crypto in codes:
+            for pair in all_quotes:
+                for ex in exchanges:
+                    if pair not in quotes[ex.code]:
+                        continue
+                    reason = self.get_prune_reason(ex, crypto, pair)
+                    if reason is not None:
+                        self.removed[reason] += 1
+                        continue
+                    candidates.append((ex, crypto, pair,))
+
+        for ex in exchanges:
+            self.removed[self.RULE_QUOTE] += len(codes) * (len(codes) - len(quotes[ex.code]))
+        self.total = len(codes) * len(codes) * len(exchanges)
+        return candidates
+
+    def get_summary(self) -> str:
+        return 'Pruned {removed} of {total} combinations: {details}'.format(
+            removed = sum(self.removed.values()), total = self.total,
+            details = ', '.join(['{}: {}'.format(name, cnt) for name, cnt in self.removed.most_common()]))
@@ -0,0 +1,138 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Cross exchange rates check (see --check-rates). Confirmed pair only proves
+# ticker response has expected fields, so rates widget extracts from batch
+# ticker responses are compared against median rate of all exchanges quoting
+# the same pair (rates of reversed pair, i.e. USD/BTC for BTC/USD, included).
+# Comparison is done on logarithms of rates, so deviation is symmetric and
+# inverted rate is just negated one. With NumPy installed all the quotes are
+# processed as arrays in one pass, otherwise pair by pair.
+#
+######################################################################
+
+import collections
+import math
+import statistics
+from typing import Dict, List, Tuple
+
+from .const import RATE_CHECK_MIN_QUOTES, RATE_DEVIATION, RATE_INVERTED
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# (exchange code, crypto, pair, rate)
+Quote = Tuple[str, str, str, float]
+# (exchange code, crypto, pair, rate, reference rate, number of quotes of the pair, kind)
+RateOutlier = Tuple[str, str, str, float, float, int, str]
+
+
+######################################################################
+
+def _classify_numpy(groups: List[int], values: List[float], tolerance: float,
+                    min_quotes: int) -> List[Tuple[int, float, int, str]]:
+    groups = numpy.asarray(groups, dtype = numpy.int64)
+    values = numpy.asarray(values, dtype = numpy.float64)
+    # sorted by group, then value, so median of each group sits in the middle of its run
+    order = numpy.lexsort((values, groups))
+    sorted_groups, sorted_values = groups[order], values[order]
+    starts = numpy.flatnonzero(numpy.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    counts = numpy.diff(numpy.r_[starts, len(sorted_values)])
+    medians = (sorted_values[starts + (counts - 1) // 2] + sorted_values[starts + counts // 2]) / 2
+
+    reference = numpy.repeat(medians, counts)
+    quotes = numpy.repeat(counts, counts)
+    compared = quotes >= min_quotes
+    # rate and its inverse must be distinguishable for rate to be called inverted
+    inverted = compared & (numpy.abs(sorted_values + reference) <= tolerance) & (numpy.abs(reference) > tolerance)
+    deviating = compared & ~inverted & (numpy.abs(sorted_values - reference) > tolerance)
+
+    result = []
+    for kind, mask in ((RATE_INVERTED, inverted,), (RATE_DEVIATION, deviating,)):
+        for idx in numpy.flatnonzero(mask):
+            result.append((int(order[idx]), float(reference[idx]), int(quotes[idx]), kind,))
+    return result
+
+
+def _classify_python(groups: List[int], values: List[float], tolerance: float,
+                     min_quotes: int) -> List[Tuple[int, float, int, str]]:
+    members: Dict[int, List[int]] = {}
+    for idx, group in enumerate(groups):
+        members.setdefault(group, []).append(idx)
+
+    result = []
+    for indices in members.values():
+        if len(indices) < min_quotes:
+            continue
+        reference = statistics.median([values[idx] for idx in indices])
+        for idx in indices:
+            if abs(values[idx] + reference) <= tolerance < abs(reference):
+                result.append((idx, reference, len(indices), RATE_INVERTED,))
+            elif abs(values[idx] - reference) > tolerance:
+                result.append((idx, reference, len(indices), RATE_DEVIATION,))
+    return result
+
+
+def find_outliers(quotes: List[Quote], tolerance: float,
+                  min_quotes: int = RATE_CHECK_MIN_QUOTES) -> Tuple[List[RateOutlier], int]:
+    """
+    Finds rates deviating from median rate of the pair by more than tolerance, telling inverted ones apart.
+    Pairs quoted by fewer than min_quotes exchanges are not compared, as there's no majority to tell which
+    rate is the wrong one.
+
+    :param quotes: rates to compare (all positive)
+    :param tolerance: max deviation from median, i.e. 0.1 for 10%
+    :param min_quotes: min number of quotes (of the pair and its reverse) for pair to be compared
+    :return: suspicious rates (reference rate given in their pair's direction) and number of compared pairs
+    """
+    if not quotes:
+        return [], 0
+
+    # pair and its reverse share group, with rates of reversed one negated in log space
+    group_ids: Dict[Tuple[str, str], int] = {}
+    groups, values, signs = [], [], []
+    for ex_code, crypto, pair, rate in quotes:
+        key, sign = ((crypto, pair,), 1) if crypto <= pair else ((pair, crypto,), -1)
+        groups.append(group_ids.setdefault(key, len(group_ids)))
+        values.append(sign * math.log(rate))
+        signs.append(sign)
+
+    classify = _classify_numpy if numpy is not None else _classify_python
+    flagged = classify(groups, values, math.log1p(tolerance), min_quotes)
+
+    result = []
+    for idx, reference, cnt, kind in sorted(flagged):
+        ex_code, crypto, pair, rate = quotes[idx]
+        result.append((ex_code, crypto, pair, rate, math.exp(signs[idx] * reference), cnt, kind,))
+
+    compared_cnt = len([cnt for cnt in collections.Counter(groups).values() if cnt >= min_quotes])
+    return result, compared_cnt
+
+
+######################################################################
+
+def build_rates_report(outliers: List[RateOutlier], names: Dict[str, str], quotes_cnt: int,
+                       compared_cnt: int) -> List[str]:
+    """
+    Builds --check-rates report.
+
+    :param names: exchange code => exchange name
+    """
+    inverted_cnt = len([outlier for outlier in outliers if outlier[6] == RATE_INVERTED])
+    result = ['Rates check: {} rates fetched, {} pairs quoted by at least {} exchanges compared: {} deviating, '
+              '{} inverted'.format(quotes_cnt, compared_cnt, RATE_CHECK_MIN_QUOTES, len(outliers) - inverted_cnt,
+                                   inverted_cnt)]
+    for ex_code, crypto, pair, rate, reference, cnt, kind in outliers:
+        result.append('  {}: {}/{} rate {:.8g}, median of {}: {:.8g} ({})'.format(
+            names.get(ex_code, ex_code), crypto, pair, rate, cnt, reference, kind))
+    return result
@@ -0,0 +1,186 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+from typing import Dict, Iterator
+
+from .config import Config
+from .const import CURRENCY_FIAT, CURRENCY_STABLECOIN
+from .exchange import Binance, Bitbay, Bitstamp, Coinmate, Kraken
+from .result import TestResult
+from .runner import Exchanges
+
+
+######################################################################
+
+def create_exchanges(config: Config, cache_dir: str = None) -> Exchanges:
+    """
+    Creates container with all supported exchanges.
+
+    :param config: run configuration
+    :param cache_dir: validation cache root folder (--cache-dir or CACHE_DIR_NAME if not given)
+    :return: Exchanges
+    """
+    exchanges = Exchanges(config, cache_dir)
+    exchanges.add(
+        Binance(
+            # disabled = True,
+            code = 'binance-com',
+            name = 'Binance',
+            url = 'https://binance.com/',
+            api_url = 'https://api1.binance.com/api/v3/ticker/price?symbol={crypto}{pair}',
+            markets_url = 'https://api1.binance.com/api/v3/exchangeInfo',
+            # 6000 request weight per minute, single symbol ticker costs 2
+            rate_limit = 20, rate_burst = 20,
+            # Binance quotes against way too many assets to list them here
+            class_crosses = [CURRENCY_STABLECOIN, ],
+            batch_url = 'https://api1.binance.com/api/v3/ticker/price?symbols={symbols}',
+            batch_size = 100,
+
+            functions = {
+                'getRateFromExchangeData': 'return data.price',
+                # https://www.binance.com/en/markets
+                'getUrl': 'return `https://api1.binance.com/api/v3/ticker/price?symbol=${crypto}${pair}`',
+                'getBatchUrl': 'return `https://api1.binance.com/api/v3/ticker/price?symbols=${encodeURIComponent('
+                               'JSON.stringify(pairs.map(p => p[0] + p[1])))}`',
+                'getRatesFromBatchData': 'var rates = {}; data.forEach(ticker => rates[ticker.symbol] = ticker.price); '
+                                         'return pairs.map(p => rates[p[0] + p[1]])',
+            },
+        ))
+
+    exchanges.add(
+        Bitstamp(
+            # disabled = True,
+            code = 'bitstamp-net',
+            name = 'Bitstamp',
+            url = 'https://bitstamp.net/',
+            api_url = 'https://www.bitstamp.net/api/v2/ticker/{crypto}{pair}',
+            markets_url = 'https://www.bitstamp.net/api/v2/trading-pairs-info/',
+            # 400 requests per second, 10000 per 10 minutes
+            rate_limit = 15, rate_burst = 10,
+            quotes = ['BTC', 'ETH', 'EUR', 'GBP', 'USD', 'USDC', 'USDT', ],
+            class_crosses = [CURRENCY_FIAT, CURRENCY_STABLECOIN, ],
+
+            # as per GET method docs https://www.bitstamp.net/api/#ticker
+            valid_ticker_pairs = [
+                'BTCUSD', 'BTCEUR', 'BTCGBP', 'BTCPAX', 'BTCUSDC', 'GBPUSD', 'GBPEUR', 'EURUSD', 'ETHUSD', 'ETHEUR', 'ETHBTC', 'ETHGBP',
+                'ETHPAX', 'ETHUSDC', 'XRPUSD', 'XRPEUR', 'XRPBTC', 'XRPGBP', 'XRPPAX', 'UNIUSD', 'UNIEUR', 'UNIBTC', 'LTCUSD', 'LTCEUR',
+                'LTCBTC', 'LTCGBP', 'LINKUSD', 'LINKEUR', 'LINKGBP', 'LINKBTC', 'LINKETH', 'XLMBTC', 'XLMUSD', 'XLMEUR', 'XLMGBP',
+                'BCHUSD', 'BCHEUR', 'BCHBTC', 'BCHGBP', 'AAVEUSD', 'AAVEEUR', 'AAVEBTC', 'ALGOUSD', 'ALGOEUR', 'ALGOBTC', 'SNXUSD',
+                'SNXEUR', 'SNXBTC', 'BATUSD', 'BATEUR', 'BATBTC', 'MKRUSD', 'MKREUR', 'MKRBTC', 'ZRXUSD', 'ZRXEUR', 'ZRXBTC', 'YFIUSD',
+                'YFIEUR', 'YFIBTC', 'UMAUSD', 'UMAEUR', 'UMABTC', 'OMGUSD', 'OMGEUR', 'OMGGBP', 'OMGBTC', 'KNCUSD', 'KNCEUR', 'KNCBTC',
+                'CRVUSD', 'CRVEUR', 'CRVBTC', 'AUDIOUSD', 'AUDIOEUR', 'AUDIOBTC', 'USDCUSD', 'USDCEUR', 'DAIUSD', 'PAXUSD', 'PAXEUR',
+                'PAXGBP', 'ETH2ETH', 'GUSDUSD',
+            ],
+
+            # all tickers at once
+            batch_url = 'https://www.bitstamp.net/api/v2/ticker/',
+            batch_size = 0,
+
+            functions = {
+                'getRateFromExchangeData': 'return data.ask',
+                'getUrl': 'return `https://www.bitstamp.net/api/v2/ticker/${crypto.toLowerCase()}${pair.toLowerCase()}`',
+                'getBatchUrl': 'return `https://www.bitstamp.net/api/v2/ticker/`',
+                'getRatesFromBatchData': 'var rates = {}; data.forEach(ticker => rates[ticker.pair] = ticker.ask); '
+                                         "return pairs.map(p => rates[p[0] + '/' + p[1]])",
+            },
+        ))
+
+    exchanges.add(
+        Bitbay(
+            # disabled = True,
+            code = 'bitbay-net',
+            name = 'BitBay',
+            url = 'https://bitbay.net/',
+            api_url = 'https://api.zonda.exchange/rest/trading/ticker/{crypto}-{pair}',
+            markets_url = 'https://api.zonda.exchange/rest/trading/ticker',
+            quotes = ['BTC', 'ETH', 'EUR', 'GBP', 'PLN', 'USD', 'USDC', 'USDT', ],
+            class_crosses = [CURRENCY_FIAT, CURRENCY_STABLECOIN, ],
+            # all tickers at once
+            batch_url = 'https://api.zonda.exchange/rest/trading/ticker',
+            batch_size = 0,
+
+            functions = {
+                # {"status": "Ok", "ticker": {"highestBid": ..., "lowestAsk": ..., "rate": ...}}
+                'getRateFromExchangeData': 'return data.ticker.lowestAsk',
+                'getUrl': 'return `https://api.zonda.exchange/rest/trading/ticker/${crypto}-${pair}`',
+                'getBatchUrl': 'return `https://api.zonda.exchange/rest/trading/ticker`',
+                'getRatesFromBatchData': "return pairs.map(p => (p[0] + '-' + p[1]) in data.items "
+                                         "? data.items[p[0] + '-' + p[1]].lowestAsk : undefined)",
+            },
+        ))
+
+    exchanges.add(
+        Coinmate(
+            # disabled = True,
+            code = 'coinmate-io',
+            name = 'Coinmate',
+            url = 'https://coinmate.io/',
+            api_url = 'https://coinmate.io/api/ticker?currencyPair={crypto}_{pair}',
+            markets_url = 'https://coinmate.io/api/tradingPairs',
+            # 100 requests per minute
+            rate_limit = 1.5, rate_burst = 5,
+            quotes = ['BTC', 'CZK', 'EUR', 'USDT', ],
+
+            # https://coinmate.io/trade
+            functions = {
+                'getRateFromExchangeData': 'return data.data.ask',
+                'getUrl': 'return `https://coinmate.io/api/ticker?currencyPair=${crypto}_${pair}`',
+            },
+        ))
+
+    exchanges.add(
+        Kraken(
+            # disabled = True,
+
+            code = 'kraken-com',
+            name = 'Kraken',
+            url = 'https://kraken.com/',
+            api_url = 'https://api.kraken.com/0/public/Ticker?pair={crypto}{pair}',
+            markets_url = 'https://api.kraken.com/0/public/AssetPairs',
+            # public endpoints: roughly 1 call per second
+            rate_limit = 1, rate_burst = 5,
+            quotes = ['BTC', 'DOT', 'ETH', 'EUR', 'GBP', 'JPY', 'USD', 'USDC', 'USDT', ],
+            class_crosses = [CURRENCY_FIAT, CURRENCY_STABLECOIN, ],
+            batch_url = 'https://api.kraken.com/0/public/Ticker?pair={symbols}',
+            batch_size = 20,
+
+            # https://support.kraken.com/hc/en-us/articles/360001185506
+            # https://support.kraken.com/hc/en-us/articles/201893658-Currency-pairs-available-for-trading-on-Kraken
+
+            functions = {
+                # some tricks to work around odd asset naming used in returned response as main key
+                'getRateFromExchangeData': "return data.result[Object.keys(data['result'])[0]].a[0]",
+                'getUrl': 'return `https://api.kraken.com/0/public/Ticker?pair=${crypto}${pair}`',
+                'getBatchUrl': "return `https://api.kraken.com/0/public/Ticker?pair=${pairs.map(p => p[0] + p[1]).join(',')}`",
+                # batch response is keyed by Kraken's pair names, i.e. "XXBTZUSD" (see Kraken.get_batch_keys())
+                'getRatesFromBatchData': "var aliases = {'BTC': 'XBT', 'DOGE': 'XDG'}; "
+                                         'return pairs.map(p => { '
+                                         'var base = aliases[p[0]] || p[0], quote = aliases[p[1]] || p[1]; '
+                                         "var key = [p[0] + p[1], base + quote, 'X' + base + 'Z' + quote, "
+                                         "'X' + base + 'X' + quote].find(k => k in data.result); "
+                                         'return key ? data.result[key].a[0] : undefined })',
+            },
+        ))
+
+    return exchanges
+
+
+def iter_results(config: Config, currencies: Dict[str, Dict] = None, cache_dir: str = None) -> Iterator[TestResult]:
+    """
+    Checks currency pairs on all supported exchanges, yielding each TestResult as soon as it is known.
+
+    :param config: run configuration (see create_config())
+    :param currencies: currencies to check (all supported currencies if not given)
+    :param cache_dir: validation cache root folder (--cache-dir or CACHE_DIR_NAME if not given)
+    """
+    if currencies is None:
+        from .currency_data import currencies
+    yield from create_exchanges(config, cache_dir).iter_results(currencies)
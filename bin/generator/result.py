@@ -0,0 +1,121 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import zlib
+from typing import List, Optional, Tuple
+
+from .cache import ResultCache
+from .utils import now
+
+
+######################################################################
+
+class TestResult:
+    # there's one instance per checked combination, so no per instance __dict__
+    __slots__ = ['ex_code', 'crypto', 'pair', 'rc', 'stamp', 'cached', 'use_cache', 'failed', 'error', 'retries',
+                 'elapsed', 'calls', 'throttled_cnt', 'discovered', 'previous', 'stale', 'resumed', ]
+
+    def __init__(self, ex_code: str, crypto: str, pair: str, rc: bool = False, stamp: int = None,
+                 cached: bool = False, use_cache: bool = True):
+        self.ex_code = ex_code
+        self.crypto = crypto
+        self.pair = pair
+
+        self.rc = rc
+        self.stamp = stamp if stamp else now()
+        self.cached = cached
+        self.use_cache = use_cache
+
+        # set when probe failed and its outcome is unknown (such result must not be cached)
+        self.failed = False
+        # reason of failure (see ERR_*)
+        self.error = None
+        # number of retried API calls
+        self.retries = 0
+        # duration (in seconds) of API call that the result is based on
+        self.elapsed = None
+        # (HTTP status or error reason, duration in seconds, body bytes) of each API call made
+        # (see Exchange.call_api()), None if no call was made
+        self.calls: Optional[List[Tuple[object, float, int]]] = None
+        # number of API calls that got throttled
+        self.throttled_cnt = 0
+        # set when result comes from exchange market listing instead of ticker API call
+        self.discovered = False
+        # (rc, stamp) of expired cache entry, if there's one
+        self.previous = None
+        # set when result comes from expired cache entry
+        self.stale = False
+        # set when result comes from journal of interrupted run (see --resume)
+        self.resumed = False
+
+    def fail(self, reason: str) -> "TestResult":
+        self.failed = True
+        self.error = reason
+        return self
+
+    def get_outcome(self) -> Tuple:
+        """
+        Returns fields set by probing, as compact tuple to be shipped back from worker process (see apply_outcome()).
+        """
+        return self.rc, self.failed, self.error, self.retries, self.elapsed, self.calls, self.throttled_cnt
+
+    def apply_outcome(self, outcome: Tuple) -> "TestResult":
+        self.rc, self.failed, self.error, self.retries, self.elapsed, self.calls, self.throttled_cnt = outcome
+        return self
+
+    def get_expiry_threshold(self, cache_threshold: int, jitter: float, stamp: int) -> int:
+        # Entries cached in the same run share (almost) the same stamp. Shortening validity of each
+        # of them by pseudo random, yet stable fraction spreads their expiry over subsequent runs.
+        key = '{}:{}:{}:{}'.format(self.ex_code, self.crypto, self.pair, stamp)
+        fraction = (zlib.crc32(key.encode()) & 0xffff) / 0xffff
+        return int(cache_threshold * (1 - jitter * fraction))
+
+    def cache_load(self, cache: ResultCache, cache_threshold: Optional[int], jitter: float = 0.0) -> bool:
+        # cache_threshold of None means cached entries never expire
+        result = False
+        if self.use_cache:
+            cached_data = cache.get(self.ex_code, self.crypto, self.pair)
+            if cached_data is not None:
+                rc, stamp = cached_data
+                if cache_threshold is None or now() < (stamp + self.get_expiry_threshold(cache_threshold, jitter, stamp)):
+                    self.rc = rc
+                    self.stamp = stamp
+                    self.cached = True
+                    result = True
+                else:
+                    self.previous = cached_data
+        return result
+
+    def serve_stale(self) -> bool:
+        """
+        Uses expired cache entry (if there's any) as the result.
+
+        :return: True if expired entry was used
+        """
+        if self.previous is None:
+            return False
+        self.rc, self.stamp = self.previous
+        self.cached = True
+        self.stale = True
+        self.failed = False
+        return True
+
+    def get_refresh_priority(self) -> Tuple[int, int]:
+        # Previously confirmed pairs go first (as these are in the output), then never checked ones, then
+        # the rest. Stalest entries first.
+        if self.previous is None:
+            return 1, 0
+        rc, stamp = self.previous
+        return 0 if rc else 2, stamp
+
+    def cache_save(self, cache: ResultCache) -> None:
+        if self.use_cache:
+            cache.put(self.ex_code, self.crypto, self.pair, self.rc, self.stamp)
@@ -0,0 +1,760 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import collections
+import contextlib
+import glob
+import hashlib
+import json
+import math
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .cache import ResultCache
+from .config import Config
+from .const import (BACKOFF_BASE, BACKOFF_MAX, CACHE_DIR_NAME, CACHE_FLUSH_INTERVAL, ENGINE_ASYNC, ERR_BUDGET,
+                    ERR_CIRCUIT_OPEN, ERR_DEADLINE, ERR_EXCEPTION, ERR_INTERRUPTED, ERR_NOT_RECORDED, ERR_STALLED,
+                    ERR_THROTTLED, JOURNAL_FILE_NAME, POOL_BATCH_MAX, REPLAY_RATE_LIMIT, THROTTLE_MAX_RETRIES)
+from .exchange import Exchange
+from .journal import Journal
+from .matrix import PairMatrix
+from .profiler import phase
+from .pruner import PairPruner
+from .result import TestResult
+from .scheduler import CircuitBreaker, Scheduler
+from .shard import get_shard
+from .stats import RunStats
+from .utils import jittered_backoff
+
+
+######################################################################
+
+class ExchangesIterator:
+    def __init__(self, container: "Exchanges"):
+        self._container = container
+        self._index = 0
+
+    def __next__(self) -> Exchange:
+        if self._index >= self._container.count():
+            raise StopIteration
+
+        ex = self._container.get(self._index)
+        self._index += 1
+        return ex
+
+
+class Exchanges:
+    def __init__(self, config: Config, cache_dir: str = None):
+        self._container = collections.OrderedDict()
+        self.config = config
+        if cache_dir is None:
+            cache_dir = config.cache_dir if config.cache_dir is not None else CACHE_DIR_NAME
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.cache = ResultCache(self.cache_dir)
+        self.stats = RunStats()
+        # pairs confirmed on all exchanges (see init_matrix())
+        self.matrix: Optional[PairMatrix] = None
+        # (exchange code, crypto, pair) checks of last run with no result known: never checked ones that did
+        # not fit probe budget and failed ones with no cached result to fall back to
+        self.unchecked: Set[Tuple[str, str, str]] = set()
+        # set once checks are interrupted (see interrupt())
+        self.interrupted = threading.Event()
+        if config.replay is not None:
+            from .fixtures import get_archive
+
+            # loaded up front, so broken archive is reported before any work is done (and forked workers
+            # of pool engine inherit it)
+            get_archive(config.replay, replay = True)
+
+    def __iter__(self):
+        return ExchangesIterator(self)
+
+    def count(self) -> int:
+        return len(self._container)
+
+    def add(self, ex: Exchange) -> None:
+        """
+        Adds new Exchange to Exchanges container.
+
+        :param ex: subclass of Exchange to be added
+        :return: None
+        """
+        if ex.code in self._container:
+            raise ValueError('Exchange with key "{}" already exists.'.format(ex.code))
+
+        ex.config = self.config
+        if self.config.replay is not None:
+            # no API to protect from request flood
+            ex.rate_limit, ex.rate_burst = REPLAY_RATE_LIMIT, self.config.concurrency
+        self._container[ex.code] = ex
+
+    def get(self, idx_or_key) -> Optional[Exchange]:
+        if isinstance(idx_or_key, int):
+            return self._get_by_index(idx_or_key)
+        elif isinstance(idx_or_key, str):
+            return self._get_by_key(idx_or_key)
+
+    def _get_by_key(self, key: str) -> Optional[Exchange]:
+        return self._container[key]
+
+    def _get_by_index(self, idx: int) -> Optional[Exchange]:
+        if idx >= len(self._container):
+            raise IndexError
+        keys = list(self._container.keys())
+        return self._container.get(keys[idx])
+
+    def filter_exchanges(self) -> None:
+        """
+        Cleans up exchange container either removing disabled exchanges, or if config.exchange_filter
+        is set, removing all but matching the filter.
+
+        :return:
+        """
+        to_be_removed = []
+        if self.config.exchange_filter is None:
+            for _, ex in self._container.items():
+                if ex.disabled:
+                    to_be_removed.append(ex)
+        else:
+            ex_filter = self.config.exchange_filter
+            self.verbose('Filtering exchanges: "{}"'.format(ex_filter))
+            for _, ex in self._container.items():
+                if ex.code.find(ex_filter) >= 0 or ex.name.find(ex_filter) >= 0:
+                    self.verbose('  {} ({}) matches'.format(ex.name, ex.code))
+                    ex.disabled = False
+                else:
+                    to_be_removed.append(ex.code)
+
+        for code in to_be_removed:
+            del self._container[code]
+
+    def interrupt(self) -> bool:
+        """
+        Makes running checks stop: probes in progress complete (and get journaled), remaining ones are given up,
+        so interrupted run can be continued with --resume.
+
+        :return: False if checks were interrupted already
+        """
+        if self.interrupted.is_set():
+            return False
+        print('Interrupted, waiting for checks in progress to complete (Ctrl+C again to quit immediately)')
+        self.interrupted.set()
+        return True
+
+    def get_journal_meta(self, currencies: Dict[str, Dict]) -> Dict:
+        # journal of run done with different currencies, exchanges (or their definitions) or shard cannot be resumed
+        return {
+            'currencies':   sorted(currencies.keys()),
+            'fingerprints': {ex.code: ex.get_fingerprint() for ex in self._container.values()},
+            'shard':        list(self.config.shard) if self.config.shard is not None else None,
+        }
+
+    def get_journal_file(self, meta: Dict) -> str:
+        # named after run setup, so concurrent runs (i.e. parallel --exchange jobs) sharing cache folder
+        # keep separate journals
+        digest = hashlib.sha1(json.dumps(meta, sort_keys = True).encode('utf-8')).hexdigest()[:12]
+        base, ext = os.path.splitext(JOURNAL_FILE_NAME)
+        return os.path.join(self.cache_dir, '{}-{}{}'.format(base, digest, ext))
+
+    def get_stall_timeout(self, batch_size: int = 1) -> float:
+        """
+        Returns the longest time batch of probes may take, with all API calls timing out and retried (throttled
+        ones included). No result coming for longer than that means probes are not going to complete (i.e. due
+        to dead or hung pool worker).
+
+        :param batch_size: number of probes done one after another, before their results are handed over
+        """
+        retries = self.config.retries
+        call_cnt = retries + 1 + THROTTLE_MAX_RETRIES
+        backoff = sum([min(BACKOFF_BASE * (2 ** attempt), BACKOFF_MAX) for attempt in range(retries)])
+        backoff += sum([min(BACKOFF_BASE * (2 ** attempt), BACKOFF_MAX) for attempt in range(THROTTLE_MAX_RETRIES)])
+        probe_time = call_cnt * (self.config.connect_timeout + self.config.read_timeout) + backoff
+        return batch_size * probe_time + 1
+
+    def prune_journals(self, current: str) -> None:
+        """
+        Removes journals of other run setups (i.e. other --exchange or --shard) not written to for longer than
+        cache validity threshold, as results they hold are expired anyway. Younger ones may belong to
+        concurrent runs sharing cache folder (or to interrupted runs yet to be resumed), so are kept.
+
+        :param current: journal file of this run
+        """
+        base, ext = os.path.splitext(JOURNAL_FILE_NAME)
+        expired = time.time() - self.config.cache_threshold / 1000
+        for file_name in glob.glob(os.path.join(self.cache_dir, '{}-*{}'.format(base, ext))):
+            if file_name == current:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                if os.path.getmtime(file_name) < expired:
+                    os.remove(file_name)
+                    self.verbose('Removed expired journal {}'.format(file_name))
+
+    def resume_journal(self, journal: Journal, meta: Dict, jobs: List) -> Optional[List]:
+        """
+        Applies results of checks completed by interrupted run to jobs.
+
+        :return: jobs still to be probed, or None if journal cannot be resumed
+        """
+        if not journal.load():
+            print('No journal of interrupted run found, starting over')
+            return None
+        if journal.meta != meta:
+            print('Interrupted run was done with different currencies or exchanges, starting over')
+            return None
+
+        remaining = []
+        for ex, tr in jobs:
+            result = journal.completed.get((tr.ex_code, tr.crypto, tr.pair,))
+            if result is None:
+                remaining.append((ex, tr,))
+            else:
+                tr.rc, tr.stamp = result
+                tr.resumed = True
+        print('Resuming interrupted run: {} of {} checks completed already'.format(
+            len(journal.completed), len(journal.pending)))
+        return remaining
+
+    def init_matrix(self, currencies: Dict[str, Dict]) -> PairMatrix:
+        """
+        Creates empty pair matrix of all exchanges in container (filter them first) and given currencies,
+        to collect confirmed pairs in.
+        """
+        self.matrix = PairMatrix(list(self._container.keys()), sorted(currencies.keys()))
+        for ex in self._container.values():
+            ex.matrix = self.matrix
+        return self.matrix
+
+    def report_changes(self) -> None:
+        """
+        Reports pairs confirmed or gone since last run (of each exchange) and stores current pairs for next run.
+        """
+        added, removed = [], []
+        compared_cnt = 0
+        for ex_code in self.matrix.exchanges:
+            data = self.cache.get_matrix(ex_code)
+            if data is None:
+                continue
+            try:
+                previous = PairMatrix.from_bytes(data)
+            except ValueError as e:
+                self.verbose('{}: previous pairs not usable: {}'.format(ex_code, e))
+                continue
+            ex_added, ex_removed = self.matrix.diff(previous)
+            added += ex_added
+            removed += ex_removed
+            compared_cnt += 1
+
+        if compared_cnt > 0:
+            print('Since previous run: {} pairs added, {} removed'.format(len(added), len(removed)))
+        for sign, cells in (('+', added,), ('-', removed,)):
+            for ex_code, crypto, pair in cells:
+                self.verbose('  {} {}: {}/{}'.format(sign, self.get(ex_code).name, crypto, pair))
+
+        if not self.config.dry_run:
+            for ex_code in self.matrix.exchanges:
+                self.cache.set_matrix(ex_code, self.matrix.select([ex_code]).to_bytes())
+            self.cache.flush()
+
+    def process_exchanges(self, currencies: Dict[str, Dict], on_result: Callable[[TestResult], None] = None,
+                          budget: bool = True) -> None:
+        """
+        Checks all currency combinations on all exchanges, collecting confirmed ones in Exchange.pairs.
+
+        :param currencies: currencies to check
+        :param on_result: optional callback invoked with each collected TestResult
+        :param budget: False to ignore --max-probes and --time-budget, so all due checks are done
+        """
+        for tr in self.iter_results(currencies, budget):
+            if on_result is not None:
+                on_result(tr)
+
+    def verify_batches(self) -> None:
+        """
+        Checks batch ticker endpoints of exchanges that have one, against pairs confirmed by process_exchanges().
+        Batch functions of exchanges failing the check are not included in generated data, so widget falls back
+        to one API request per ticker for them.
+        """
+        for ex in self:
+            if ex.batch_url is None or 'getBatchUrl' not in ex.functions:
+                continue
+            calls = []
+            reason = ex.verify_batch(calls)
+            self.stats.get(ex.code).record_calls(calls)
+            ex.batch_verified = reason is None
+            if reason is None:
+                self.verbose('{}: batch ticker OK'.format(ex.name))
+            else:
+                print('{}: batch ticker check failed: {}'.format(ex.name, reason))
+
+    def check_rates(self, tolerance: float) -> List[str]:
+        """
+        Fetches rates of all pairs confirmed by process_exchanges() from batch ticker endpoints, the way widget
+        extracts them, and compares them across exchanges (see rates.find_outliers()). Exchanges with no
+        batch endpoint are not checked.
+
+        :param tolerance: max deviation from median rate of the pair, i.e. 0.1 for 10%
+        :return: report lines
+        """
+        from .rates import build_rates_report, find_outliers
+
+        quotes = []
+        for ex in self:
+            if ex.batch_url is None:
+                self.verbose('{}: no batch ticker endpoint, rates not checked'.format(ex.name))
+                continue
+            calls = []
+            rates, reason = ex.get_all_rates(calls)
+            self.stats.get(ex.code).record_calls(calls)
+            if reason is not None:
+                print('{}: fetching rates failed: {}'.format(ex.name, reason))
+            quotes += [(ex.code, crypto, pair, rate,) for (crypto, pair), rate in rates.items()]
+
+        with phase('compare'):
+            outliers, compared_cnt = find_outliers(quotes, tolerance)
+        return build_rates_report(outliers, {ex.code: ex.name for ex in self}, len(quotes), compared_cnt)
+
+    def iter_results(self, currencies: Dict[str, Dict], budget: bool = True) -> Iterator[TestResult]:
+        """
+        Checks all currency combinations on all exchanges, yielding each TestResult as soon as it is known
+        (cached and discovered ones first, then probed ones in order of completion). Confirmed pairs are
+        collected in Exchange.pairs and checks with no result known end up in unchecked. Closing the iterator
+        early stops remaining checks (results collected so far are still cached).
+
+        :param currencies: currencies to check
+        :param budget: False to ignore --max-probes and --time-budget, so all due checks are done
+        """
+        # Cycling thru all exchanges we need to check to avoid doing single API endpoint flood
+        total_number_of_checks = 0
+
+        self.filter_exchanges()
+        self.init_matrix(currencies)
+        for ex in self._container.values():
+            self.stats.get(ex.code)
+
+        if self.config.use_cache:
+            with self.stats.phase('cache load'):
+                # once loaded, cache is kept up to date in memory (see --watch), only picking up results
+                # of concurrent runs
+                if not self.cache.loaded:
+                    # legacy cache files only ever were in default folder, custom one (possibly shared with other
+                    # tools) is left alone
+                    default_dir = os.path.realpath(os.path.expanduser(CACHE_DIR_NAME))
+                    legacy_codes = self._container.keys() if os.path.realpath(self.cache_dir) == default_dir else ()
+                    self.verbose('Loaded {} cached results from {}'.format(self.cache.load(legacy_codes),
+                                                                         self.cache.db_file))
+                else:
+                    self.verbose('Refreshed {} cached results from {}'.format(self.cache.refresh(),
+                                                                            self.cache.db_file))
+                # results obtained with different exchange definition cannot be trusted
+                for ex in self._container.values():
+                    fingerprint = ex.get_fingerprint()
+                    known_fingerprint = self.cache.get_fingerprint(ex.code)
+                    if known_fingerprint is not None and known_fingerprint != fingerprint:
+                        print('{}: definition changed, dropped {} cached results'.format(
+                            ex.name, self.cache.drop_exchange(ex.code)))
+                    self.cache.set_fingerprint(ex.code, fingerprint)
+
+        with self.stats.phase('planning'):
+            with phase('pruning'):
+                if self.config.prune:
+                    pruner = PairPruner(currencies)
+                    candidates = pruner.get_candidates(list(self._container.values()))
+                    print(pruner.get_summary())
+                else:
+                    candidates = [(ex, curr_key, pair_key,) for curr_key in currencies.keys()
+                                  for pair_key in currencies.keys() for ex in self._container.values()]
+            if self.config.shard is not None:
+                index, count = self.config.shard
+                candidates = [(ex, curr_key, pair_key,) for ex, curr_key, pair_key in candidates
+                              if get_shard(ex.code, curr_key, pair_key, count) == index]
+                self.verbose('Shard {}/{}: {} combinations to check'.format(index, count, len(candidates)))
+
+            cells = []
+            uncached_exchanges = set()
+            with phase('cache lookup'):
+                for ex, curr_key, pair_key in candidates:
+                    tr = ex.build_tr_object(curr_key, pair_key, self.config, self.cache)
+                    if not tr.cached:
+                        uncached_exchanges.add(ex.code)
+                    cells.append((ex, tr,))
+
+        # Exchanges with market listing endpoint resolve all their uncached pairs with single API call.
+        # Per pair ticker probing is used as fallback only.
+        markets = {}
+        if self.config.discovery:
+            with self.stats.phase('discovery'):
+                for code in uncached_exchanges:
+                    ex = self.get(code)
+                    calls = []
+                    markets[code] = ex.discover_pairs(currencies, calls)
+                    self.stats.get(code).record_calls(calls)
+                    if markets[code] is not None:
+                        self.verbose('{}: {} pairs discovered via market listing'.format(ex.name, len(markets[code])))
+
+        # results known without probing
+        ready = collections.deque()
+        jobs = []
+        for ex, tr in cells:
+            if tr.cached:
+                ready.append(tr)
+            elif markets.get(ex.code) is not None:
+                tr.rc = (tr.crypto, tr.pair) in markets[ex.code]
+                tr.discovered = True
+                ready.append(tr)
+            elif ex.is_ticker_pair_valid(tr.crypto, tr.pair):
+                jobs.append((ex, tr,))
+            else:
+                continue
+            total_number_of_checks += 1
+
+        # Checks completed by interrupted run are not probed again (see --resume)
+        journal_meta = self.get_journal_meta(currencies)
+        journal = Journal(self.get_journal_file(journal_meta))
+        if not self.config.dry_run:
+            self.prune_journals(journal.file_name)
+        resumed = False
+        if self.config.resume:
+            remaining = self.resume_journal(journal, journal_meta, jobs)
+            if remaining is not None:
+                ready.extend([tr for _, tr in jobs if tr.resumed])
+                jobs = remaining
+                resumed = True
+        elif jobs and os.path.exists(journal.file_name):
+            # with nothing to probe, journal is just removed once run completes
+            print('Previous run was interrupted, starting over (use --resume to continue it)')
+
+        # each probed check is removed once it completes with a result
+        self.unchecked = {(tr.ex_code, tr.crypto, tr.pair,) for _, tr in jobs}
+
+        # With probe budget set, most important checks go first and whatever does not fit is served from cache
+        deferred_cnt = 0
+        max_probes = self.config.max_probes if budget else None
+        time_budget = self.config.time_budget if budget else None
+        if max_probes is not None or time_budget is not None:
+            jobs.sort(key = lambda job: job[1].get_refresh_priority())
+        if max_probes is not None and len(jobs) > max_probes:
+            for _, tr in jobs[max_probes:]:
+                if tr.serve_stale():
+                    ready.append(tr)
+                    self.unchecked.discard((tr.ex_code, tr.crypto, tr.pair,))
+                else:
+                    deferred_cnt += 1
+                    total_number_of_checks -= 1
+            jobs = jobs[:max_probes]
+
+        if jobs and not self.config.dry_run:
+            if resumed:
+                journal.resume()
+            else:
+                journal.start(journal_meta, [(tr.ex_code, tr.crypto, tr.pair,) for _, tr in jobs])
+
+        checks_started = time.monotonic()
+        deadline = None if self.config.deadline is None else time.time() + self.config.deadline
+        deadline_reason = ERR_DEADLINE
+        if time_budget is not None:
+            budget_end = time.time() + time_budget
+            if deadline is None or budget_end < deadline:
+                deadline = budget_end
+                deadline_reason = ERR_BUDGET
+
+        # Probing engine (and its dependencies) is only brought up if there's anything to probe
+        worker = None
+        results = queue.Queue()
+        # codes of exchanges whose circuit breaker tripped
+        tripped = {}
+        if jobs and self.config.engine == ENGINE_ASYNC:
+            worker = threading.Thread(target = self._run_async_engine,
+                                      args = (jobs, results, tripped, deadline, deadline_reason,), daemon = True)
+            worker.start()
+        elif jobs:
+            import multiprocessing as mp
+            from . import pool
+
+            # Exchanges are shipped to workers once, tasks and results are compact tuples sent in batches
+            tripped = pool.ExchangeFlags(self._container.keys())
+            worker = mp.Pool(processes = self.config.concurrency, initializer = pool.init_worker,
+                             initargs = (dict(self._container), tripped, deadline, deadline_reason,))
+            tasks = [(idx, tr.ex_code, tr.crypto, tr.pair,) for idx, (_, tr) in enumerate(jobs)]
+            outcomes = worker.imap_unordered(pool.probe_batch,
+                                             pool.build_batches(tasks, self.config.concurrency, POOL_BATCH_MAX))
+            # No more pool submissions
+            worker.close()
+            threading.Thread(target = self._collect_pool_results, args = (outcomes, jobs, results,),
+                             daemon = True).start()
+
+        # In case probes do not complete (i.e. due to dead or hung worker), we stop waiting for them once
+        # no result comes for longer than probes may take, or once deadline and the longest single API call
+        # duration passes.
+        stall_timeout = self.get_stall_timeout(POOL_BATCH_MAX if self.config.engine != ENGINE_ASYNC else 1)
+        waiting_since = time.monotonic()
+        wait_until = None
+        if self.config.deadline is not None:
+            wait_until = time.time() + self.config.deadline + self.config.connect_timeout + self.config.read_timeout + 1
+        breakers = {ex.code: CircuitBreaker(self.config.breaker_threshold) for ex in self._container.values()}
+        failures = collections.Counter()
+
+        # Waiting for probes to complete...
+        pair_success_cnt = pair_skipped_cnt = pair_from_cache = pair_failed_cnt = pair_discovered_cnt = 0
+        pair_stale_cnt = 0
+        cnt = 0
+        msg = ''
+        completed = False
+        # set once we stop waiting for probes still in progress
+        abandoned = False
+        flushed = time.monotonic()
+        try:
+            while cnt < total_number_of_checks:
+                if self.interrupted.is_set() and len(tripped) < len(self._container):
+                    # engines give up remaining checks, while these in progress complete
+                    for code in self._container.keys():
+                        tripped[code] = True
+
+                if ready:
+                    response: TestResult = ready.popleft()
+                else:
+                    try:
+                        # time spent waiting for probes to complete
+                        with phase('wait'):
+                            response = results.get(timeout = 1)
+                    except queue.Empty:
+                        stalled = time.monotonic() - waiting_since >= stall_timeout
+                        if not stalled and (wait_until is None or time.time() < wait_until):
+                            continue
+                        missing_cnt = total_number_of_checks - cnt
+                        if stalled:
+                            print('No check completed in {:.0f}s, {} checks given up'.format(stall_timeout,
+                                                                                         missing_cnt))
+                        else:
+                            print('Deadline exceeded, {} checks not completed'.format(missing_cnt))
+                        failures[ERR_STALLED if stalled else ERR_DEADLINE] += missing_cnt
+                        self.stats.abandoned += missing_cnt
+                        pair_failed_cnt += missing_cnt
+                        cnt += missing_cnt
+                        abandoned = True
+                        break
+
+                if response.failed and response.error == ERR_CIRCUIT_OPEN and self.interrupted.is_set():
+                    response.error = ERR_INTERRUPTED
+                elif breakers[response.ex_code].record(response):
+                    tripped[response.ex_code] = True
+                    print('{}: {} consecutive checks failed, giving up remaining ones'.format(
+                        self.get(response.ex_code).name, breakers[response.ex_code].failures))
+
+                if response.failed and not response.serve_stale():
+                    pair_failed_cnt += 1
+                    failures[response.error] += 1
+                elif response.rc:
+                    ex = self.get(response.ex_code)
+                    ex.add_pair(response.crypto, response.pair)
+                    pair_success_cnt += 1
+                else:
+                    pair_skipped_cnt += 1
+                if not response.failed:
+                    self.unchecked.discard((response.ex_code, response.crypto, response.pair,))
+
+                self.stats.get(response.ex_code).record_result(response)
+
+                if response.discovered:
+                    pair_discovered_cnt += 1
+                if response.stale:
+                    pair_stale_cnt += 1
+
+                if response.cached:
+                    pair_from_cache += 1
+                elif not self.config.dry_run and not response.failed:
+                    with phase('cache save'):
+                        response.cache_save(self.cache)
+                    if not response.discovered and not response.resumed:
+                        journal.record(response)
+                    # so concurrent runs sharing the cache pick them up while this one is still running
+                    if time.monotonic() - flushed >= CACHE_FLUSH_INTERVAL:
+                        with phase('cache flush'):
+                            self.cache.flush()
+                        flushed = time.monotonic()
+
+                if not self.config.no_gauge:
+                    with phase('gauge'):
+                        gauge_max = 60
+                        gauge_progress = math.floor(gauge_max * (cnt / total_number_of_checks))
+                        # first char in msg is space so console cursor mimics first block (usually)
+                        msg = ' {}{}: {} of {}'.format('█' * gauge_progress, '░' * (gauge_max - gauge_progress),
+                                                       cnt, total_number_of_checks)
+                        print(msg, end = '\r')
+
+                cnt += 1
+                yield response
+                waiting_since = time.monotonic()
+            completed = True
+        finally:
+            self.stats.phases['checks'] = round(time.monotonic() - checks_started, 4)
+            # results collected so far are persisted even if run gets interrupted
+            if not self.config.dry_run:
+                with self.stats.phase('cache flush'):
+                    self.cache.flush()
+                # journal is kept till the run completes, so interrupted (or killed) run can be resumed
+                if completed and not self.interrupted.is_set():
+                    journal.remove()
+                else:
+                    journal.close()
+
+            if not completed:
+                # iterator closed early, so engines give up what is left
+                for code in self._container.keys():
+                    tripped[code] = True
+
+            if isinstance(worker, threading.Thread):
+                # daemon thread: if we gave up waiting for it, it just dies with us
+                worker.join(timeout = 0 if not completed or abandoned else None)
+            elif worker is not None and (not completed or abandoned):
+                worker.terminate()
+            elif worker is not None:
+                # to ensure we do not leave too early (should not happen though)
+                worker.join()
+
+        # clear last progress message
+        print(' ' * len(msg), end = '\r')
+
+        # Summary
+        print('Total {total} pairs ({cache_percent:>.0f}% cached, {stale} stale, {discovered} from market listings), '
+              'invalid: {skipped}, confirmed: {paired}'.format(
+            total = cnt, paired = pair_success_cnt, skipped = pair_skipped_cnt, discovered = pair_discovered_cnt,
+            stale = pair_stale_cnt, cache_cnt = pair_from_cache,
+            cache_percent = (pair_from_cache * 100) / cnt if cnt > 0 else 0))
+        if deferred_cnt > 0:
+            print('Deferred {} never checked pairs to next runs (out of probe budget)'.format(deferred_cnt))
+        if pair_failed_cnt > 0:
+            print('Failed {} checks (not cached, will be retried on next run): {}'.format(
+                pair_failed_cnt, ', '.join(['{}: {}'.format(reason, failed_cnt)
+                                            for reason, failed_cnt in failures.most_common()])))
+        if failures[ERR_NOT_RECORDED] > 0:
+            print('{} API calls not found in replayed archive {}, record it again with --record to cover them'.format(
+                failures[ERR_NOT_RECORDED], self.config.replay))
+        # partial results of sharded or interrupted run are not worth comparing
+        if self.config.use_cache and self.config.shard is None and not self.interrupted.is_set():
+            self.report_changes()
+
+    @staticmethod
+    def _collect_pool_results(outcomes: Iterator[List[Tuple]], jobs: List, results: queue.Queue) -> None:
+        # Applies outcomes of probes done by worker processes to TestResults they belong to
+        for batch in outcomes:
+            for idx, outcome in batch:
+                results.put(jobs[idx][1].apply_outcome(outcome))
+
+    def _run_async_engine(self, jobs: List, results: queue.Queue, tripped: Dict[str, bool],
+                          deadline: Optional[float], deadline_reason: str) -> None:
+        import asyncio
+
+        asyncio.run(self._probe_all(jobs, results, tripped, deadline, deadline_reason))
+
+    async def _probe_all(self, jobs: List, results: queue.Queue, tripped: Dict[str, bool],
+                         deadline: Optional[float], deadline_reason: str = ERR_DEADLINE) -> None:
+        """
+        Runs all probes from asyncio event loop. Validators are written against blocking requests.Response,
+        so each call is executed on thread pool, while connections are reused thanks to per exchange
+        sessions (see Exchange.get_session()). Requests are paced per exchange host by Scheduler and
+        concurrency is capped at config.concurrency. Throttled requests are put back to the queue and
+        retried after backoff, so rate limiting never ends up cached as invalid pair.
+
+        :param jobs: list of (Exchange, TestResult) tuples to be checked
+        :param results: queue to put completed TestResult objects to
+        :param tripped: codes of exchanges whose remaining probes should be given up
+        :param deadline: time.time() based moment after which remaining probes are given up
+        :param deadline_reason: failure reason reported for probes given up due to deadline
+        :return: None
+        """
+        import asyncio
+        import concurrent.futures
+
+        loop = asyncio.get_running_loop()
+
+        scheduler = Scheduler()
+        for ex, tr in jobs:
+            scheduler.add_host(ex.host, ex.rate_limit, ex.rate_burst)
+            # job: (exchange, test result, throttled attempts, failed attempts)
+            scheduler.submit(ex.host, (ex, tr, 0, 0,))
+
+        async def probe(host: str, ex: Exchange, tr: TestResult, throttled_cnt: int, failed_cnt: int) -> None:
+            bucket = scheduler.bucket(host)
+            try:
+                response = await loop.run_in_executor(executor, ex.fetch, tr)
+                reason = ex.get_retry_reason(response)
+                if reason is None:
+                    bucket.succeeded()
+                    delay = ex.get_backoff_delay(response)
+                    if delay is not None:
+                        bucket.hold(delay)
+                    ex.evaluate(tr, response)
+            except Exception as e:
+                response = None
+                reason = ex.get_error_reason(e)
+                if reason == ERR_EXCEPTION:
+                    ex.do_api_call_error_callback(str(e))
+
+            if reason == ERR_THROTTLED:
+                tr.throttled_cnt += 1
+                bucket.throttled(ex.get_backoff_delay(response))
+                self.d('#{sc} throttled by {host}: {url}'.format(sc = response.status_code, host = host, url = response.url))
+                if throttled_cnt < THROTTLE_MAX_RETRIES:
+                    tr.retries += 1
+                    scheduler.retry(host, (ex, tr, throttled_cnt + 1, failed_cnt,))
+                    return
+                tr.fail(reason)
+            elif reason not in [None, ERR_EXCEPTION, ERR_NOT_RECORDED, ] and failed_cnt < self.config.retries:
+                self.d('{reason}, retrying: {url}'.format(reason = reason, url = ex.build_api_url(tr)))
+                tr.retries += 1
+                await asyncio.sleep(jittered_backoff(failed_cnt))
+                scheduler.retry(host, (ex, tr, throttled_cnt, failed_cnt + 1,))
+                return
+            elif reason is not None:
+                tr.fail(reason)
+            results.put(tr)
+
+        in_flight = set()
+        tripped_cnt = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers = self.config.concurrency) as executor:
+            while scheduler.pending() > 0 or in_flight:
+                # Giving up on what is left for exchanges with tripped circuit breaker or once we are out of time
+                if deadline is not None and time.time() >= deadline:
+                    for job in scheduler.drain(lambda _: True):
+                        results.put(job[1].fail(deadline_reason))
+                elif len(tripped) != tripped_cnt:
+                    tripped_cnt = len(tripped)
+                    for job in scheduler.drain(lambda job: job[0].code in tripped):
+                        results.put(job[1].fail(ERR_CIRCUIT_OPEN))
+
+                wait = None
+                if len(in_flight) < self.config.concurrency and scheduler.pending() > 0:
+                    host, job, wait = scheduler.next()
+                    if job is not None:
+                        task = asyncio.ensure_future(probe(host, *job))
+                        in_flight.add(task)
+                        task.add_done_callback(in_flight.discard)
+                        continue
+
+                # Nothing can be dispatched now. Wait till any probe completes or any host accepts requests again.
+                timeout = None if wait is None or math.isinf(wait) else wait
+                if deadline is not None and deadline > time.time():
+                    timeout = min(timeout if timeout is not None else math.inf, deadline - time.time())
+                if in_flight:
+                    await asyncio.wait(set(in_flight), timeout = timeout, return_when = asyncio.FIRST_COMPLETED)
+                else:
+                    await asyncio.sleep(timeout if timeout is not None else 0)
+
+    def d(self, msg):
+        if self.config.debug:
+            print(msg)
+
+    def verbose(self, msg):
+        if self.config.verbose:
+            print(msg)
@@ -0,0 +1,163 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import collections
+import math
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .const import BACKOFF_BASE, BACKOFF_MAX, ERR_BUDGET, ERR_CIRCUIT_OPEN, ERR_DEADLINE, ERR_NOT_RECORDED
+from .result import TestResult
+
+
+######################################################################
+
+class TokenBucket:
+    """
+    Paces requests sent to single host. Rate is adaptive: it is halved each time host throttles us
+    and slowly grows back to configured value with each successful request.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        # no requests are allowed before that moment (time.monotonic() based)
+        self.blocked_until = 0.0
+        # number of consecutive throttled responses
+        self.penalty = 0
+
+    def _refill(self) -> float:
+        now_ts = time.monotonic()
+        self.tokens = min(self.tokens + (now_ts - self.updated) * self.rate, float(self.burst))
+        self.updated = now_ts
+        return now_ts
+
+    def delay(self) -> float:
+        """
+        Returns number of seconds to wait before next request can be sent (0 if it can be sent now).
+        """
+        now_ts = self._refill()
+        wait = max(self.blocked_until - now_ts, 0.0)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def consume(self) -> None:
+        self.tokens -= 1
+
+    def hold(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def throttled(self, delay: Optional[float]) -> None:
+        self.penalty += 1
+        if delay is None:
+            delay = min(BACKOFF_BASE * (2 ** (self.penalty - 1)), BACKOFF_MAX)
+        self.hold(delay)
+        self.tokens = 0.0
+        self.rate = max(self.rate / 2, self.max_rate / 16)
+
+    def succeeded(self) -> None:
+        self.penalty = 0
+        self.rate = min(self.rate + self.max_rate / 20, self.max_rate)
+
+
+class Scheduler:
+    """
+    Hands out queued jobs round-robin across hosts, so no single exchange gets flooded while others wait,
+    and only when host's token bucket allows next request to be sent.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, collections.deque] = collections.OrderedDict()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._hosts = collections.deque()
+
+    def add_host(self, host: str, rate: float, burst: int) -> None:
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(rate, burst)
+            self._queues[host] = collections.deque()
+            self._hosts.append(host)
+
+    def bucket(self, host: str) -> TokenBucket:
+        return self._buckets[host]
+
+    def submit(self, host: str, job) -> None:
+        self._queues[host].append(job)
+
+    def retry(self, host: str, job) -> None:
+        # retried jobs go first, so they are not starved by the rest of the queue
+        self._queues[host].appendleft(job)
+
+    def pending(self) -> int:
+        return sum(len(jobs) for jobs in self._queues.values())
+
+    def drain(self, predicate: Callable) -> List:
+        """
+        Removes all queued jobs matching given predicate.
+
+        :return: list of removed jobs
+        """
+        drained = []
+        for host, jobs in self._queues.items():
+            kept = collections.deque()
+            for job in jobs:
+                (drained if predicate(job) else kept).append(job)
+            self._queues[host] = kept
+        return drained
+
+    def next(self) -> Tuple[Optional[str], Optional[object], float]:
+        """
+        Picks next job to be executed now.
+
+        :return: tuple of (host, job, 0) or (None, None, seconds to wait until any host can be queried)
+        """
+        min_wait = math.inf
+        for _ in range(len(self._hosts)):
+            host = self._hosts[0]
+            self._hosts.rotate(-1)
+            if not self._queues[host]:
+                continue
+            bucket = self._buckets[host]
+            wait = bucket.delay()
+            if wait <= 0:
+                bucket.consume()
+                return host, self._queues[host].popleft(), 0.0
+            min_wait = min(min_wait, wait)
+        return None, None, min_wait
+
+
+class CircuitBreaker:
+    """
+    Trips once given number of consecutive probes of single exchange fail, so remaining probes of that
+    exchange can be given up instead of waiting for timeouts of each of them.
+    """
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.failures = 0
+        self.tripped = False
+
+    def record(self, tr: TestResult) -> bool:
+        """
+        Records result of completed probe.
+
+        :return: True if this result tripped the breaker
+        """
+        # probes given up or missing in replayed archive tell nothing about exchange's health
+        if self.tripped or self.threshold <= 0 or tr.error in [ERR_CIRCUIT_OPEN, ERR_DEADLINE, ERR_BUDGET,
+                                                                ERR_NOT_RECORDED, ]:
+            return False
+        self.failures = self.failures + 1 if tr.failed else 0
+        self.tripped = self.failures >= self.threshold
+        return self.tripped
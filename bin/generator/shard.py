@@ -0,0 +1,156 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import collections
+import json
+import zlib
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from .const import SHARD_FILE_VERSION
+from .result import TestResult
+from .utils import abort
+
+if TYPE_CHECKING:
+    from .runner import Exchanges
+
+
+######################################################################
+
+def get_shard(ex_code: str, crypto: str, pair: str, count: int) -> int:
+    """
+    Returns (1 based) shard given (exchange, crypto, pair) cell belongs to. Assignment depends on the cell
+    only, so all shard runs partition cells the same way regardless of their currency set or pruning.
+    """
+    return zlib.crc32('{}:{}:{}'.format(ex_code, crypto, pair).encode()) % count + 1
+
+
+class ShardResult:
+    """
+    Partial result of sharded run (see --shard). Shards are combined back with merge_shards().
+    """
+
+    def __init__(self, shard: Tuple[int, int], currencies: Dict[str, Dict]):
+        self.shard = shard
+        self.currencies = sorted(currencies.keys())
+        self.confirmed: Dict[str, List[Tuple[str, str]]] = collections.defaultdict(list)
+        self.invalid = collections.Counter()
+        # (crypto, pair, reason) of checks that brought no answer
+        self.failed: Dict[str, List[Tuple[str, str, str]]] = collections.defaultdict(list)
+
+    def add(self, tr: TestResult) -> None:
+        if tr.failed:
+            self.failed[tr.ex_code].append((tr.crypto, tr.pair, tr.error,))
+        elif tr.rc:
+            self.confirmed[tr.ex_code].append((tr.crypto, tr.pair,))
+        else:
+            self.invalid[tr.ex_code] += 1
+
+    def to_dict(self, exchanges: "Exchanges") -> Dict:
+        # fingerprints of exchange definitions tell merge_shards() whether results of shards can be combined
+        return {
+            'version':    SHARD_FILE_VERSION,
+            'shard':      list(self.shard),
+            'currencies': self.currencies,
+            'exchanges':  {ex.code: {
+                'fingerprint': ex.get_fingerprint(),
+                'confirmed':   sorted(self.confirmed[ex.code]),
+                'invalid':     self.invalid[ex.code],
+                'failed':      sorted(self.failed[ex.code]),
+            } for ex in exchanges},
+        }
+
+    def save(self, file_name: str, exchanges: "Exchanges") -> None:
+        try:
+            with open(file_name, 'w') as fh:
+                json.dump(self.to_dict(exchanges), fh, separators = (',', ':'))
+        except IOError:
+            abort('Failed writing to: {}'.format(file_name))
+
+
+######################################################################
+
+def load_shards(file_names: List[str]) -> List[Dict]:
+    shards = []
+    for file_name in file_names:
+        try:
+            with open(file_name, 'r') as fh:
+                shard = json.load(fh)
+        except (IOError, ValueError) as e:
+            abort('Failed reading shard file {}: {}'.format(file_name, e))
+        if shard.get('version') != SHARD_FILE_VERSION:
+            abort('Unsupported shard file version: {}'.format(file_name))
+        shard['file'] = file_name
+        shards.append(shard)
+    return shards
+
+
+def merge_shards(exchanges: "Exchanges", currencies: Dict[str, Dict], file_names: List[str],
+                 force: bool = False) -> None:
+    """
+    Collects pairs confirmed by all shards in Exchange.pairs. Shards must all come from runs of the same
+    shard count, with the same currencies and exchange definitions, and must cover all the cells. Otherwise
+    merging is aborted, unless force is set.
+
+    :param exchanges: exchanges to collect pairs in (not filtered yet)
+    :param currencies: currencies shards were expected to check
+    :param file_names: shard result files (see --shard)
+    :param force: do not abort on inconsistent or incomplete shard set
+    """
+    def problem(msg: str) -> None:
+        if not force:
+            abort('{} Use --force to merge anyway.'.format(msg))
+        print('Warning: {}'.format(msg))
+
+    shards = load_shards(file_names)
+    counts = {shard['shard'][1] for shard in shards}
+    if len(counts) != 1:
+        abort('Shards come from runs with different shard counts: {}'.format(
+            ', '.join([str(count) for count in sorted(counts)])))
+    count = counts.pop()
+
+    seen = collections.Counter([shard['shard'][0] for shard in shards])
+    duplicated = sorted([idx for idx, cnt in seen.items() if cnt > 1])
+    if duplicated:
+        abort('Duplicated shards: {}'.format(', '.join(['{}/{}'.format(idx, count) for idx in duplicated])))
+    missing = [idx for idx in range(1, count + 1) if idx not in seen]
+    if missing:
+        problem('Missing shards: {}.'.format(', '.join(['{}/{}'.format(idx, count) for idx in missing])))
+
+    known_currencies = sorted(currencies.keys())
+    for shard in shards:
+        if shard['currencies'] != known_currencies:
+            problem('{} was created with different currency set.'.format(shard['file']))
+
+    exchanges.filter_exchanges()
+    exchanges.init_matrix(currencies)
+    failed_cnt = 0
+    for ex in exchanges:
+        fingerprint = ex.get_fingerprint()
+        results = []
+        for shard in shards:
+            result = shard['exchanges'].get(ex.code)
+            if result is None:
+                problem('{} has no results of {}.'.format(shard['file'], ex.name))
+                continue
+            if result['fingerprint'] != fingerprint:
+                problem('{} results of {} were obtained with different exchange definition.'.format(
+                    shard['file'], ex.name))
+            results.append(result)
+
+        for crypto, pair in sorted({tuple(cell) for result in results for cell in result['confirmed']}):
+            ex.add_pair(crypto, pair)
+        failed = [cell for result in results for cell in result['failed']]
+        failed_cnt += len(failed)
+        if failed:
+            print('{}: {} checks failed in shard runs'.format(ex.name, len(failed)))
+
+    print('Merged {} of {} shards: {} pairs confirmed, {} checks failed'.format(
+        len(shards), count, exchanges.matrix.count(), failed_cnt))
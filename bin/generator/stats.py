@@ -0,0 +1,165 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import bisect
+import collections
+import contextlib
+import json
+import time
+from typing import Dict, List, Tuple
+
+from .config import Config
+from .const import ERR_TIMEOUT, LATENCY_BUCKETS
+from .profiler import phase
+from .result import TestResult
+from .utils import abort
+
+
+######################################################################
+
+class ExchangeStats:
+    """
+    Aggregated API call metrics and check outcomes of single exchange. Only counters and fixed size
+    histograms are kept, so collecting them costs next to nothing.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        # HTTP status code (or error reason for calls that got no response) => count
+        self.status = collections.Counter()
+        # count of calls per LATENCY_BUCKETS bucket, last one counts calls exceeding the largest bucket
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.throttled = 0
+
+        self.checks = 0
+        self.cache_hits = 0
+        self.stale = 0
+        self.discovered = 0
+        self.confirmed = 0
+        self.invalid = 0
+        # failure reason => count (includes failed checks served from expired cache entries)
+        self.failures = collections.Counter()
+
+    def record_calls(self, calls: List[Tuple[object, float, int]]) -> None:
+        for status, elapsed, size in calls:
+            self.requests += 1
+            self.status[str(status)] += 1
+            self.latency[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+            self.bytes += size
+            if status == ERR_TIMEOUT:
+                self.timeouts += 1
+
+    def record_result(self, tr: TestResult) -> None:
+        if tr.calls is not None:
+            self.record_calls(tr.calls)
+        self.checks += 1
+        self.retries += tr.retries
+        self.throttled += tr.throttled_cnt
+        if tr.stale:
+            self.stale += 1
+        elif tr.cached:
+            self.cache_hits += 1
+        if tr.discovered:
+            self.discovered += 1
+        if tr.error is not None:
+            self.failures[tr.error] += 1
+        if not tr.failed:
+            if tr.rc:
+                self.confirmed += 1
+            else:
+                self.invalid += 1
+
+    def to_dict(self) -> Dict:
+        buckets = ['<={}'.format(bound) for bound in LATENCY_BUCKETS] + ['>{}'.format(LATENCY_BUCKETS[-1])]
+        return {
+            'requests':        self.requests,
+            'status':          dict(self.status),
+            'latency':         {
+                'histogram': dict(zip(buckets, self.latency)),
+                'mean':      round(self.latency_total / self.requests, 4) if self.requests > 0 else None,
+                'max':       round(self.latency_max, 4),
+            },
+            'bytes':           self.bytes,
+            'retries':         self.retries,
+            'timeouts':        self.timeouts,
+            'throttled':       self.throttled,
+            'checks':          self.checks,
+            'cache_hits':      self.cache_hits,
+            'cache_hit_ratio': round(self.cache_hits / self.checks, 4) if self.checks > 0 else None,
+            'stale':           self.stale,
+            'discovered':      self.discovered,
+            'confirmed':       self.confirmed,
+            'invalid':         self.invalid,
+            'failures':        dict(self.failures),
+        }
+
+
+class RunStats:
+    """
+    Machine readable report of single generator run (see --stats-json).
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        # phase name => duration in seconds
+        self.phases: Dict[str, float] = collections.OrderedDict()
+        self.exchanges: Dict[str, ExchangeStats] = collections.OrderedDict()
+        # checks never completed (i.e. abandoned after deadline) that cannot be attributed to any exchange
+        self.abandoned = 0
+
+    def get(self, ex_code: str) -> ExchangeStats:
+        if ex_code not in self.exchanges:
+            self.exchanges[ex_code] = ExchangeStats()
+        return self.exchanges[ex_code]
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        # measured for --profile as well
+        started = time.monotonic()
+        try:
+            with phase(name):
+                yield
+        finally:
+            self.phases[name] = round(self.phases.get(name, 0.0) + time.monotonic() - started, 4)
+
+    def to_dict(self, config: Config) -> Dict:
+        exchanges = {code: stats.to_dict() for code, stats in self.exchanges.items()}
+        totals = collections.Counter()
+        for stats in exchanges.values():
+            for key in ['requests', 'bytes', 'retries', 'timeouts', 'throttled', 'checks', 'cache_hits', 'stale',
+                        'discovered', 'confirmed', 'invalid', ]:
+                totals[key] += stats[key]
+            totals['failed'] += sum(stats['failures'].values())
+        totals['abandoned'] = self.abandoned
+
+        return {
+            'started':     time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.started)),
+            'duration':    round(time.time() - self.started, 3),
+            'engine':      config.engine,
+            'concurrency': config.concurrency,
+            'phases':      self.phases,
+            'totals':      dict(totals),
+            'exchanges':   exchanges,
+        }
+
+    def save(self, file_name: str, config: Config) -> None:
+        try:
+            with open(file_name, 'w') as fh:
+                json.dump(self.to_dict(config), fh, indent = 2)
+        except IOError:
+            abort('Failed writing to: {}'.format(file_name))
@@ -0,0 +1,58 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import email.utils
+import math
+import random
+import sys
+import time
+from typing import Optional
+
+from .const import BACKOFF_BASE, BACKOFF_MAX
+
+
+######################################################################
+
+def abort(msg: str = 'Aborted') -> None:
+    print('*** {}'.format(msg))
+    sys.exit(1)
+
+
+# Returns current timestamp in millis
+def now() -> int:
+    return int(round(time.time() * 1000))
+
+
+# Returns randomized ("full jitter") exponential backoff delay in seconds for given retry attempt
+def jittered_backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_BASE * (2 ** attempt), BACKOFF_MAX))
+
+
+# Returns number of seconds specified by Retry-After header value (either delta-seconds or HTTP date)
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+# Returns rate extracted from ticker response as positive number, None if it's missing or is not valid rate
+def parse_rate(value) -> Optional[float]:
+    try:
+        rate = float(value)
+    except (TypeError, ValueError):
+        return None
+    return rate if math.isfinite(rate) and rate > 0 else None
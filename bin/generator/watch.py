@@ -0,0 +1,221 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Watch mode (see --watch): single long running process that keeps results
+# cache in memory and HTTP sessions open, re-checks expiring pairs in cycles
+# and rewrites data file only when confirmed pairs change. First cycle checks
+# all the pairs (like single run does), following ones only refresh what
+# expires, within probe budget. Optionally answers pair availability queries
+# over HTTP (see --listen), once first cycle completes:
+#
+#   GET /status                          cycles done, time of last cycle and change
+#   GET /exchanges                       codes and names of exchanges
+#   GET /pairs/<exchange>                confirmed pairs of exchange, keyed by crypto
+#   GET /pairs/<exchange>/<crypto>       confirmed pairs of crypto on exchange
+#   GET /pairs/<exchange>/<crypto>/<pair>  {"supported": true|false}, 404 if pair
+#                                        has not been successfully checked yet
+#
+######################################################################
+
+import http.server
+import json
+import sys
+import threading
+import time
+import urllib.parse
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .config import Config
+from .matrix import PairMatrix
+from .profiler import phase
+
+if TYPE_CHECKING:
+    from .runner import Exchanges
+
+
+######################################################################
+
+class Watcher:
+    """
+    Runs checking cycles (see --watch) until stopped.
+    """
+
+    def __init__(self, config: Config, currencies: Dict[str, Dict], exchanges: "Exchanges",
+                 on_change: Callable[[], None]):
+        """
+        :param config: run configuration (config.watch is interval between starts of checking cycles)
+        :param currencies: currencies to check
+        :param exchanges: exchanges to check
+        :param on_change: invoked once cycle completes with confirmed pairs different than these of previous cycle
+        """
+        self.config = config
+        self.currencies = currencies
+        self.exchanges = exchanges
+        self.on_change = on_change
+
+        # pairs of last completed cycle and its checks with no result known. Replaced (not modified) once
+        # next cycle completes, so can be read from other threads at any time.
+        self.matrix: Optional[PairMatrix] = None
+        self.unchecked: FrozenSet[Tuple[str, str, str]] = frozenset()
+        self.cycles = 0
+        self.last_cycle: Optional[float] = None
+        self.last_change: Optional[float] = None
+        # set when on_change failed, so it's retried after next cycle even if pairs do not change
+        self._change_pending = False
+
+    def run_cycle(self) -> bool:
+        """
+        Checks all expired (and never checked) pairs that fit probe budget of single cycle. Others are served
+        from in-memory cache and get their turn in the next cycles. Budget is not applied to the first cycle,
+        so data file is never written (nor queries answered) with pairs not checked yet.
+
+        :return: True if confirmed pairs changed
+        """
+        previous = self.matrix
+        with phase('cycle'):
+            self.exchanges.process_exchanges(self.currencies, budget = previous is not None)
+        if self.exchanges.interrupted.is_set():
+            # pairs of interrupted cycle are incomplete
+            return False
+        matrix = self.exchanges.matrix
+        if previous is None:
+            changed = True
+        else:
+            added, removed = matrix.diff(previous)
+            changed = bool(added or removed)
+
+        if changed:
+            self.last_change = time.time()
+        if changed or self._change_pending:
+            if self.config.batch:
+                self.exchanges.verify_batches()
+            try:
+                self.on_change()
+                self._change_pending = False
+            except IOError as e:
+                # i.e. disk full, which must not end watch mode
+                print('*** {}, retrying after next cycle'.format(e))
+                self._change_pending = True
+
+        self.unchecked = frozenset(self.exchanges.unchecked)
+        self.matrix = matrix
+        self.cycles += 1
+        self.last_cycle = time.time()
+        return changed
+
+    def run(self) -> None:
+        server = None
+        if self.config.listen is not None:
+            server = QueryServer(self, *self.config.listen).start()
+            print('Answering queries at {}'.format(server.url))
+        try:
+            stopped = self.exchanges.interrupted
+            while not stopped.is_set():
+                started = time.monotonic()
+                self.run_cycle()
+                stopped.wait(max(0.0, self.config.watch - (time.monotonic() - started)))
+        finally:
+            if server is not None:
+                server.stop()
+
+    def stop(self) -> None:
+        """
+        Makes run() return, giving up checks of current cycle not started yet.
+        """
+        self.exchanges.interrupt()
+
+
+######################################################################
+
+class QueryRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, fmt, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        parts = [urllib.parse.unquote(part) for part in urllib.parse.urlparse(self.path).path.split('/') if part]
+        status, body = self.server.watcher_query(parts)
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class QueryHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # clients going away before reading their responses are no concern of ours
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class QueryServer:
+    """
+    Local HTTP server answering pair availability queries with results of last completed watch cycle.
+    """
+
+    def __init__(self, watcher: Watcher, host: str, port: int):
+        self.watcher = watcher
+        self._httpd = QueryHTTPServer((host, port), QueryRequestHandler)
+        self._httpd.watcher_query = self.query
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self) -> "QueryServer":
+        self._thread = threading.Thread(target = self._httpd.serve_forever, daemon = True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def query(self, parts: List[str]) -> Tuple[int, object]:
+        """
+        :param parts: decoded path components of request
+        :return: HTTP status code and response body (to be JSON encoded)
+        """
+        watcher = self.watcher
+        matrix = watcher.matrix
+        if parts == ['status']:
+            return HTTPStatus.OK, {'cycles': watcher.cycles, 'last_cycle': watcher.last_cycle,
+                                   'last_change': watcher.last_change,
+                                   'pairs': matrix.count() if matrix is not None else None}
+
+        if matrix is None:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'First checking cycle is not completed yet'}
+        if parts == ['exchanges']:
+            return HTTPStatus.OK, {ex_code: watcher.exchanges.get(ex_code).name for ex_code in matrix.exchanges}
+        if not parts or parts[0] != 'pairs' or not 2 <= len(parts) <= 4:
+            return HTTPStatus.NOT_FOUND, {'error': 'Unknown query'}
+
+        ex_code = parts[1]
+        if ex_code not in matrix.exchanges:
+            return HTTPStatus.NOT_FOUND, {'error': 'Unknown exchange: {}'.format(ex_code)}
+        for code in parts[2:]:
+            if code not in matrix.currencies:
+                return HTTPStatus.NOT_FOUND, {'error': 'Unknown currency: {}'.format(code)}
+        if len(parts) == 2:
+            return HTTPStatus.OK, matrix.get_exchange_pairs(ex_code)
+        if len(parts) == 3:
+            return HTTPStatus.OK, matrix.get_pairs(ex_code, parts[2])
+        if (ex_code, parts[2], parts[3],) in watcher.unchecked:
+            return HTTPStatus.NOT_FOUND, {'error': 'Not checked yet: {}/{}'.format(parts[2], parts[3])}
+        return HTTPStatus.OK, {'supported': matrix.get(ex_code, parts[2], parts[3])}
@@ -0,0 +1,401 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Purpose of this module:
+# - Local HTTP server standing in for ticker and market listing API endpoints
+#   of all exchanges supported by generate_data.py
+# - Injects latency, server errors, throttling and hanging connections
+#   on demand, so generator behaviour can be measured without touching
+#   real exchanges
+#
+######################################################################
+
+import collections
+import http.server
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+
+######################################################################
+
+class Faults:
+    def __init__(self, latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, hang_rate: float = 0.0, hang_time: float = 30.0,
+                 retry_after: int = 1):
+        """
+        :param latency: delay (in millis) added to each response
+        :param latency_jitter: max random delay (in millis) added on top of latency
+        :param error_rate: fraction (0-1) of requests answered with HTTP 503
+        :param throttle_rate: fraction (0-1) of requests answered the way given exchange reports rate limiting
+        :param hang_rate: fraction (0-1) of requests that get no response for hang_time seconds
+        :param hang_time: how long (in seconds) hanging requests hang
+        :param retry_after: value of Retry-After header of throttled responses
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.hang_rate = hang_rate
+        self.hang_time = hang_time
+        self.retry_after = retry_after
+
+
+######################################################################
+
+# (status code, headers, decoded body)
+Response = Tuple[int, Dict[str, str], object]
+
+
+class StandInExchange:
+    """
+    Emulates API of single exchange. Subclasses mimic response formats of real endpoints.
+    """
+
+    # host of real API this class stands in for
+    host = None
+
+    def __init__(self, markets: Set[Tuple[str, str]], rates: Dict[Tuple[str, str], float]):
+        self.markets = markets
+        self.rates = rates
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        raise NotImplementedError
+
+    def throttled(self, faults: Faults) -> Response:
+        return 429, {'Retry-After': str(faults.retry_after)}, {'error': 'Too many requests'}
+
+    def not_found(self) -> Response:
+        return 404, {}, {'error': 'Not found'}
+
+    def rate(self, crypto: str, pair: str) -> str:
+        return '{:.8f}'.format(self.rates[(crypto, pair)])
+
+
+class BinanceStandIn(StandInExchange):
+    host = 'api1.binance.com'
+
+    def __init__(self, markets: Set[Tuple[str, str]], rates: Dict[Tuple[str, str], float]):
+        super().__init__(markets, rates)
+        self.symbols = {crypto + pair: (crypto, pair) for crypto, pair in markets}
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        if path == '/api/v3/exchangeInfo':
+            return 200, {}, {'symbols': [{'symbol': crypto + pair, 'status': 'TRADING',
+                                          'baseAsset': crypto, 'quoteAsset': pair} for crypto, pair in self.markets]}
+        if path == '/api/v3/ticker/price' and 'symbols' in query:
+            try:
+                symbols = json.loads(query['symbols'])
+            except ValueError:
+                symbols = None
+            # single unknown symbol fails whole request
+            if not isinstance(symbols, list) or any(symbol not in self.symbols for symbol in symbols):
+                return 400, {}, {'code': -1121, 'msg': 'Invalid symbol.'}
+            return 200, {}, [{'symbol': symbol, 'price': self.rate(*self.symbols[symbol])} for symbol in symbols]
+        if path == '/api/v3/ticker/price':
+            symbol = query.get('symbol', '')
+            if symbol not in self.symbols:
+                return 400, {}, {'code': -1121, 'msg': 'Invalid symbol.'}
+            return 200, {}, {'symbol': symbol, 'price': self.rate(*self.symbols[symbol])}
+        return self.not_found()
+
+
+class BitstampStandIn(StandInExchange):
+    host = 'www.bitstamp.net'
+
+    def ticker(self, crypto: str, pair: str) -> Dict:
+        rate = self.rate(crypto, pair)
+        return {'last': rate, 'high': rate, 'low': rate, 'vwap': rate, 'volume': '1.0', 'bid': rate, 'ask': rate,
+                'open': rate, 'timestamp': str(int(time.time()))}
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        if path.rstrip('/') == '/api/v2/trading-pairs-info':
+            return 200, {}, [{'name': '{}/{}'.format(crypto, pair), 'url_symbol': (crypto + pair).lower(),
+                              'trading': 'Enabled'} for crypto, pair in self.markets]
+        if path.rstrip('/') == '/api/v2/ticker':
+            return 200, {}, [dict(self.ticker(crypto, pair), pair = '{}/{}'.format(crypto, pair))
+                             for crypto, pair in self.markets]
+        match = re.match(r'^/api/v2/ticker/([a-z0-9]+)/?$', path)
+        if match:
+            for crypto, pair in self.markets:
+                if (crypto + pair).lower() == match.group(1):
+                    return 200, {}, self.ticker(crypto, pair)
+        return self.not_found()
+
+
+class ZondaStandIn(StandInExchange):
+    host = 'api.zonda.exchange'
+
+    def ticker(self, crypto: str, pair: str) -> Dict:
+        rate = self.rate(crypto, pair)
+        return {
+            'market': {'code': '{}-{}'.format(crypto, pair), 'first': {'currency': crypto},
+                       'second': {'currency': pair}},
+            'time': str(int(time.time() * 1000)),
+            'highestBid': rate, 'lowestAsk': rate, 'rate': rate, 'previousRate': rate,
+        }
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        if path.rstrip('/') == '/rest/trading/ticker':
+            return 200, {}, {'status': 'Ok', 'items': {'{}-{}'.format(crypto, pair): self.ticker(crypto, pair)
+                                                       for crypto, pair in self.markets}}
+        match = re.match(r'^/rest/trading/ticker/([A-Z0-9]+)-([A-Z0-9]+)$', path)
+        if match and (match.group(1), match.group(2)) in self.markets:
+            return 200, {}, {'status': 'Ok', 'ticker': self.ticker(match.group(1), match.group(2))}
+        return 200, {}, {'status': 'Fail', 'errors': ['TICKER_NOT_FOUND']}
+
+
+class CoinmateStandIn(StandInExchange):
+    host = 'coinmate.io'
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        if path == '/api/tradingPairs':
+            return 200, {}, {'error': False, 'errorMessage': None,
+                             'data': [{'name': '{}_{}'.format(crypto, pair), 'firstCurrency': crypto,
+                                       'secondCurrency': pair} for crypto, pair in self.markets]}
+        if path == '/api/ticker':
+            market = tuple(query.get('currencyPair', '').split('_', 1))
+            if market not in self.markets:
+                return 200, {}, {'error': True, 'errorMessage': 'Invalid currency pair', 'data': None}
+            rate = self.rate(*market)
+            return 200, {}, {'error': False, 'errorMessage': None,
+                             'data': {'last': rate, 'high': rate, 'low': rate, 'amount': 1.0, 'bid': rate,
+                                      'ask': rate, 'change': 0.0, 'open': rate, 'timestamp': int(time.time())}}
+        return self.not_found()
+
+
+class KrakenStandIn(StandInExchange):
+    host = 'api.kraken.com'
+
+    # Kraken's own codes of some assets
+    aliases = {
+        'BTC': 'XBT',
+        'DOGE': 'XDG',
+    }
+
+    def altname(self, crypto: str, pair: str) -> str:
+        return self.aliases.get(crypto, crypto) + self.aliases.get(pair, pair)
+
+    def throttled(self, faults: Faults) -> Response:
+        return 200, {}, {'error': ['EAPI:Rate limit exceeded']}
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        if path == '/0/public/AssetPairs':
+            result = {}
+            for crypto, pair in self.markets:
+                base, quote = self.aliases.get(crypto, crypto), self.aliases.get(pair, pair)
+                result[base + quote] = {'altname': base + quote, 'wsname': '{}/{}'.format(base, quote),
+                                        'base': base, 'quote': quote}
+            return 200, {}, {'error': [], 'result': result}
+        if path == '/0/public/Ticker':
+            # comma separated list of pairs is accepted, but single unknown pair fails whole request
+            requested = query.get('pair', '').split(',')
+            result = {}
+            for crypto, pair in self.markets:
+                if crypto + pair in requested or self.altname(crypto, pair) in requested:
+                    rate = self.rate(crypto, pair)
+                    result[self.altname(crypto, pair)] = {
+                        'a': [rate, '1', '1.000'], 'b': [rate, '1', '1.000'], 'c': [rate, '0.1'],
+                        'v': ['1.0', '1.0'], 'p': [rate, rate], 't': [1, 1], 'l': [rate, rate], 'h': [rate, rate],
+                        'o': rate,
+                    }
+            if len(result) < len(set(requested)):
+                return 200, {}, {'error': ['EQuery:Unknown asset pair']}
+            return 200, {}, {'error': [], 'result': result}
+        return self.not_found()
+
+
+STAND_INS = [BinanceStandIn, BitstampStandIn, ZondaStandIn, CoinmateStandIn, KrakenStandIn, ]
+
+
+######################################################################
+
+class StandInRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # otherwise small keep-alive responses get stuck in Nagle's algorithm vs delayed ACK dance
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        # Requests are expected to be in "/<real API host>/<real API path>" form (see point_exchange())
+        url = urllib.parse.urlparse(self.path)
+        host, _, path = url.path.lstrip('/').partition('/')
+        query = dict(urllib.parse.parse_qsl(url.query))
+        status, headers, body = self.server.standin.respond(host, '/' + path, query)
+        if status is None:
+            # hanging connection: we keep client waiting and then close the connection without response
+            self.close_connection = True
+            return
+
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StandInHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # clients giving up on their requests (i.e. terminated workers) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StandInServer:
+    """
+    Local HTTP server answering requests meant for real exchange APIs.
+    """
+
+    def __init__(self, markets: Dict[str, Set[Tuple[str, str]]], faults: Faults = None, seed: int = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Each exchange is served on its own port, so generator sees distinct API host (and keeps separate
+        rate limiter and connection pool) per exchange, as it does with real APIs.
+
+        :param markets: markets listed by each exchange, keyed by host of real exchange API
+        :param faults: faults to inject
+        :param seed: random generator seed
+        :param host: interface to listen on
+        :param port: port of first exchange, following ones use consecutive ports (0 picks any free ones)
+        """
+        self.faults = faults if faults is not None else Faults()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # request counts per host and status (None status means hanged request)
+        self.stats = collections.Counter()
+
+        rates = get_reference_rates({code for listed in markets.values() for market in listed for code in market})
+        self.exchanges: Dict[str, StandInExchange] = {}
+        for cls in STAND_INS:
+            listed = markets.get(cls.host, set())
+            self.exchanges[cls.host] = cls(listed, {(crypto, pair): rates[crypto] / rates[pair]
+                                                    for crypto, pair in listed})
+
+        # host of real API => its listener
+        self._httpds: Dict[str, StandInHTTPServer] = {}
+        for idx, real_host in enumerate(self.exchanges.keys()):
+            httpd = StandInHTTPServer((host, port + idx if port else 0), StandInRequestHandler)
+            httpd.standin = self
+            self._httpds[real_host] = httpd
+        self._threads = []
+
+    @property
+    def urls(self) -> Dict[str, str]:
+        """
+        Returns stand-in server URL of each exchange, keyed by host of real exchange API (see point_exchange()).
+        """
+        return {real_host: 'http://{}:{}'.format(*httpd.server_address[:2])
+                for real_host, httpd in self._httpds.items()}
+
+    def start(self) -> "StandInServer":
+        for httpd in self._httpds.values():
+            thread = threading.Thread(target = httpd.serve_forever, daemon = True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        for httpd in self._httpds.values():
+            httpd.shutdown()
+            httpd.server_close()
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def respond(self, host: str, path: str, query: Dict[str, str]) -> Tuple[Optional[int], Dict[str, str], object]:
+        exchange = self.exchanges.get(host)
+        faults = self.faults
+
+        if faults.latency > 0 or faults.latency_jitter > 0:
+            time.sleep((faults.latency + self._roll() * faults.latency_jitter) / 1000)
+
+        if exchange is None:
+            response = 404, {}, {'error': 'Unknown host: {}'.format(host)}
+        elif self._roll() < faults.hang_rate:
+            time.sleep(faults.hang_time)
+            response = None, {}, None
+        elif self._roll() < faults.throttle_rate:
+            response = exchange.throttled(faults)
+        elif self._roll() < faults.error_rate:
+            response = 503, {}, {'error': 'Service unavailable'}
+        else:
+            response = exchange.handle(path, query)
+
+        with self._lock:
+            self.stats[(host, response[0])] += 1
+        return response
+
+
+######################################################################
+
+def get_reference_rates(codes: Set[str]) -> Dict[str, float]:
+    """
+    Returns stable, pseudo random value of each currency, so rates of given pair are consistent across
+    all the exchanges.
+    """
+    return {code: 10 ** ((zlib.crc32(code.encode()) % 1000) / 200 - 2) for code in codes}
+
+
+def build_markets(exchanges, currencies: Dict[str, Dict], listed_ratio: float = 0.2,
+                  seed: int = 0) -> Dict[str, Set[Tuple[str, str]]]:
+    """
+    Builds random set of markets listed by each exchange, respecting exchange's quote currencies.
+
+    :param exchanges: iterable of generator.Exchange
+    :param currencies: currencies to build markets of
+    :param listed_ratio: fraction (0-1) of possible pairs to be listed
+    :param seed: random generator seed
+    :return: markets keyed by host of real exchange API
+    """
+    rnd = random.Random(seed)
+    markets = {}
+    for ex in exchanges:
+        listed = markets.setdefault(ex.host, set())
+        for crypto in currencies:
+            for pair in currencies:
+                if crypto == pair or (ex.quotes is not None and pair not in ex.quotes):
+                    continue
+                if rnd.random() < listed_ratio:
+                    listed.add((crypto, pair,))
+    return markets
+
+
+def point_exchange(ex, urls: Dict[str, str]) -> None:
+    """
+    Makes exchange talk to stand-in server instead of real API.
+
+    :param ex: generator.Exchange to be modified
+    :param urls: stand-in server URL of each exchange, keyed by real API host (see StandInServer.urls)
+    """
+    base_url = urls[ex.host].rstrip('/') + '/'
+    ex.api_url = re.sub(r'^https?://', base_url, ex.api_url)
+    if ex.markets_url is not None:
+        ex.markets_url = re.sub(r'^https?://', base_url, ex.markets_url)
+    if ex.batch_url is not None:
+        ex.batch_url = re.sub(r'^https?://', base_url, ex.batch_url)
+
+
+def get_hosts() -> List[str]:
+    return [cls.host for cls in STAND_INS]
@@ -18,8 +18,14 @@ const USD='USD'
 
 const currencies = Data.currencies
 
+// Display names precomputed by generator (not present in data files generated by older versions)
+const currencyNames = (typeof Data.currencyNames !== 'undefined') ? Data.currencyNames : {}
+const cryptoNames = (typeof Data.cryptoNames !== 'undefined') ? Data.cryptoNames : {}
+
 function getCurrencyName(code) {
-	if (code in currencies) {
+	if (code in currencyNames) {
+		return currencyNames[code]
+	} else if (code in currencies) {
 		var c = currencies[code]
 		var name = (c['name'] != code) ? c['name'] : ''
 		var symbol = ('symbol' in c ) ? c['symbol'] : ''
@@ -45,41 +51,140 @@ function getCurrencySymbol(code) {
 // --------------------------------------------------------------------------------------------
 
 function getCryptoName(code) {
+	if (code in cryptoNames) return cryptoNames[code]
 	var name = ('name' in currencies[code])
 		? currencies[code]['name']
 		: code
 	return name + ' (' + code + ')'
 }
+
+// Icons of all listed cryptos packed into single image by generator (not present in data files generated
+// by older versions or with generate_data.py --no-icon-atlas), so tickers do not load one file each.
+const iconAtlas = (typeof Data.iconAtlas !== 'undefined') ? Data.iconAtlas : null
+
+function hasAtlasIcon(code) {
+	return iconAtlas !== null && (code in iconAtlas.icons)
+}
+// Icon image file (in images folder). Use with getCryptoIconSourceSize() and getCryptoIconClip(),
+// as it can be the atlas.
 function getCryptoIcon(code) {
-	return code.toLowerCase() + '.svg'
+	return hasAtlasIcon(code) ? iconAtlas.file : code.toLowerCase() + '.svg'
+}
+// Size to render icon image at, for icon to be shown at given size. Undefined means natural size.
+function getCryptoIconSourceSize(code, size) {
+	if (!hasAtlasIcon(code)) return undefined
+	var scale = size / iconAtlas.cell
+	return Qt.size(iconAtlas.width * scale, iconAtlas.height * scale)
+}
+// Part of icon image (rendered at getCryptoIconSourceSize()) holding the icon. Null rect means whole image.
+function getCryptoIconClip(code, size) {
+	if (!hasAtlasIcon(code)) return Qt.rect(0, 0, 0, 0)
+	var scale = size / iconAtlas.cell
+	var pos = iconAtlas.icons[code]
+	return Qt.rect(pos[0] * scale, pos[1] * scale, size, size)
 }
 
 // --------------------------------------------------------------------------------------------
 
-const exchanges = Data.exchanges
+// Present only in "split" data format (see generate_data.py --format), which lists exchanges here
+// while data of each exchange comes in separate module, loaded on first use (see loadExchange()).
+const manifest = (typeof Data.manifest !== 'undefined') ? Data.manifest : null
+
+// Data of exchanges. In split format holds exchanges loaded so far only.
+const exchanges = (manifest !== null) ? {} : Data.exchanges
+
+// Loaded exchange modules (split format only), kept so their objects are not garbage collected
+var modules = {}
+
+// Interned currency codes. Present only in "compact" and "split" data formats, where pairs of each
+// crypto are encoded as bitset of indices to this table (see generate_data.py --format).
+const codes = (typeof Data.codes !== 'undefined') ? Data.codes : null
+
+// exchange => crypto => pair => true. Built on first use of given exchange.
+var pairLookups = {}
+
+function decodeBitset(bitset) {
+	var result = []
+	for (var i = 0; i < bitset.length; i++) {
+		var nibble = parseInt(bitset.charAt(i), 16)
+		for (var bit = 0; bit < 4; bit++) {
+			if (nibble & (1 << bit)) result.push(codes[i * 4 + bit])
+		}
+	}
+	return result
+}
+
+// Returns crypto => array of pairs map of given exchange, regardless of data format
+function getExchangePairs(exchange) {
+	var ex = loadExchange(exchange)
+	if (typeof ex === 'undefined') return {}
+	if (!('pairs' in ex)) {
+		var pairs = {}
+		for (const crypto in ex['matrix']) {
+			pairs[crypto] = decodeBitset(ex['matrix'][crypto])
+		}
+		ex['pairs'] = pairs
+	}
+	return ex['pairs']
+}
+
+function getPairLookup(exchange) {
+	if (!(exchange in pairLookups)) {
+		var lookup = {}
+		var pairs = getExchangePairs(exchange)
+		for (const crypto in pairs) {
+			lookup[crypto] = {}
+			for (var i = 0; i < pairs[crypto].length; i++) {
+				lookup[crypto][pairs[crypto][i]] = true
+			}
+		}
+		pairLookups[exchange] = lookup
+	}
+	return pairLookups[exchange]
+}
+
+// Returns data of given exchange, loading its module first if needed (split format)
+function loadExchange(exchange) {
+	if (!(exchange in exchanges) && manifest !== null && exchange in manifest) {
+		var component = Qt.createComponent(Qt.resolvedUrl(manifest[exchange]['module']))
+		// Component.Ready
+		if (component.status === 1) {
+			modules[exchange] = component.createObject(null)
+			exchanges[exchange] = modules[exchange].exchange
+		} else {
+			console.error("Failed loading data of exchange '" + exchange + "': " + component.errorString())
+		}
+	}
+	return exchanges[exchange]
+}
+
+// Name and URL of exchange, which in split format do not need exchange data to be loaded
+function getExchangeInfo(exchange) {
+	return (manifest !== null) ? manifest[exchange] : exchanges[exchange]
+}
 
 function exchangeExists(exchange) {
-	return exchange in exchanges
+	return exchange in ((manifest !== null) ? manifest : exchanges)
 }
 
 function getExchageIds() {
-	return Object.keys(exchanges)
+	return Object.keys((manifest !== null) ? manifest : exchanges)
 }
 
 function getExchange(exchange) {
-	var result = exchangeExists(exchange) ? exchanges[exchange] : undefined
+	var result = exchangeExists(exchange) ? loadExchange(exchange) : undefined
 	if (typeof result === 'undefined') console.error("Invalid exchange id: '" + exchange + "'")
 	return result
 }
 
 function getExchangeName(exchange) {
-	var result = exchangeExists(exchange) ? exchanges[exchange]['name'] : undefined
+	var result = exchangeExists(exchange) ? getExchangeInfo(exchange)['name'] : undefined
 	if (typeof result === 'undefined') console.error("Invalid exchange id: '" + exchange + "'")
 	return result
 }
 
 function getExchangeUrl(exchange) {
-	var result = exchangeExists(exchange) ? exchanges[exchange]['url'] : undefined
+	var result = exchangeExists(exchange) ? getExchangeInfo(exchange)['url'] : undefined
 	if (typeof result === 'undefined') console.error("Invalid exchange id: '" + exchange + "'")
 	return result
 }
@@ -87,7 +192,7 @@ function getExchangeUrl(exchange) {
 function isCryptoSupported(exchange, crypto) {
 	var result = false
 	if (exchangeExists(exchange)) {
-		result = crypto in exchanges[exchange]['pairs']
+		result = crypto in getPairLookup(exchange)
 	} else {
 		console.error("Invalid exchange id: '" + exchange + "'")
 	}
@@ -97,7 +202,7 @@ function isCryptoSupported(exchange, crypto) {
 function isPairSupported(exchange, crypto, pair) {
 	var result = false
 	if (isCryptoSupported(exchange, crypto)) {
-		result = (exchanges[exchange]['pairs'][crypto].indexOf(pair) !== -1)
+		result = pair in getPairLookup(exchange)[crypto]
 	} else {
 		console.error("Invalid crypto '" + crypto + "' on '" + exchange + "'")
 	}
@@ -106,13 +211,21 @@ function isPairSupported(exchange, crypto, pair) {
 
 // --------------------------------------------------------------------------------------------
 
+// Config dialog models. Pretty data format comes with them precomputed, otherwise they are built
+// on first use. Returned arrays are shared, so must not be modified.
+
 function getAllExchangeCryptos(exchange) {
 	var cryptoModel = null
 	if (exchangeExists(exchange)) {
-		cryptoModel = []
-		for(const key in exchanges[exchange]['pairs']) {
-			cryptoModel.push({'value': key, 'text': getCryptoName(key)})
+		var ex = loadExchange(exchange)
+		if (!('cryptoModel' in ex)) {
+			cryptoModel = []
+			for(const key of Object.keys(getExchangePairs(exchange)).sort()) {
+				cryptoModel.push({'value': key, 'text': getCryptoName(key)})
+			}
+			ex['cryptoModel'] = cryptoModel
 		}
+		cryptoModel = ex['cryptoModel']
 	} else {
 		console.error("Invalid exchange id: '" + exchange + "'")
 	}
@@ -121,12 +234,18 @@ function getAllExchangeCryptos(exchange) {
 function getPairsForCrypto(exchange, crypto) {
 	var currencyModel = null
 	if (isCryptoSupported(exchange, crypto)) {
-		currencyModel = []
-		var pairs = exchanges[exchange]['pairs'][crypto]
-		for(var i = 0; i < pairs.length; i++) {
-			var key = pairs[i]
-			currencyModel.push({'value': key, 'text': getCurrencyName(key)})
+		var ex = loadExchange(exchange)
+		if (!('pairModels' in ex)) ex['pairModels'] = {}
+		if (!(crypto in ex['pairModels'])) {
+			currencyModel = []
+			var pairs = getExchangePairs(exchange)[crypto]
+			for(var i = 0; i < pairs.length; i++) {
+				var key = pairs[i]
+				currencyModel.push({'value': key, 'text': getCurrencyName(key)})
+			}
+			ex['pairModels'][crypto] = currencyModel
 		}
+		currencyModel = ex['pairModels'][crypto]
 	} else {
 		var exName = getExchangeName(exchange)
 		console.error("Can't get pair for '" + crypto + "' on '" + exchange + "' (" + exName + ")")
@@ -21,6 +21,8 @@ Item {
     implicitHeight: contentLayout.implicitHeight
 
     property var json: undefined
+    // shared RateFetcher doing API requests of all tickers
+    property var fetcher: null
 
     property string exchange: ''
     property string crypto: ''
@@ -248,6 +250,9 @@ Item {
             Layout.maximumWidth: 20
             Layout.maximumHeight: 20
             source: crypto ? Qt.resolvedUrl('../images/' + Crypto.getCryptoIcon(crypto)) : ''
+            // all tickers share single icon atlas image (if there's one), each showing its part only
+            sourceSize: crypto ? Crypto.getCryptoIconSourceSize(crypto, Layout.preferredWidth) : undefined
+            sourceClipRect: crypto ? Crypto.getCryptoIconClip(crypto, Layout.preferredWidth) : Qt.rect(0, 0, 0, 0)
         }
 
         PlasmaComponents.Label {
@@ -332,7 +337,7 @@ Item {
 
     property bool dataDownloadInProgress: false
     function fetchRate(exchange, crypto, pair) {
-        if (dataDownloadInProgress) return
+        if (dataDownloadInProgress || fetcher === null) return
 
         if (!Crypto.exchangeExists(exchange)) {
             if (exchange !== '') console.debug("fetchRate(): unknown exchange: '" + exchange + "'")
@@ -382,40 +387,15 @@ Item {
     // --------------------------------------------------------------------------------------------
 
     function downloadExchangeRate(exchangeId, crypto, pair, callback) {
-        var exchange = Crypto.exchanges[exchangeId]
-        // var url = exchange.api_url.replace('{crypto}', crypto).replace('{pair}', pair)
-        var url = exchange.getUrl(crypto, pair)
-
-        // console.debug(`Download url: '${url}'`)
-
-        request(url, function(data) {
-            if(data.length !== 0) {
-                try {
-                    var json = JSON.parse(data)
-                    callback(exchange.getRateFromExchangeData(json, crypto, pair))
-                } catch (error) {
-                    console.error("downloadExchangeRate(): Response parsing failed for '" + url + "'")
-                    console.error("downloadExchangeRate(): error: '" + error + "'")
-                    console.error("downloadExchangeRate(): data: '" + data + "'")
-                }
-            }
+        // requests are grouped with these of other tickers of the same exchange (see RateFetcher)
+        fetcher.fetchRate(exchangeId, crypto, pair, function(rate) {
+            if (rate !== null && typeof rate !== 'undefined') callback(rate)
             tickerRoot.opacity = 1
             dataDownloadInProgress = false
         })
         return true
     }
 
-    function request(url, callback) {
-        var xhr = new XMLHttpRequest()
-        xhr.onreadystatechange = function() {
-            if(xhr.readyState === 4) {
-                callback(xhr.responseText)
-            }
-        }
-        xhr.open('GET', url, true)
-        xhr.send('')
-    }
-
     // --------------------------------------------------------------------------------------------
 
 }
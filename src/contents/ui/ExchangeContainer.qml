@@ -41,10 +41,16 @@ GridLayout {
 		text: i18n("Edit me!")
 	}
 
+	// shared by all tickers, so these of the same exchange can be updated with single API request
+	RateFetcher {
+		id: rateFetcher
+	}
+
 	Repeater {
 		model: exchangeCount
 		Exchange {
 			json: exchanges[index]
+			fetcher: rateFetcher
 			Layout.alignment: Qt.AlignHCenter | Qt.AlignVCenter
 		}
 	}
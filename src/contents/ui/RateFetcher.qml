@@ -0,0 +1,134 @@
+/**
+ * Crypto Tracker widget for KDE
+ *
+ * @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+ * @copyright 2021-2026 Marcin Orlowski
+ * @license   http://www.opensource.org/licenses/mit-license.php MIT
+ * @link      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+ */
+
+import QtQuick
+import "../js/crypto.js" as Crypto
+
+// Downloads exchange rates for all tickers of the widget. Rate requests made within short time window
+// are grouped per exchange, so all tickers of exchange supporting batch ticker API share single request
+// per refresh cycle. Other exchanges get one request per distinct pair.
+QtObject {
+    id: fetcher
+
+    // How long (in millis) we wait for other tickers to ask for their rates
+    property int coalesceInterval: 250
+
+    // exchange => 'crypto/pair' => {crypto, pair, callbacks}
+    property var pending: ({})
+
+    property Timer coalesceTimer: Timer {
+        interval: fetcher.coalesceInterval
+        running: false
+        repeat: false
+        onTriggered: fetcher.flush()
+    }
+
+    // --------------------------------------------------------------------------------------------
+
+    // Callback is invoked with the rate, or with null if rate could not be obtained.
+    function fetchRate(exchangeId, crypto, pair, callback) {
+        if (!(exchangeId in pending)) pending[exchangeId] = {}
+        var key = crypto + '/' + pair
+        if (!(key in pending[exchangeId])) pending[exchangeId][key] = {'crypto': crypto, 'pair': pair, 'callbacks': []}
+        pending[exchangeId][key].callbacks.push(callback)
+
+        if (!coalesceTimer.running) coalesceTimer.start()
+    }
+
+    function flush() {
+        var queued = pending
+        pending = {}
+
+        for (const exchangeId in queued) {
+            var tickers = Object.values(queued[exchangeId])
+            // in split data format this loads exchange module, if not loaded yet
+            var exchange = Crypto.getExchange(exchangeId)
+            if (typeof exchange === 'undefined') {
+                tickers.forEach(ticker => notify(ticker, null))
+                continue
+            }
+            // batch functions are present only if generator confirmed batch endpoint works
+            if (('getBatchUrl' in exchange) && tickers.length > 1) {
+                var size = (exchange.batchSize > 0) ? exchange.batchSize : tickers.length
+                for (var i = 0; i < tickers.length; i += size) {
+                    downloadBatch(exchange, tickers.slice(i, i + size))
+                }
+            } else {
+                tickers.forEach(ticker => downloadSingle(exchange, ticker))
+            }
+        }
+    }
+
+    function notify(ticker, rate) {
+        ticker.callbacks.forEach(callback => callback(rate))
+    }
+
+    // --------------------------------------------------------------------------------------------
+
+    function downloadBatch(exchange, tickers) {
+        var pairs = tickers.map(ticker => [ticker.crypto, ticker.pair])
+        var url = exchange.getBatchUrl(pairs)
+
+        // console.debug(`Batch download url: '${url}'`)
+
+        request(url, function(data) {
+            var rates = null
+            if (data.length !== 0) {
+                try {
+                    rates = exchange.getRatesFromBatchData(JSON.parse(data), pairs)
+                } catch (error) {
+                    console.error("downloadBatch(): Response parsing failed for '" + url + "'")
+                    console.error("downloadBatch(): error: '" + error + "'")
+                }
+            }
+            // tickers missing in batch response are given another chance with their own request
+            for (var i = 0; i < tickers.length; i++) {
+                if (rates !== null && typeof rates[i] !== 'undefined') {
+                    notify(tickers[i], rates[i])
+                } else {
+                    downloadSingle(exchange, tickers[i])
+                }
+            }
+        })
+    }
+
+    function downloadSingle(exchange, ticker) {
+        // var url = exchange.api_url.replace('{crypto}', crypto).replace('{pair}', pair)
+        var url = exchange.getUrl(ticker.crypto, ticker.pair)
+
+        // console.debug(`Download url: '${url}'`)
+
+        request(url, function(data) {
+            var rate = null
+            if (data.length !== 0) {
+                try {
+                    var json = JSON.parse(data)
+                    rate = exchange.getRateFromExchangeData(json, ticker.crypto, ticker.pair)
+                } catch (error) {
+                    console.error("downloadSingle(): Response parsing failed for '" + url + "'")
+                    console.error("downloadSingle(): error: '" + error + "'")
+                    console.error("downloadSingle(): data: '" + data + "'")
+                }
+            }
+            notify(ticker, rate)
+        })
+    }
+
+    function request(url, callback) {
+        var xhr = new XMLHttpRequest()
+        xhr.onreadystatechange = function() {
+            if(xhr.readyState === 4) {
+                callback(xhr.responseText)
+            }
+        }
+        xhr.open('GET', url, true)
+        xhr.send('')
+    }
+
+}
@@ -149,7 +149,7 @@ ColumnLayout {
                 var tmp = []
                 var idx = 0
                 var currentIdx = 0
-                for(const key in Crypto.exchanges) {
+                for(const key of Crypto.getExchageIds()) {
                     tmp.push({'value': key, 'text': Crypto.getExchangeName(key)})
                     if (key === exchange) currentIdx = idx
                     idx++
@@ -190,7 +190,7 @@ ColumnLayout {
                 function updateModel(exchange, crypto) {
                     var tmp = []
                     var currentIdx = 0
-                    if (exchange in Crypto.exchanges) {
+                    if (Crypto.exchangeExists(exchange)) {
                         var tmp = Crypto.getAllExchangeCryptos(exchange);
                         for (var i=0; i<tmp.length; i++) {
                             if (tmp[i].value == crypto) currentIdx = i
@@ -225,7 +225,7 @@ ColumnLayout {
                 function updateModel(exchange, crypto, pair) {
                     var tmp = []
                     var currentIdx = 0
-                    if ((exchange in Crypto.exchanges) && (crypto in Crypto.exchanges[exchange]['pairs'])) {
+                    if (Crypto.exchangeExists(exchange) && Crypto.isCryptoSupported(exchange, crypto)) {
                         tmp = Crypto.getPairsForCrypto(exchange, crypto)
                         for (var i=0; i<tmp.length; i++) {
                             if (tmp[i].value === pair) currentIdx = i
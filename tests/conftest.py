@@ -0,0 +1,35 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+
+import gzip
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'bin'))
+
+import generator as gd  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'fixtures')
+
+
+@pytest.fixture
+def exchanges(tmp_path) -> gd.Exchanges:
+    """
+    Exchanges answering API calls from tests/fixtures/exchanges.json archive (see --replay).
+    """
+    archive_file = str(tmp_path / 'exchanges.json.gz')
+    with open(os.path.join(FIXTURES_DIR, 'exchanges.json'), 'rb') as src, gzip.open(archive_file, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    config = gd.create_config(['--replay', archive_file, '--retries', '0', ])
+    return gd.create_exchanges(config, str(tmp_path))
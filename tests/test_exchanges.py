@@ -0,0 +1,106 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# Response validators and market listing parsers of all exchanges, run
+# against API responses replayed from tests/fixtures/exchanges.json.
+#
+######################################################################
+
+import pytest
+
+import generator as gd
+
+CURRENCIES = {code: {} for code in ['BTC', 'ETH', 'BNB', 'DOGE', 'LUNA', 'XRP', 'USD', 'USDT', 'EUR', 'PLN', 'CZK', ]}
+
+
+def probe(exchanges: gd.Exchanges, ex_code: str, crypto: str, pair: str) -> gd.TestResult:
+    tr = gd.TestResult(ex_code = ex_code, crypto = crypto, pair = pair, use_cache = False)
+    return exchanges.get(ex_code).do_api_call(tr)
+
+
+######################################################################
+
+@pytest.mark.parametrize('ex_code, crypto, pair', [
+    ('binance-com', 'BTC', 'USDT', ),
+    ('bitstamp-net', 'BTC', 'USD', ),
+    ('bitbay-net', 'BTC', 'PLN', ),
+    ('coinmate-io', 'BTC', 'EUR', ),
+    ('kraken-com', 'BTC', 'USD', ),
+])
+def test_ticker_of_listed_pair_is_valid(exchanges, ex_code, crypto, pair):
+    tr = probe(exchanges, ex_code, crypto, pair)
+    assert not tr.failed
+    assert tr.rc is True
+
+
+@pytest.mark.parametrize('ex_code, crypto, pair', [
+    ('binance-com', 'BTC', 'PLN', ),
+    ('bitstamp-net', 'BTC', 'PLN', ),
+    ('bitbay-net', 'BTC', 'USDT', ),
+    ('coinmate-io', 'BTC', 'USDT', ),
+    ('kraken-com', 'BTC', 'PLN', ),
+])
+def test_ticker_of_unknown_pair_is_invalid(exchanges, ex_code, crypto, pair):
+    tr = probe(exchanges, ex_code, crypto, pair)
+    assert not tr.failed
+    assert tr.rc is False
+
+
+@pytest.mark.parametrize('ex_code, expected', [
+    ('binance-com', {('BTC', 'USDT', ), ('ETH', 'BTC', ), ('BNB', 'USDT', ), }),
+    ('bitstamp-net', {('BTC', 'USD', ), ('ETH', 'EUR', ), }),
+    ('bitbay-net', {('BTC', 'PLN', ), ('ETH', 'EUR', ), }),
+    ('coinmate-io', {('BTC', 'EUR', ), ('ETH', 'CZK', ), }),
+    ('kraken-com', {('BTC', 'USD', ), ('ETH', 'EUR', ), ('DOGE', 'USD', ), }),
+])
+def test_discovered_markets(exchanges, ex_code, expected):
+    # markets not trading (and Kraken's dark pool ones) are not listed
+    assert exchanges.get(ex_code).discover_pairs(CURRENCIES) == expected
+
+
+def test_discovered_markets_are_limited_to_known_currencies(exchanges):
+    assert exchanges.get('binance-com').discover_pairs({'BTC': {}, 'USDT': {}}) == {('BTC', 'USDT', )}
+
+
+def test_kraken_rate_limit_error_means_throttled(exchanges):
+    kraken = exchanges.get('kraken-com')
+    response = kraken.get_session().get('https://api.kraken.com/0/public/Ticker?pair=BTCEUR')
+    assert response.status_code == 200
+    assert kraken.is_throttled(response)
+    assert not kraken.is_throttled(kraken.get_session().get('https://api.kraken.com/0/public/Ticker?pair=BTCPLN'))
+
+
+def test_call_missing_in_archive_fails_as_not_recorded(exchanges, capsys):
+    tr = probe(exchanges, 'coinmate-io', 'ETH', 'EUR')
+    assert tr.failed
+    assert tr.error == gd.ERR_NOT_RECORDED
+    assert capsys.readouterr().out == ''
+
+
+def test_calls_missing_in_archive_do_not_trip_circuit_breaker(exchanges):
+    breaker = gd.CircuitBreaker(threshold = 2)
+    for pair in ['USD', 'EUR', 'PLN', ]:
+        assert not breaker.record(probe(exchanges, 'bitstamp-net', 'ETH', pair))
+    assert not breaker.tripped
+
+
+@pytest.mark.parametrize('ex_code, pairs', [
+    ('binance-com', [('BTC', 'USDT', ), ('ETH', 'BTC', ), ]),
+    ('bitstamp-net', [('BTC', 'USD', ), ('ETH', 'EUR', ), ]),
+    ('bitbay-net', [('BTC', 'PLN', ), ('ETH', 'EUR', ), ]),
+    ('kraken-com', [('BTC', 'USD', ), ('DOGE', 'USD', ), ]),
+])
+def test_batch_ticker_check_passes(exchanges, ex_code, pairs):
+    exchanges.init_matrix(CURRENCIES)
+    ex = exchanges.get(ex_code)
+    for crypto, pair in pairs:
+        ex.add_pair(crypto, pair)
+    assert ex.verify_batch() is None
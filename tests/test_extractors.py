@@ -0,0 +1,95 @@
+######################################################################
+#
+# Crypto Tracker widget for KDE
+#
+# @author    Marcin Orlowski <mail (#) marcinOrlowski (.) com>
+# @copyright 2021-2026 Marcin Orlowski
+# @license   http://www.opensource.org/licenses/mit-license.php MIT
+# @'LINK'      https://github.com/MarcinOrlowski/crypto-tracker-plasmoid
+#
+######################################################################
+#
+# JS functions widget extracts rates with (see registry.py), run with
+# Node.js against API responses replayed from tests/fixtures/exchanges.json
+# and compared with their Python counterparts used by batch ticker check.
+#
+######################################################################
+
+import json
+import shutil
+import subprocess
+from typing import List
+
+import pytest
+
+import generator as gd
+from generator.utils import parse_rate
+
+# Calls exchange's JS function the way widget does and prints its result (wrapped, so undefined survives as null)
+NODE_RUNNER = '''
+let input = '';
+process.stdin.on('data', chunk => input += chunk);
+process.stdin.on('end', () => {
+    const [params, body, args] = JSON.parse(input);
+    console.log(JSON.stringify([new Function(...params, body)(...args)]));
+});
+'''
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason = 'Node.js not installed')
+
+
+def call_js(ex: gd.Exchange, name: str, params: List[str], *args):
+    proc = subprocess.run(['node', '-e', NODE_RUNNER], input = json.dumps([params, ex.functions[name], args]),
+                          capture_output = True, text = True, check = True)
+    return json.loads(proc.stdout)[0]
+
+
+def fetch(ex: gd.Exchange, url: str):
+    response = ex.get_session().get(url)
+    assert response.status_code == 200
+    return json.loads(response.text)
+
+
+######################################################################
+
+@pytest.mark.parametrize('ex_code, crypto, pair', [
+    ('binance-com', 'BTC', 'USDT', ),
+    ('bitstamp-net', 'BTC', 'USD', ),
+    ('bitbay-net', 'BTC', 'PLN', ),
+    ('coinmate-io', 'BTC', 'EUR', ),
+    ('kraken-com', 'BTC', 'USD', ),
+])
+def test_single_ticker_extractors_agree(exchanges, ex_code, crypto, pair):
+    ex = exchanges.get(ex_code)
+    tr = gd.TestResult(ex_code = ex_code, crypto = crypto, pair = pair, use_cache = False)
+    url = ex.build_api_url(tr)
+    assert call_js(ex, 'getUrl', ['crypto', 'pair', ], crypto, pair) == url
+
+    data = fetch(ex, url)
+    rate = parse_rate(call_js(ex, 'getRateFromExchangeData', ['data', 'crypto', 'pair', ], data, crypto, pair))
+    assert rate is not None
+    assert rate == parse_rate(ex.parse_ticker_rate(data))
+
+
+@pytest.mark.parametrize('ex_code, pairs', [
+    ('binance-com', [('BTC', 'USDT', ), ('ETH', 'BTC', ), ]),
+    ('bitstamp-net', [('BTC', 'USD', ), ('ETH', 'EUR', ), ]),
+    ('bitbay-net', [('BTC', 'PLN', ), ('ETH', 'EUR', ), ]),
+    ('kraken-com', [('BTC', 'USD', ), ('DOGE', 'USD', ), ]),
+])
+def test_batch_ticker_extractors_agree(exchanges, ex_code, pairs):
+    ex = exchanges.get(ex_code)
+    url = ex.build_batch_url(pairs)
+    assert call_js(ex, 'getBatchUrl', ['pairs', ], pairs) == url
+
+    data = fetch(ex, url)
+    rates = [parse_rate(rate) for rate in call_js(ex, 'getRatesFromBatchData', ['data', 'pairs', ], data, pairs)]
+    assert None not in rates
+    assert rates == [parse_rate(rate) for rate in ex.parse_batch_rates(data, pairs)]
+
+    # widget falls back to single ticker for pairs missing in batch response, so both must quote the same rate
+    crypto, pair = pairs[0]
+    tr = gd.TestResult(ex_code = ex_code, crypto = crypto, pair = pair, use_cache = False)
+    single_data = fetch(ex, ex.build_api_url(tr))
+    assert parse_rate(call_js(ex, 'getRateFromExchangeData', ['data', 'crypto', 'pair', ],
+                              single_data, crypto, pair)) == rates[0]